@@ -0,0 +1,103 @@
+"""composite indexes matching query shapes
+
+Revision ID: 202610190000
+Revises: 202501010000
+Create Date: 2026-10-19 00:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "202610190000"
+down_revision = "202501010000"
+branch_labels = None
+depends_on = None
+
+# Single-column indexes that older create_all()-built databases may carry; each is a
+# prefix of a composite index or unique constraint below, so it only costs writes.
+REDUNDANT = [
+    ("ix_posts_author_id", "posts", ["author_id"]),
+    ("ix_comments_post_id", "comments", ["post_id"]),
+    ("ix_likes_post_id", "likes", ["post_id"]),
+    ("ix_follows_follower_id", "follows", ["follower_id"]),
+    ("ix_follows_followed_id", "follows", ["followed_id"]),
+    ("ix_event_outbox_topic", "event_outbox", ["topic"]),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; it avoids locking writes on big tables.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_posts_created_at_id",
+            "posts",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_posts_author_created_at_id",
+            "posts",
+            ["author_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_comments_post_created_at",
+            "comments",
+            ["post_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_comments_author_id",
+            "comments",
+            ["author_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_likes_user_id",
+            "likes",
+            ["user_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_follows_followed_follower",
+            "follows",
+            ["followed_id", "follower_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_event_outbox_unpublished",
+            "event_outbox",
+            ["created_at"],
+            postgresql_where=sa.text("published = false"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, table, _ in REDUNDANT:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT:
+            op.create_index(
+                name, table, columns, postgresql_concurrently=True, if_not_exists=True
+            )
+        for name, table in [
+            ("ix_event_outbox_unpublished", "event_outbox"),
+            ("ix_follows_followed_follower", "follows"),
+            ("ix_likes_user_id", "likes"),
+            ("ix_comments_author_id", "comments"),
+            ("ix_comments_post_created_at", "comments"),
+            ("ix_posts_author_created_at_id", "posts"),
+            ("ix_posts_created_at_id", "posts"),
+        ]:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
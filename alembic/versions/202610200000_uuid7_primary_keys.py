@@ -0,0 +1,52 @@
+"""time-ordered UUIDv7 ids for posts, comments, likes and outbox
+
+Revision ID: 202610200000
+Revises: 202610190000
+Create Date: 2026-10-20 00:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "202610200000"
+down_revision = "202610190000"
+branch_labels = None
+depends_on = None
+
+TABLES = ["posts", "comments", "likes", "event_outbox"]
+
+# The application generates ids itself (app.utils.ids.uuid7); the server default covers
+# inserts made outside the ORM. Random bits come from gen_random_uuid() (PostgreSQL 13+),
+# which already carries the RFC 9562 variant; only the timestamp and version are
+# overwritten. PostgreSQL 18's built-in uuidv7() is equivalent.
+CREATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION app_uuid_v7() RETURNS uuid
+LANGUAGE plpgsql VOLATILE AS $$
+DECLARE
+    unix_ms bigint := floor(extract(epoch FROM clock_timestamp()) * 1000);
+    bytes bytea := uuid_send(gen_random_uuid());
+BEGIN
+    bytes := overlay(bytes PLACING substring(int8send(unix_ms) FROM 3) FROM 1 FOR 6);
+    bytes := set_byte(bytes, 6, (get_byte(bytes, 6) & 15) | 112);
+    RETURN encode(bytes, 'hex')::uuid;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    # Existing uuid4 ids stay as they are: rewriting primary keys would cascade through
+    # every foreign key. Changing a column default is a catalog-only change and takes a
+    # brief lock without rewriting the table.
+    op.execute(CREATE_FUNCTION)
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=sa.text("app_uuid_v7()"))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=None)
+    op.execute("DROP FUNCTION IF EXISTS app_uuid_v7()")
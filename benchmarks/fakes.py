@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+from redis.exceptions import WatchError
+
+
+class InMemoryPipeline:
+    def __init__(self, redis: "InMemoryRedis") -> None:
+        self._redis = redis
+        self._ops: list[tuple[str, tuple, dict]] = []
+        # WATCH: watched keys' values when watched; commands run at once until multi().
+        self._watched: dict[str, object] = {}
+        self._immediate = False
+
+    def __getattr__(self, name):
+        if self._immediate:
+            return getattr(self._redis, name)
+
+        def queue(*args, **kwargs):
+            self._ops.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.reset()
+
+    async def watch(self, *keys):
+        self._watched.update({key: self._redis.store.get(key) for key in keys})
+        self._immediate = True
+
+    def multi(self):
+        self._immediate = False
+
+    async def reset(self):
+        self._ops, self._watched, self._immediate = [], {}, False
+
+    async def execute(self, raise_on_error=True):  # noqa: ARG002
+        ops, watched = self._ops, self._watched
+        await self.reset()
+        if any(self._redis.store.get(key) != value for key, value in watched.items()):
+            raise WatchError("Watched variable changed.")
+        return [await getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in ops]
+
+
+class InMemoryRedis:
+    """Dict-backed stand-in for the subset of redis.asyncio the app uses.
+
+    Used by the micro-benchmarks and imported by the test suite, so the benchmarks run
+    wherever ``tests/`` is not shipped.
+    """
+
+    def __init__(self) -> None:
+        self.store: dict[str, object] = {}
+        self.hash_store: dict[str, dict[str, object]] = defaultdict(dict)
+        self.lists: dict[str, list] = defaultdict(list)
+        self.zsets: dict = defaultdict(dict)
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None, nx=False):  # noqa: ARG002
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def zincrby(self, name, amount, value):
+        self.zsets[name][value] = self.zsets[name].get(value, 0.0) + amount
+        return self.zsets[name][value]
+
+    async def zadd(self, name, mapping, nx=False):
+        added = 0
+        for member, score in mapping.items():
+            if nx and member in self.zsets[name]:
+                continue
+            added += member not in self.zsets[name]
+            self.zsets[name][member] = float(score)
+        return added
+
+    async def zrangebyscore(self, name, min, max, start=None, num=None):  # noqa: A002
+        low, high = float(min), float(max)
+        ranked = sorted(self.zsets[name].items(), key=lambda item: item[1])
+        members = [member for member, score in ranked if low <= score <= high]
+        if start is not None and num is not None:
+            members = members[start : start + num]
+        return members
+
+    async def zrevrange(self, name, start, end, withscores=False):
+        ranked = sorted(self.zsets[name].items(), key=lambda item: item[1], reverse=True)
+        ranked = ranked[start : None if end == -1 else end + 1]
+        return ranked if withscores else [member for member, _ in ranked]
+
+    async def zrem(self, name, *values):
+        return sum(self.zsets[name].pop(value, None) is not None for value in values)
+
+    async def zremrangebyscore(self, name, min, max):  # noqa: A002
+        low, high = float(min), float(max)
+        doomed = [m for m, score in self.zsets[name].items() if low <= score <= high]
+        return await self.zrem(name, *doomed)
+
+    async def zremrangebyrank(self, name, min, max):  # noqa: A002
+        ranked = sorted(self.zsets[name], key=self.zsets[name].__getitem__)
+        return await self.zrem(name, *ranked[min : None if max == -1 else max + 1])
+
+    async def zunionstore(self, dest, keys):
+        union: dict = defaultdict(float)
+        for key, weight in keys.items():
+            for member, score in self.zsets[key].items():
+                union[member] += score * weight
+        self.zsets[dest] = dict(union)
+        return len(union)
+
+    async def delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            found = [
+                self.store.pop(key, None),
+                self.hash_store.pop(key, None),
+                self.lists.pop(key, None),
+                self.zsets.pop(key, None),
+            ]
+            deleted += any(value is not None for value in found)
+        return deleted
+
+    async def ttl(self, key):  # noqa: ARG002
+        return -1
+
+    async def incr(self, key, amount=1):
+        self.store[key] = int(self.store.get(key, 0)) + amount  # type: ignore[call-overload]
+        return self.store[key]
+
+    async def expire(self, key, ttl):  # noqa: ARG002
+        return True
+
+    def pipeline(self, transaction=True):  # noqa: ARG002
+        return InMemoryPipeline(self)
+
+    async def hincrby(self, name, key, amount=1):
+        value = int(self.hash_store[name].get(key, 0)) + amount  # type: ignore[call-overload]
+        self.hash_store[name][key] = value
+        return value
+
+    async def hexists(self, name, key):
+        return key in self.hash_store[name]
+
+    async def hget(self, name, key):
+        value = self.hash_store[name].get(key)
+        return str(value) if value is not None else None
+
+    async def hmget(self, name, keys):
+        return [await self.hget(name, key) for key in keys]
+
+    async def hset(self, name, key=None, value=None, mapping=None):
+        if key is not None:
+            self.hash_store[name][key] = value
+        for field, field_value in (mapping or {}).items():
+            self.hash_store[name][field] = field_value
+
+    async def rpush(self, key, *values):
+        self.lists[key].extend(values)
+        return len(self.lists[key])
+
+    async def lpush(self, key, *values):
+        self.lists[key][:0] = reversed(values)
+        return len(self.lists[key])
+
+    async def ltrim(self, key, start, end):
+        self.lists[key] = self.lists[key][start : None if end == -1 else end + 1]
+        return True
+
+    async def lrange(self, key, start, end):
+        return self.lists[key][start : None if end == -1 else end + 1]
+
+    async def hgetall(self, name):
+        return {field: str(value) for field, value in self.hash_store.get(name, {}).items()}
+
+    async def ping(self):
+        return True
+
+    async def publish(self, channel, message):  # noqa: ARG002
+        return 0
+
+    async def close(self):
+        return None
@@ -0,0 +1,176 @@
+"""Open-loop load generator for the hot HTTP endpoints.
+
+Requests are issued on a fixed schedule at ``--rps`` regardless of how fast the server
+answers, so queueing shows up as latency instead of silently lowering the offered load.
+Run ``benchmarks.seed`` first and raise ``RATE_LIMIT_REQUESTS`` on the server, otherwise
+the per-IP rate limiter will reject most write traffic.
+
+    python -m benchmarks.load --base-url http://localhost:8000 --rps 200 --duration 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+
+import httpx
+
+from benchmarks.seed import BENCH_PASSWORD, bench_username
+from benchmarks.stats import summarize
+
+DEFAULT_MIX = "feed=40,list_posts=30,like=10,comment=10,auth=10"
+
+Scenario = Callable[["LoadContext"], Awaitable[httpx.Response]]
+
+
+class LoadContext:
+    def __init__(self, client: httpx.AsyncClient, rng: random.Random) -> None:
+        self.client = client
+        self.rng = rng
+        self.tokens: list[str] = []
+        self.usernames: list[str] = []
+        self.post_ids: list[str] = []
+
+    def auth_headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+
+async def _feed(ctx: LoadContext) -> httpx.Response:
+    return await ctx.client.get("/feed", params={"size": 20}, headers=ctx.auth_headers())
+
+
+async def _list_posts(ctx: LoadContext) -> httpx.Response:
+    page = ctx.rng.randint(1, 5)
+    return await ctx.client.get("/posts", params={"page": page, "size": 20})
+
+
+async def _like(ctx: LoadContext) -> httpx.Response:
+    post_id = ctx.rng.choice(ctx.post_ids)
+    headers = ctx.auth_headers()
+    liked = await ctx.client.post(f"/posts/{post_id}/likes", headers=headers)
+    if liked.status_code >= 500:
+        return liked
+    return await ctx.client.delete(f"/posts/{post_id}/likes", headers=headers)
+
+
+async def _comment(ctx: LoadContext) -> httpx.Response:
+    post_id = ctx.rng.choice(ctx.post_ids)
+    return await ctx.client.post(
+        f"/posts/{post_id}/comments", json={"content": "load test"}, headers=ctx.auth_headers()
+    )
+
+
+async def _auth(ctx: LoadContext) -> httpx.Response:
+    username = ctx.rng.choice(ctx.usernames)
+    return await ctx.client.post(
+        "/auth/login", json={"username": username, "password": BENCH_PASSWORD}
+    )
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "feed": _feed,
+    "list_posts": _list_posts,
+    "like": _like,
+    "comment": _comment,
+    "auth": _auth,
+}
+
+
+def parse_mix(raw: str) -> dict[str, int]:
+    mix = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r}; expected one of {sorted(SCENARIOS)}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+async def _prepare(ctx: LoadContext, users: int, sessions: int) -> None:
+    ctx.usernames = [bench_username(index) for index in range(users)]
+    for username in ctx.rng.sample(ctx.usernames, min(sessions, users)):
+        response = await ctx.client.post(
+            "/auth/login", json={"username": username, "password": BENCH_PASSWORD}
+        )
+        response.raise_for_status()
+        ctx.tokens.append(response.json()["access_token"])
+    response = await ctx.client.get("/posts", params={"size": 100})
+    response.raise_for_status()
+    ctx.post_ids = [item["id"] for item in response.json()["items"]]
+    if not ctx.tokens or not ctx.post_ids:
+        raise SystemExit("Nothing to drive: run `python -m benchmarks.seed` first")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    mix = parse_mix(args.mix)
+    names, weights = list(mix), list(mix.values())
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        ctx = LoadContext(client, rng)
+        await _prepare(ctx, args.users, args.sessions)
+
+        async def fire(name: str) -> None:
+            started = time.perf_counter()
+            try:
+                response = await SCENARIOS[name](ctx)
+                failed = response.status_code >= 400 and response.status_code != 409
+            except httpx.HTTPError:
+                failed = True
+            latencies[name].append(time.perf_counter() - started)
+            if failed:
+                errors[name] += 1
+
+        total = int(args.rps * args.duration)
+        tasks = []
+        started = time.perf_counter()
+        for index in range(total):
+            delay = started + index / args.rps - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(fire(rng.choices(names, weights)[0])))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "target_rps": args.rps,
+        "duration_s": round(elapsed, 2),
+        "overall": summarize(all_latencies, elapsed, sum(errors.values())),
+        "scenarios": {
+            name: summarize(latencies[name], elapsed, errors[name]) for name in sorted(latencies)
+        },
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rps", type=float, default=50.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to drive load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted scenarios, name=weight,...")
+    parser.add_argument("--users", type=int, default=1000, help="Seeded users to draw from")
+    parser.add_argument("--sessions", type=int, default=50, help="Users to log in up front")
+    parser.add_argument("--concurrency", type=int, default=200, help="Max open connections")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    print(json.dumps(asyncio.run(run(parse_args(argv))), indent=2))
+
+
+if __name__ == "__main__":
+    main()
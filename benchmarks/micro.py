@@ -0,0 +1,211 @@
+"""Micro-benchmarks for the hot in-process paths, run against a fake Redis.
+
+Each case reports per-call latency percentiles and throughput as JSON. Pass
+``--baseline`` with a previous report to fail when a case regresses beyond
+``--max-regression`` percent, so slowdowns show up in review.
+
+    python -m benchmarks.micro --iterations 2000 > bench.json
+    python -m benchmarks.micro --baseline bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+
+import structlog
+from fastapi import Request
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.session import Base
+from app.domain.models.user import Follow, Post, User
+from app.events.consumer import KafkaEventConsumer
+from app.rate_limit.dependency import rate_limiter
+from app.services.feed_service import FeedService
+from benchmarks.fakes import InMemoryRedis
+from benchmarks.stats import summarize
+
+
+async def _measure(call: Callable[[int], Awaitable[object]], iterations: int, warmup: int) -> dict:
+    for index in range(warmup):
+        await call(index)
+    latencies = []
+    started = time.perf_counter()
+    for index in range(iterations):
+        call_started = time.perf_counter()
+        await call(warmup + index)
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def bench_feed(iterations: int, warmup: int, authors: int, posts_per_author: int) -> dict:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    now = datetime.now(timezone.utc)
+    viewer = uuid.uuid4()
+    author_ids = [uuid.uuid4() for _ in range(authors)]
+    async with session_factory() as session:
+        await session.execute(
+            insert(User),
+            [
+                {"id": user_id, "email": f"u{i}@bench", "username": f"u{i}", "password_hash": "x"}
+                for i, user_id in enumerate([viewer, *author_ids])
+            ],
+        )
+        await session.execute(
+            insert(Follow),
+            [{"follower_id": viewer, "followed_id": author} for author in author_ids],
+        )
+        await session.execute(
+            insert(Post),
+            [
+                {"author_id": author, "content": "bench", "created_at": now, "updated_at": now}
+                for author in author_ids
+                for _ in range(posts_per_author)
+            ],
+        )
+        await session.commit()
+
+    redis = InMemoryRedis()
+    results = {}
+    async with session_factory() as session:
+        service = FeedService(session)
+
+        async def cold(_: int) -> object:
+            redis.store.clear()
+            return await service.get_feed(str(viewer), 1, 20, redis)  # type: ignore[arg-type]
+
+        async def warm(_: int) -> object:
+            return await service.get_feed(str(viewer), 1, 20, redis)  # type: ignore[arg-type]
+
+        results["feed_service.get_feed.miss"] = await _measure(cold, iterations, warmup)
+        results["feed_service.get_feed.hit"] = await _measure(warm, iterations, warmup)
+    await engine.dispose()
+    return results
+
+
+async def bench_rate_limiter(iterations: int, warmup: int) -> dict:
+    redis = InMemoryRedis()
+    request = Request({"type": "http", "client": ("10.0.0.1", 1234), "path": "/posts"})
+
+    async def call(_: int) -> object:
+        return await rate_limiter(
+            request=request, redis=redis, requests_per_window=10**9, window_seconds=60
+        )
+
+    return {"rate_limiter": await _measure(call, iterations, warmup)}
+
+
+async def bench_consumer(iterations: int, warmup: int) -> dict:
+    # comment.created reloads the post's comment count, so the consumer needs a database.
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    redis = InMemoryRedis()
+    consumer = KafkaEventConsumer(async_sessionmaker(engine, expire_on_commit=False))
+    post_id = str(uuid.uuid4())
+    author_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc).isoformat()
+
+    def handler(topic: str, build: Callable[[], dict]) -> Callable[[int], Awaitable[object]]:
+        async def call(_: int) -> object:
+            return await consumer._handle_message(redis, topic, build())  # type: ignore[arg-type]
+
+        return call
+
+    cases = {
+        "post.liked": lambda: {
+            "post_id": post_id,
+            "user_id": str(uuid.uuid4()),
+            "post_author_id": author_id,
+        },
+        "post.created": lambda: {
+            "post": {
+                "id": str(uuid.uuid4()),
+                "author_id": author_id,
+                "content": "bench",
+                "media_url": None,
+                "created_at": now,
+            }
+        },
+        "comment.created": lambda: {
+            "comment": {
+                "id": str(uuid.uuid4()),
+                "post_id": post_id,
+                "author_id": author_id,
+                "content": "bench",
+                "created_at": now,
+            },
+            "post_author_id": author_id,
+        },
+    }
+    results = {
+        f"consumer._handle_message[{topic}]": await _measure(
+            handler(topic, build), iterations, warmup
+        )
+        for topic, build in cases.items()
+    }
+    await engine.dispose()
+    return results
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> list[str]:
+    regressions = []
+    for name, current in report.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get("p50_ms"):
+            continue
+        change = (current["p50_ms"] - previous["p50_ms"]) / previous["p50_ms"] * 100
+        if change > max_regression:
+            regressions.append(
+                f"{name}: p50 {previous['p50_ms']}ms -> {current['p50_ms']}ms (+{change:.1f}%)"
+            )
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> dict:
+    report: dict = {}
+    report.update(await bench_feed(args.iterations, args.warmup, args.authors, args.posts))
+    report.update(await bench_rate_limiter(args.iterations, args.warmup))
+    report.update(await bench_consumer(args.iterations, args.warmup))
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--authors", type=int, default=200, help="Followed authors in feed case")
+    parser.add_argument("--posts", type=int, default=10, help="Posts per author in feed case")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="Allowed p50 +%%")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    # Keep stdout a clean JSON document; per-event debug logs would also skew the timings.
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            regressions = compare(report, json.load(handle), args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
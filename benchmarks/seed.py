@@ -0,0 +1,157 @@
+"""Seed a synthetic social graph into the local Postgres/Redis stack.
+
+Follow targets and like counts follow a power law so a few accounts and posts are hot,
+which is what the feed and counter paths have to cope with in production.
+
+    python -m benchmarks.seed --users 5000 --posts-per-user 10 --reset
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert
+
+from app.auth.security import hash_password
+from app.cache.redis_client import redis_client
+from app.db.session import SessionLocal, engine
+from app.domain.models.user import Comment, EventOutbox, Follow, Like, Post, User
+
+BENCH_PASSWORD = "Password123!"
+BATCH_SIZE = 5000
+
+
+def bench_username(index: int) -> str:
+    return f"bench{index}"
+
+
+def _zipf_weights(count: int, alpha: float) -> list[float]:
+    return list(itertools.accumulate(1 / (rank**alpha) for rank in range(1, count + 1)))
+
+
+def _power_law(rng: random.Random, mean: float, alpha: float, cap: int) -> int:
+    # A Pareto variate scaled so that its expectation is ``mean`` (requires alpha > 1).
+    return min(int(mean * (alpha - 1) / alpha * rng.paretovariate(alpha)), cap)
+
+
+def _sample_distinct(
+    rng: random.Random, population: list, cum_weights: list[float], k: int, exclude: object
+) -> set:
+    chosen: set = set()
+    k = min(k, (len(population) - 1) // 2)
+    while len(chosen) < k:
+        for candidate in rng.choices(population, cum_weights=cum_weights, k=k - len(chosen)):
+            if candidate != exclude:
+                chosen.add(candidate)
+    return chosen
+
+
+async def _insert(model, rows: list[dict]) -> None:
+    async with SessionLocal() as session:
+        for start in range(0, len(rows), BATCH_SIZE):
+            await session.execute(insert(model), rows[start : start + BATCH_SIZE])
+        await session.commit()
+
+
+async def _reset() -> None:
+    async with SessionLocal() as session:
+        for model in (EventOutbox, Comment, Like, Follow, Post, User):
+            await session.execute(delete(model))
+        await session.commit()
+    redis = await redis_client.get_client()
+    await redis.flushdb()
+
+
+async def seed(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    if args.reset:
+        await _reset()
+
+    now = datetime.now(timezone.utc)
+    password_hash = hash_password(BENCH_PASSWORD)
+    user_ids = [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(args.users)]
+    await _insert(
+        User,
+        [
+            {
+                "id": user_id,
+                "email": f"{bench_username(index)}@bench.local",
+                "username": bench_username(index),
+                "password_hash": password_hash,
+                "role": "user",
+                "is_active": True,
+            }
+            for index, user_id in enumerate(user_ids)
+        ],
+    )
+
+    popularity = _zipf_weights(len(user_ids), args.alpha)
+    follows = []
+    for follower in user_ids:
+        fan_out = _power_law(rng, args.mean_follows, args.alpha, args.max_follows)
+        for followed in _sample_distinct(rng, user_ids, popularity, fan_out, follower):
+            follows.append({"follower_id": follower, "followed_id": followed})
+    await _insert(Follow, follows)
+
+    posts = []
+    for author in user_ids:
+        for _ in range(args.posts_per_user):
+            created_at = now - timedelta(seconds=rng.randint(0, args.days * 86400))
+            posts.append(
+                {
+                    "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+                    "author_id": author,
+                    "content": f"synthetic post {len(posts)}",
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+            )
+    await _insert(Post, posts)
+
+    likes = []
+    for post in posts:
+        like_count = _power_law(rng, args.mean_likes, args.alpha, args.max_likes)
+        for user_id in rng.sample(user_ids, min(like_count, len(user_ids))):
+            likes.append({"id": uuid.uuid4(), "post_id": post["id"], "user_id": user_id})
+    await _insert(Like, likes)
+
+    await engine.dispose()
+    await redis_client.close()
+    return {
+        "users": len(user_ids),
+        "follows": len(follows),
+        "posts": len(posts),
+        "likes": len(likes),
+        "elapsed_s": round(time.perf_counter() - started, 2),
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--mean-follows", type=int, default=50)
+    parser.add_argument("--max-follows", type=int, default=1000)
+    parser.add_argument("--posts-per-user", type=int, default=5)
+    parser.add_argument("--mean-likes", type=int, default=5)
+    parser.add_argument("--max-likes", type=int, default=500)
+    parser.add_argument("--days", type=int, default=30, help="Spread post timestamps over N days")
+    parser.add_argument("--alpha", type=float, default=1.2, help="Power-law exponent")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Wipe tables and Redis first")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    print(json.dumps(asyncio.run(seed(parse_args(argv))), indent=2))
+
+
+if __name__ == "__main__":
+    main()
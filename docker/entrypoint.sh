@@ -1,8 +1,10 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-echo "Running database migrations..."
-alembic upgrade head
-echo "Migrations complete."
+if [ "${RUN_MIGRATIONS:-true}" = "true" ]; then
+  echo "Running database migrations..."
+  alembic upgrade head
+  echo "Migrations complete."
+fi
 
 exec "$@"
@@ -0,0 +1,4 @@
+import time
+
+# Reference point for the "import" startup phase reported by app.observability.startup.
+IMPORT_STARTED_AT = time.perf_counter()
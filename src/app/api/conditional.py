@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+import redis.asyncio as aioredis
+from fastapi import Request, Response
+
+from app.cache.redis_client import REDIS_UNAVAILABLE
+from app.cache.versions import ALL, modified_at, post_version, user_version, version_store
+
+
+@dataclass
+class Validators:
+    etag: str
+    last_modified: datetime
+    # Last-Modified has one-second resolution. It is only sent once the last change is a
+    # full second old, so a later change always lands in a later second (RFC 9110 §8.8.2.2).
+    send_last_modified: bool = True
+    # False while Redis is unavailable: no validators are sent and nothing matches.
+    enabled: bool = True
+    # False for listings: which rows are on a page is only captured by the ETag, so
+    # Last-Modified is never sent and If-Modified-Since never matches.
+    dated: bool = True
+
+    @property
+    def headers(self) -> dict[str, str]:
+        if not self.enabled:
+            return {"Cache-Control": "no-cache", "Vary": "Authorization"}
+        headers = {
+            "ETag": self.etag,
+            # Storable, but always revalidated; responses differ per bearer token.
+            "Cache-Control": "no-cache",
+            "Vary": "Authorization",
+        }
+        if self.dated and self.send_last_modified:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def matches(self, request: Request) -> bool:
+        """Whether the client's copy is current (RFC 9110 §13.2.2 evaluation order)."""
+        if not self.enabled:
+            return False
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or _opaque(self.etag) in {_opaque(tag) for tag in tags}
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or not self.dated:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return self.last_modified <= since
+
+    def not_modified(self) -> Response:
+        return Response(status_code=304, headers=self.headers)
+
+    def apply(self, response: Response) -> None:
+        response.headers.update(self.headers)
+
+
+def _opaque(tag: str) -> str:
+    """Weak comparison: ``W/"x"`` and ``"x"`` match."""
+    return tag.removeprefix("W/")
+
+
+def page_versions(
+    post_ids: Sequence[str], author_ids: Sequence[str], with_authors: bool
+) -> list[str]:
+    """Versions a page of posts is built from: each listed post, and each listed author's
+    profile when the page embeds it. Pass the post ids as ``variant`` too, so a page that
+    holds different posts gets a different ETag, and ``dated=False``."""
+    names = [post_version(post_id) for post_id in post_ids]
+    if with_authors:
+        names += [user_version(author_id) for author_id in dict.fromkeys(author_ids)]
+    return names
+
+
+async def validators(
+    redis: aioredis.Redis, names: Sequence[str], *variant: object, dated: bool = True
+) -> Validators:
+    """Validators for a representation built from ``names``.
+
+    ``variant`` holds whatever else selects the representation: query parameters, and the
+    viewer for responses with per-viewer fields such as ``liked_by_me``. Costs one
+    ``MGET``. A single resource is validated before any database work; a listing first
+    loads the ids on the page, and a ``304`` then skips counts, viewer state and profiles.
+    Without Redis there is nothing to validate against and every request gets a full
+    response. Listings pass ``dated=False``: a post dropping off a page (deleted, or pushed
+    down by a newer one) changes the ids in ``variant`` but no version the page is built
+    from, so only the ETag can tell.
+    """
+    try:
+        tokens = await version_store.get_many(redis, [ALL, *names])
+    except REDIS_UNAVAILABLE:
+        return Validators("", datetime.fromtimestamp(0, timezone.utc), enabled=False)
+    digest = hashlib.sha256("|".join([*tokens, *map(str, variant)]).encode()).hexdigest()
+    modified = max(modified_at(token) for token in tokens)
+    return Validators(
+        etag=f'W/"{digest[:32]}"',
+        last_modified=datetime.fromtimestamp(int(modified), timezone.utc),
+        send_last_modified=time.time() - modified >= 1,
+        dated=dated,
+    )
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import math
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.utils.deadline import deadline_scope, expired
+from app.utils.exceptions import DeadlineExceededError, DomainError, to_http_exception
+
+HEADER = b"x-request-timeout"
+# Streaming responses run long by design; they get no deadline unless the client sets one.
+UNBOUNDED_PREFIXES = ("/exports", "/feed/stream")
+
+
+def _error(error: DomainError) -> JSONResponse:
+    http_exc = to_http_exception(error)
+    return JSONResponse(status_code=http_exc.status_code, content=http_exc.detail)
+
+
+def _parse_timeout(raw: bytes) -> float | None:
+    try:
+        seconds = float(raw.decode("latin-1"))
+    except ValueError:
+        return None
+    return seconds if seconds > 0 and math.isfinite(seconds) else None
+
+
+class DeadlineMiddleware:
+    """Give every request a deadline that DB, Redis and Kafka calls honour.
+
+    The budget is the ``X-Request-Timeout`` header in seconds, capped at
+    ``request_timeout_max_seconds``, or ``request_timeout_seconds`` by default. It is
+    held in a contextvar (see :mod:`app.utils.deadline`). If the handler fails after
+    the deadline has passed, for example because PostgreSQL cancelled a statement or a
+    Redis read was abandoned, the client gets ``504`` rather than ``500``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        raw = dict(scope["headers"]).get(HEADER)
+        if raw is not None:
+            seconds = _parse_timeout(raw)
+            if seconds is None:
+                response = _error(DomainError("X-Request-Timeout must be a positive number"))
+                await response(scope, receive, send)
+                return
+            seconds = min(seconds, settings.request_timeout_max_seconds)
+        elif scope["path"].startswith(UNBOUNDED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+        else:
+            seconds = settings.request_timeout_seconds
+
+        started = False
+
+        async def track(message: Message) -> None:
+            nonlocal started
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        with deadline_scope(seconds):
+            try:
+                await self.app(scope, receive, track)
+            except Exception:
+                if started or not expired():
+                    raise
+                await _error(DeadlineExceededError())(scope, receive, send)
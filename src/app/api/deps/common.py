@@ -1,17 +1,20 @@
 from __future__ import annotations
 
+from typing import Literal
 from uuid import UUID
 
-from fastapi import Depends, Security
+from fastapi import Depends, Query, Security
 from fastapi.security import OAuth2PasswordBearer
 
 from app.auth.security import decode_token
-from app.cache.redis_client import redis_dependency
+from app.cache.pipelining import auto_pipeline_dependency
+from app.cache.redis_client import redis_bytes_dependency, redis_dependency
 from app.db.session import get_session
 from app.repositories.users import UserRepository
 from app.utils.exceptions import NotFoundError, UnauthorizedError
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 
 async def get_current_user(token: str = Security(oauth2_scheme), session=Depends(get_session)):
@@ -27,10 +30,33 @@ async def get_current_user(token: str = Security(oauth2_scheme), session=Depends
     return user
 
 
+async def get_optional_user(
+    token: str | None = Security(optional_oauth2_scheme), session=Depends(get_session)
+):
+    """The authenticated user, or ``None`` for anonymous requests to public endpoints."""
+    if token is None:
+        return None
+    return await get_current_user(token, session)
+
+
 async def get_current_admin(user=Depends(get_current_user)):
     if user.role != "admin":
         raise UnauthorizedError("Admin privileges required")
     return user
 
 
+async def get_expand(
+    expand: list[Literal["author"]] = Query(
+        default=[],
+        description=(
+            "Related objects to embed. `author` adds a deduplicated `authors` list with the "
+            "public profile of every author on the page."
+        ),
+    ),
+) -> set[str]:
+    return set(expand)
+
+
 get_redis = redis_dependency
+get_cache_redis = redis_bytes_dependency
+get_pipelined_redis = auto_pipeline_dependency
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import hashlib
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache.idempotency import PENDING, StoredResponse, idempotency_store
+from app.cache.redis_client import REDIS_UNAVAILABLE, best_effort, redis_client
+from app.config.settings import settings
+from app.utils.exceptions import (
+    DependencyUnavailableError,
+    DomainError,
+    IdempotencyInProgressError,
+    IdempotencyKeyReusedError,
+    to_http_exception,
+)
+
+HEADER = b"idempotency-key"
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+MAX_KEY_LENGTH = 255
+# Set per response by outer middleware; replaying the original value would be misleading.
+_NOT_STORED = frozenset({b"x-request-id"})
+# Client errors that a retry of the same request would get again. Anything else (401,
+# 409, 429, 5xx, ...) may succeed later, so the key is released instead of pinned to it.
+FINAL_CLIENT_ERRORS = frozenset({400, 403, 404, 405, 410, 413, 415, 422})
+
+
+def _error(error: DomainError, headers: dict[str, str] | None = None) -> JSONResponse:
+    http_exc = to_http_exception(error)
+    return JSONResponse(status_code=http_exc.status_code, content=http_exc.detail, headers=headers)
+
+
+def _principal(scope: Scope) -> str:
+    """Keys are scoped per caller: the bearer token if present, else the client address."""
+    headers = dict(scope["headers"])
+    credential = headers.get(b"authorization")
+    if credential is None:
+        client = scope.get("client")
+        credential = (client[0] if client else "anon").encode()
+    return hashlib.sha256(credential).hexdigest()[:32]
+
+
+class IdempotencyMiddleware:
+    """Make write requests carrying an ``Idempotency-Key`` header safe to retry.
+
+    The first request with a key reserves it atomically and runs; its response (status,
+    headers and body) is stored and replayed byte-for-byte to any retry, with an
+    ``Idempotent-Replayed: true`` header. A retry that arrives while the original is
+    still running gets 409, and reusing a key for a different request gets 422. Only
+    final outcomes are stored: 2xx/3xx and the client errors in ``FINAL_CLIENT_ERRORS``.
+    Transient statuses such as 401, 409, 429 and 5xx, and exceptions, release the key
+    so the client can retry for real. While
+    Redis is unavailable, keyed writes get ``503`` unless ``idempotency_fail_open`` is set.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        raw_key = dict(scope["headers"]).get(HEADER)
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+        idempotency_key = raw_key.decode("latin-1").strip()
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            response = _error(DomainError(f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"))
+            await response(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        fingerprint = hashlib.sha256(
+            b"\0".join([scope["method"].encode(), scope["path"].encode(), body])
+        ).hexdigest()
+        redis = await redis_client.get_bytes_client()
+        key = idempotency_store.key(_principal(scope), idempotency_key)
+        try:
+            existing = await idempotency_store.reserve(redis, key, fingerprint)
+        except REDIS_UNAVAILABLE:
+            if not settings.idempotency_fail_open:
+                await _error(DependencyUnavailableError())(scope, receive, send)
+                return
+            # Policy: serve the write without replay protection rather than refuse it.
+            await self.app(scope, _replay_body(body, receive), send)
+            return
+        if existing is not None:
+            if existing.fingerprint != fingerprint:
+                response = _error(IdempotencyKeyReusedError())
+            elif existing.state == PENDING or existing.response is None:
+                response = _error(IdempotencyInProgressError(), headers={"Retry-After": "1"})
+            else:
+                await _replay(existing.response, send)
+                return
+            await response(scope, receive, send)
+            return
+
+        captured = StoredResponse(status=500)
+        chunks: list[bytes] = []
+
+        async def capture(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                captured.status = message["status"]
+                captured.headers = [
+                    (k, v) for k, v in message.get("headers", []) if k.lower() not in _NOT_STORED
+                ]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, _replay_body(body, receive), capture)
+        except BaseException:
+            await best_effort(idempotency_store.release(redis, key), "idempotency_release")
+            raise
+        if captured.status >= 400 and captured.status not in FINAL_CLIENT_ERRORS:
+            await best_effort(idempotency_store.release(redis, key), "idempotency_release")
+            return
+        captured.body = b"".join(chunks)
+        # If this fails the reservation expires after idempotency_lock_seconds.
+        await best_effort(
+            idempotency_store.complete(redis, key, fingerprint, captured), "idempotency_complete"
+        )
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if message["type"] != "http.request" or not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    """Hand the buffered body to the app once, then defer to the real channel."""
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if sent:
+            return await receive()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return replay
+
+
+async def _replay(stored: StoredResponse, send: Send) -> None:
+    headers = [*stored.headers, (b"idempotent-replayed", b"true")]
+    await send({"type": "http.response.start", "status": stored.status, "headers": headers})
+    await send({"type": "http.response.body", "body": stored.body, "more_body": False})
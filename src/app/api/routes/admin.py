@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.deps.common import get_current_admin, get_redis
+from app.config.settings import settings
+from app.db.session import get_session_factory
+from app.observability.logging import get_logger
+from app.observability.profiling import profile_event_loop, slow_request_profiles
+from app.services.rebuild_service import TARGETS, SnapshotRebuilder
+from app.utils.deadline import detached
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(get_current_admin)])
+
+# Strong references to rebuilds started from this worker so they are not garbage collected.
+_rebuilds: set[asyncio.Task] = set()
+
+
+@router.post(
+    "/profile",
+    summary="Profile the event loop",
+    description=(
+        "Samples the stack of this worker's event loop thread for `seconds` and returns "
+        "the hottest frames plus collapsed stacks ready for a flamegraph tool. "
+        "The worker keeps serving traffic while it is being sampled. Admin only."
+    ),
+    response_description="Aggregated stack samples",
+)
+async def profile(
+    seconds: float = Query(
+        5, gt=0, le=settings.profiling_max_seconds, description="Sampling duration"
+    ),
+    interval_ms: int = Query(
+        settings.profiling_sample_interval_ms,
+        ge=1,
+        le=1000,
+        description="Delay between two stack samples in milliseconds",
+    ),
+    top: int = Query(50, ge=1, le=500, description="Number of frames and stacks to return"),
+):
+    result = await profile_event_loop(seconds, interval_ms / 1000)
+    return result.to_dict(top)
+
+
+@router.get(
+    "/profile/slow-requests",
+    summary="List slow-request profiles",
+    description=(
+        "Returns the most recent profiles captured automatically for requests that exceeded "
+        "`PROFILING_SLOW_REQUEST_MS`. Capture is active when `PROFILING_ENABLED` is set. "
+        "Admin only."
+    ),
+    response_description="Recent slow-request profiles, oldest first",
+)
+async def slow_request_profiles_list():
+    return {"items": list(slow_request_profiles)}
+
+
+@router.post(
+    "/rebuild",
+    status_code=202,
+    summary="Rebuild Redis derived state",
+    description=(
+        "Starts recomputing like, comment and follower counters and the per-author feed lists "
+        "from PostgreSQL in the background of this worker. Work is batched, throttled and "
+        "checkpointed, so a run that was interrupted resumes where it stopped unless "
+        "`restart` is set. Returns 409 while another rebuild holds the lock. Admin only."
+    ),
+    response_description="The rebuild was started",
+)
+async def start_rebuild(
+    target: list[Literal["likes", "comments", "followers", "following", "feeds"]] = Query(
+        default=list(TARGETS), description="Projections to rebuild (repeatable)"
+    ),
+    restart: bool = Query(False, description="Ignore checkpoints from an interrupted run"),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    redis=Depends(get_redis),
+):
+    rebuilder = SnapshotRebuilder(session_factory, redis)
+    await rebuilder.acquire()
+    with detached():  # the rebuild outlives this request and its deadline
+        task = asyncio.create_task(rebuilder.run_locked(target, restart))
+    _rebuilds.add(task)
+    task.add_done_callback(_rebuild_done)
+    return {"status": "started", "targets": target}
+
+
+@router.get(
+    "/rebuild",
+    summary="Rebuild progress",
+    description=(
+        "Whether a rebuild is running on any worker, the per-target checkpoints and the "
+        "progress of the last run. Admin only."
+    ),
+    response_description="Rebuild lock, checkpoints and last-run status",
+)
+async def rebuild_status(
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    redis=Depends(get_redis),
+):
+    return await SnapshotRebuilder(session_factory, redis).status()
+
+
+def _rebuild_done(task: asyncio.Task) -> None:
+    _rebuilds.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Snapshot rebuild failed", error=repr(task.exception()))
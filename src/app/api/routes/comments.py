@@ -3,7 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps.common import get_current_user, get_session
+from app.api.deps.common import get_current_user, get_redis, get_session
 from app.rate_limit.dependency import rate_limiter
 from app.services.comment_service import CommentService
 
@@ -23,7 +23,8 @@ router = APIRouter(prefix="/comments", tags=["comments"])
 async def delete_comment(
     comment_id: str,
     session: AsyncSession = Depends(get_session),
+    redis=Depends(get_redis),
     user=Depends(get_current_user),
 ):
     service = CommentService(session)
-    await service.delete_comment(comment_id, str(user.id), user.role == "admin")
+    await service.delete_comment(comment_id, str(user.id), user.role == "admin", redis)
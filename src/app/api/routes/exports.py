@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.deps.common import get_current_user
+from app.db.session import get_session_factory
+from app.services.export_service import ExportService
+from app.utils.exceptions import UnauthorizedError
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+NDJSON = "application/x-ndjson"
+_USER_ID_DESCRIPTION = (
+    "User whose data to export. Defaults to the caller; other users, or everything when "
+    "omitted, require admin privileges."
+)
+
+
+def _scope(user, user_id: str | None) -> str | None:
+    """The user to export, or ``None`` for all users (admins only)."""
+    if user.role == "admin":
+        return user_id
+    if user_id is not None and user_id != str(user.id):
+        raise UnauthorizedError("Exporting another user's data requires admin privileges")
+    return str(user.id)
+
+
+def _ndjson(body, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        body,
+        media_type=NDJSON,
+        headers={"Content-Disposition": f'attachment; filename="{name}.ndjson"'},
+    )
+
+
+@router.get(
+    "/posts",
+    summary="Export posts",
+    description=(
+        "Streams posts as newline-delimited JSON, oldest first, straight from a database "
+        "cursor: there is no pagination and memory use does not depend on the export size. "
+        "Counts are not included."
+    ),
+    response_description="One post object per line",
+)
+async def export_posts(
+    user_id: str | None = Query(default=None, description=_USER_ID_DESCRIPTION),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    user=Depends(get_current_user),
+):
+    author_id = _scope(user, user_id)
+    return _ndjson(ExportService(session_factory).posts(author_id), "posts")
+
+
+@router.get(
+    "/comments",
+    summary="Export comments",
+    description=(
+        "Streams comments written by a user as newline-delimited JSON, oldest first, "
+        "straight from a database cursor."
+    ),
+    response_description="One comment object per line",
+)
+async def export_comments(
+    user_id: str | None = Query(default=None, description=_USER_ID_DESCRIPTION),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    user=Depends(get_current_user),
+):
+    author_id = _scope(user, user_id)
+    return _ndjson(ExportService(session_factory).comments(author_id), "comments")
+
+
+@router.get(
+    "/follows",
+    summary="Export the follow graph",
+    description=(
+        "Streams follow edges as newline-delimited JSON. `direction=following` exports the "
+        "users `user_id` follows and `direction=followers` the users following them. An admin "
+        "who omits `user_id` gets the whole graph."
+    ),
+    response_description="One `{follower_id, followed_id, created_at}` edge per line",
+)
+async def export_follows(
+    user_id: str | None = Query(default=None, description=_USER_ID_DESCRIPTION),
+    direction: Literal["following", "followers"] = Query(
+        "following", description="Which side of the graph to export"
+    ),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    user=Depends(get_current_user),
+):
+    subject = _scope(user, user_id)
+    service = ExportService(session_factory)
+    if direction == "following":
+        body = service.follows(follower_id=subject)
+    else:
+        body = service.follows(followed_id=subject)
+    return _ndjson(body, direction)
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
+from collections.abc import AsyncIterator
+
+import orjson
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps.common import get_current_user, get_redis, get_session
+from app.api.conditional import page_versions, validators
+from app.api.deps.common import (
+    get_cache_redis,
+    get_current_user,
+    get_expand,
+    get_pipelined_redis,
+    get_session,
+)
+from app.config.settings import settings
 from app.domain.schemas.feed import FeedResponse
 from app.domain.schemas.posts import PostOut
+from app.events.broadcaster import feed_broadcaster
 from app.services.feed_service import FeedService
+from app.services.profiles import ProfileReader
 
 router = APIRouter(prefix="/feed", tags=["feed"])
 
@@ -17,21 +31,89 @@ router = APIRouter(prefix="/feed", tags=["feed"])
     summary="Get timeline feed",
     description=(
         "Returns a paginated list of posts from users the authenticated user follows, "
-        "ordered by recency. Results are cached per user for 60 seconds."
+        "ordered by recency. Results are cached per user for 60 seconds. "
+        "Pass `expand=author` to embed the authors' public profiles. Counts and `liked_by_me` "
+        "are always current. Supports `If-None-Match` (no `Last-Modified`): the ETag "
+        "changes when the page holds different posts or a listed post's likes or comments "
+        "change (with `expand=author`, also when a listed author's profile changes)."
     ),
     response_description="Paginated feed of posts from followed users",
 )
 async def get_feed(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(20, le=100),
+    expand: set[str] = Depends(get_expand),
     session: AsyncSession = Depends(get_session),
-    redis=Depends(get_redis),
+    redis=Depends(get_pipelined_redis),
+    cache=Depends(get_cache_redis),
     user=Depends(get_current_user),
 ):
     service = FeedService(session)
-    raw_items = await service.get_feed(str(user.id), page, size, redis)
-    posts = [
-        PostOut.model_validate({**item, "like_count": item.get("like_count", 0) or 0})
-        for item in raw_items
-    ]
-    return FeedResponse(items=posts, page=page, size=size)
+    items = await service.page(str(user.id), page, size, redis, cache)
+    post_ids = [item["id"] for item in items]
+    conditional = await validators(
+        redis,
+        page_versions(post_ids, [item["author_id"] for item in items], bool(expand)),
+        page,
+        size,
+        sorted(expand),
+        user.id,
+        *post_ids,
+        dated=False,
+    )
+    if conditional.matches(request):
+        return conditional.not_modified()
+    conditional.apply(response)
+    raw_items = await service.with_viewer_state(items, str(user.id), redis)
+    posts = [PostOut.model_validate(item) for item in raw_items]
+    authors = await ProfileReader(session).expand(
+        expand, [str(post.author_id) for post in posts], redis
+    )
+    return FeedResponse(items=posts, page=page, size=size, authors=authors)
+
+
+@router.get(
+    "/stream",
+    summary="Stream new posts",
+    description=(
+        "Server-Sent Events stream of new posts from the users the authenticated user "
+        "follows, as an alternative to polling `/feed`. Each post arrives as an `event: post` "
+        "with the post JSON as `data`. A comment line is sent every "
+        "`FEED_STREAM_HEARTBEAT_SECONDS` while idle. A client that reads too slowly has posts "
+        "dropped and receives `event: resync`, after which it should refetch `/feed`. The "
+        "followed set is read on connect; reconnect to pick up new follows. Returns 503 when "
+        "this server holds `FEED_STREAM_MAX_CONNECTIONS` streams."
+    ),
+    response_class=StreamingResponse,
+    response_description="text/event-stream of new posts",
+)
+async def stream_feed(
+    session: AsyncSession = Depends(get_session),
+    user=Depends(get_current_user),
+):
+    feed_broadcaster.ensure_capacity()
+    author_ids = await FeedService(session).followed_authors(str(user.id))
+    return StreamingResponse(
+        _events(author_ids),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _events(author_ids: list[str]) -> AsyncIterator[str]:
+    # Subscribing inside the generator ties the subscription to the response: it is
+    # released when the client disconnects and Starlette closes the generator.
+    with feed_broadcaster.subscribe(author_ids) as subscription:
+        yield ": connected\n\n"
+        while True:
+            message = await subscription.next(settings.feed_stream_heartbeat_seconds)
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            if subscription.dropped:
+                missed = orjson.dumps({"missed": subscription.dropped}).decode()
+                subscription.dropped = 0
+                yield f"event: resync\ndata: {missed}\n\n"
+            yield f"event: post\ndata: {message}\n\n"
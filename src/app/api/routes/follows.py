@@ -3,7 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps.common import get_current_user, get_session
+from app.api.deps.common import get_current_user, get_redis, get_session
 from app.rate_limit.dependency import rate_limiter
 from app.services.follow_service import FollowService
 
@@ -48,7 +48,11 @@ async def unfollow_user(
 @router.get(
     "/{user_id}/followers",
     summary="List followers",
-    description="Returns a paginated list of user IDs who follow the given user.",
+    description=(
+        "Returns a paginated list of user IDs who follow the given user. `total` comes from "
+        "the follower counter maintained by the event pipeline, so it can briefly lag a "
+        "follow or unfollow."
+    ),
     response_description="Paginated list of follower user IDs",
 )
 async def list_followers(
@@ -56,9 +60,10 @@ async def list_followers(
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     size: int = Query(20, le=100, description="Number of results per page (max 100)"),
     session: AsyncSession = Depends(get_session),
+    redis=Depends(get_redis),
 ):
     service = FollowService(session)
-    items, total = await service.list_followers(user_id, page, size)
+    items, total = await service.list_followers(user_id, page, size, redis)
     return {
         "items": [item.follower_id for item in items],
         "total": total,
@@ -70,7 +75,10 @@ async def list_followers(
 @router.get(
     "/{user_id}/following",
     summary="List following",
-    description="Returns a paginated list of user IDs that the given user follows.",
+    description=(
+        "Returns a paginated list of user IDs that the given user follows. `total` comes from "
+        "the following counter maintained by the event pipeline."
+    ),
     response_description="Paginated list of followed user IDs",
 )
 async def list_following(
@@ -78,9 +86,10 @@ async def list_following(
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     size: int = Query(20, le=100, description="Number of results per page (max 100)"),
     session: AsyncSession = Depends(get_session),
+    redis=Depends(get_redis),
 ):
     service = FollowService(session)
-    items, total = await service.list_following(user_id, page, size)
+    items, total = await service.list_following(user_id, page, size, redis)
     return {
         "items": [item.followed_id for item in items],
         "total": total,
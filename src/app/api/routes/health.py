@@ -1,10 +1,33 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+import asyncio
+from collections.abc import Awaitable
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from app.api.deps.common import get_redis, get_session
+from app.cache.redis_client import redis_breaker
+from app.config.settings import settings
+from app.events.producer import kafka_breaker
+from app.roles import parse_roles, ping_kafka, uses_kafka
 
 router = APIRouter(prefix="/health", tags=["health"])
 
 
+BREAKERS = (redis_breaker, kafka_breaker)
+
+
+async def _probe(check: Awaitable[Any], degradable: bool = False) -> str:
+    try:
+        await asyncio.wait_for(check, settings.readiness_timeout_seconds)
+    except Exception as exc:
+        return f"{'degraded' if degradable else 'error'}: {type(exc).__name__}"
+    return "ok"
+
+
 @router.get(
     "/liveness",
     summary="Liveness probe",
@@ -22,10 +45,32 @@ async def liveness():
     "/readiness",
     summary="Readiness probe",
     description=(
-        "Returns 200 when the application is ready to serve traffic. "
-        "Used by container orchestrators to gate request routing."
+        "Checks the database, Redis and (for processes running the dispatcher or consumer "
+        "role) Kafka concurrently, each bounded by `READINESS_TIMEOUT_SECONDS`. Returns 200 "
+        "when every dependency answers and 503 otherwise. A failing Redis is reported as "
+        "`degraded` with status 200, since reads fall back to PostgreSQL and the Redis "
+        "circuit breaker sheds calls until a probe succeeds. `breakers` gives each circuit "
+        "breaker's state. Used by container orchestrators to gate request routing."
     ),
-    response_description="Static ready status",
+    response_description="Overall status and the result of each dependency check",
+    responses={503: {"description": "At least one dependency is unavailable"}},
 )
-async def readiness():
-    return {"status": "ready"}
+async def readiness(session=Depends(get_session), redis=Depends(get_redis)):
+    roles = parse_roles(settings.app_role_list)
+    checks = {"database": session.execute(text("SELECT 1")), "redis": redis.ping()}
+    if uses_kafka(roles):
+        checks["kafka"] = ping_kafka(roles)
+    probes = (_probe(check, degradable=name == "redis") for name, check in checks.items())
+    results = dict(zip(checks, await asyncio.gather(*probes)))
+    if not uses_kafka(roles):
+        results["kafka"] = "skipped"
+    ready = all(result.startswith(("ok", "skipped", "degraded")) for result in results.values())
+    degraded = any(result.startswith("degraded") for result in results.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "not_ready" if not ready else "degraded" if degraded else "ready",
+            "checks": results,
+            "breakers": {breaker.name: breaker.state for breaker in BREAKERS},
+        },
+    )
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps.common import get_current_user, get_expand, get_redis, get_session
+from app.domain.schemas.notifications import NotificationListResponse, NotificationOut
+from app.services.notification_service import NotificationService
+from app.services.profiles import ProfileReader
+
+router = APIRouter(prefix="/notifications", tags=["notifications"])
+
+
+@router.get(
+    "",
+    response_model=NotificationListResponse,
+    summary="List notifications",
+    description=(
+        "Returns the authenticated user's notifications, newest first, with the unread "
+        "count. Likes, comments and follows that arrive within `NOTIFICATIONS_WINDOW_SECONDS` "
+        "of each other are combined into one entry: `count` is the number of events and "
+        "`actor_ids` the most recent actors. The inbox keeps the newest "
+        "`NOTIFICATIONS_INBOX_SIZE` entries. Pass `expand=author` to embed the actors' "
+        "public profiles. The inbox is kept in Redis only; while Redis is unavailable "
+        "the endpoint answers `503`."
+    ),
+    response_description="Paginated notifications",
+)
+async def list_notifications(
+    page: int = Query(1, ge=1, description="Page number (1-indexed)"),
+    size: int = Query(20, ge=1, le=100, description="Number of results per page (max 100)"),
+    expand: set[str] = Depends(get_expand),
+    session: AsyncSession = Depends(get_session),
+    redis=Depends(get_redis),
+    user=Depends(get_current_user),
+):
+    items, unread = await NotificationService().inbox(str(user.id), page, size, redis)
+    notifications = [NotificationOut.model_validate(item) for item in items]
+    actors = await ProfileReader(session).expand(
+        expand,
+        [str(actor_id) for item in notifications for actor_id in item.actor_ids],
+        redis,
+    )
+    return NotificationListResponse(
+        items=notifications, page=page, size=size, unread_count=unread, actors=actors
+    )
+
+
+@router.post(
+    "/read",
+    status_code=204,
+    summary="Mark notifications read",
+    description="Marks every notification received so far as read and resets the unread count.",
+)
+async def mark_notifications_read(redis=Depends(get_redis), user=Depends(get_current_user)):
+    await NotificationService().mark_read(str(user.id), redis)
@@ -1,18 +1,53 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
+import uuid
+
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps.common import get_current_user, get_redis, get_session
+from app.api.conditional import page_versions, validators
+from app.api.deps.common import (
+    get_current_user,
+    get_expand,
+    get_optional_user,
+    get_pipelined_redis,
+    get_redis,
+    get_session,
+)
+from app.cache.versions import post_version
 from app.domain.schemas.comments import CommentCreate, CommentListResponse, CommentOut
-from app.domain.schemas.posts import PostCreate, PostListResponse, PostOut
+from app.domain.schemas.posts import (
+    PostCreate,
+    PostListResponse,
+    PostOut,
+    TrendingPostOut,
+    TrendingPostsResponse,
+)
 from app.rate_limit.dependency import rate_limiter
 from app.services.comment_service import CommentService
 from app.services.post_service import PostService
+from app.services.profiles import ProfileReader
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
 
+def _to_out(
+    post, counts: dict[str, tuple[int, int]], liked: set[str] | frozenset[str] = frozenset()
+) -> PostOut:
+    like_count, comment_count = counts.get(str(post.id), (0, 0))
+    return PostOut(
+        id=post.id,
+        author_id=post.author_id,
+        content=post.content,
+        media_url=post.media_url,
+        created_at=post.created_at,
+        updated_at=post.updated_at,
+        like_count=like_count,
+        comment_count=comment_count,
+        liked_by_me=str(post.id) in liked,
+    )
+
+
 @router.post(
     "",
     response_model=PostOut,
@@ -21,9 +56,10 @@ router = APIRouter(prefix="/posts", tags=["posts"])
     summary="Create a post",
     description=(
         "Publish a new text post with an optional media URL. "
-        "Idempotent: supply an `Idempotency-Key` header to prevent duplicate submissions on retry."
+        "Idempotent: supply an `Idempotency-Key` header to prevent duplicate submissions on retry; "
+        "retries receive the original response."
     ),
-    response_description="The created post with its current like count",
+    response_description="The created post with its current like and comment counts",
 )
 async def create_post(
     payload: PostCreate,
@@ -33,40 +69,71 @@ async def create_post(
 ):
     service = PostService(session)
     post = await service.create_post(str(user.id), payload, redis)
-    like_count = await service.count_likes(str(post.id), redis)
-    return PostOut(
-        id=post.id,
-        author_id=post.author_id,
-        content=post.content,
-        media_url=post.media_url,
-        created_at=post.created_at,
-        updated_at=post.updated_at,
-        like_count=like_count,
-    )
+    counts = await service.hydrate_counts([str(post.id)], redis)
+    return _to_out(post, counts)
+
+
+# Registered before "/{post_id}" so "trending" is not taken for a post id.
+@router.get(
+    "/trending",
+    response_model=TrendingPostsResponse,
+    summary="Trending posts",
+    description=(
+        "Returns the most popular recent posts. Likes and comments add to a post's score, "
+        "and the score halves every `TRENDING_HALF_LIFE_SECONDS`. The ranking is read from "
+        "a Redis sorted set maintained by the event consumer, so nothing is aggregated per "
+        "request and new activity shows up once its event is consumed. While Redis is "
+        "unavailable the list is empty."
+    ),
+    response_description="Posts ordered by current decayed score, highest first",
+)
+async def trending_posts(
+    limit: int = Query(20, ge=1, le=100, description="Number of posts to return (max 100)"),
+    session: AsyncSession = Depends(get_session),
+    redis=Depends(get_redis),
+    viewer=Depends(get_optional_user),
+):
+    service = PostService(session)
+    ranked = await service.trending(limit, redis)
+    post_ids = [str(post.id) for post, _ in ranked]
+    counts = await service.hydrate_counts(post_ids, redis)
+    liked = await service.liked_by(viewer and str(viewer.id), post_ids)
+    items = [
+        TrendingPostOut(**_to_out(post, counts, liked).model_dump(), score=score)
+        for post, score in ranked
+    ]
+    return TrendingPostsResponse(items=items)
 
 
 @router.get(
     "/{post_id}",
     response_model=PostOut,
     summary="Get a post",
-    description="Returns a single post by its UUID, including the current like count.",
-    response_description="Post detail with like count",
+    description=(
+        "Returns a single post by its UUID, including the current like and comment counts. "
+        "`liked_by_me` is set when the request is authenticated. Supports conditional "
+        "requests: send the `ETag` back in `If-None-Match` (or `Last-Modified` in "
+        "`If-Modified-Since`) to get `304 Not Modified` without the post being loaded."
+    ),
+    response_description="Post detail with like and comment counts",
 )
 async def get_post(
-    post_id: str, session: AsyncSession = Depends(get_session), redis=Depends(get_redis)
+    post_id: str,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    redis=Depends(get_pipelined_redis),
+    viewer=Depends(get_optional_user),
 ):
+    conditional = await validators(redis, [post_version(post_id)], post_id, viewer and viewer.id)
+    if conditional.matches(request):
+        return conditional.not_modified()
+    conditional.apply(response)
     service = PostService(session)
     post = await service.get_post(post_id)
-    like_count = await service.count_likes(post_id, redis)
-    return PostOut(
-        id=post.id,
-        author_id=post.author_id,
-        content=post.content,
-        media_url=post.media_url,
-        created_at=post.created_at,
-        updated_at=post.updated_at,
-        like_count=like_count,
-    )
+    counts = await service.hydrate_counts([str(post.id)], redis)
+    liked = await service.liked_by(viewer and str(viewer.id), [str(post.id)])
+    return _to_out(post, counts, liked)
 
 
 @router.get(
@@ -75,34 +142,58 @@ async def get_post(
     summary="List posts",
     description=(
         "Returns a paginated list of posts. "
-        "Optionally filter by `author_id` to retrieve posts from a specific user."
+        "Optionally filter by `author_id` to retrieve posts from a specific user. "
+        "Pass `expand=author` to embed the authors' public profiles, loaded in one batch. "
+        "For authenticated requests `liked_by_me` is resolved for the whole page in one query. "
+        "Supports `If-None-Match` (no `Last-Modified`); the ETag changes when the page "
+        "holds different posts, the total changes, or a listed post's likes or comments "
+        "change (with `expand=author`, also a listed author's profile). "
+        "Pass `before=<post id>` to page by cursor instead: the page then starts after "
+        "that post, and `page` counts from it. A cursor that no longer exists gets "
+        "`422 invalid_cursor`."
     ),
-    response_description="Paginated list of posts with like counts",
+    response_description="Paginated list of posts with like and comment counts",
 )
 async def list_posts(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     size: int = Query(20, le=100, description="Number of results per page (max 100)"),
     author_id: str | None = Query(default=None, description="Filter posts by author UUID"),
+    before: uuid.UUID | None = Query(
+        default=None, description="Keyset cursor: only posts older than this post id"
+    ),
+    expand: set[str] = Depends(get_expand),
     session: AsyncSession = Depends(get_session),
-    redis=Depends(get_redis),
+    redis=Depends(get_pipelined_redis),
+    viewer=Depends(get_optional_user),
 ):
     service = PostService(session)
-    items, total = await service.list_posts(page, size, author_id)
-    posts = []
-    for post in items:
-        like_count = await service.count_likes(str(post.id), redis)
-        posts.append(
-            PostOut(
-                id=post.id,
-                author_id=post.author_id,
-                content=post.content,
-                media_url=post.media_url,
-                created_at=post.created_at,
-                updated_at=post.updated_at,
-                like_count=like_count,
-            )
-        )
-    return PostListResponse(items=posts, page=page, size=size, total=total)
+    items, total = await service.list_posts(page, size, author_id, before)
+    post_ids = [str(post.id) for post in items]
+    conditional = await validators(
+        redis,
+        page_versions(post_ids, [str(post.author_id) for post in items], bool(expand)),
+        page,
+        size,
+        author_id,
+        before,
+        sorted(expand),
+        viewer and viewer.id,
+        total,
+        *post_ids,
+        dated=False,
+    )
+    if conditional.matches(request):
+        return conditional.not_modified()
+    conditional.apply(response)
+    counts = await service.hydrate_counts(post_ids, redis)
+    liked = await service.liked_by(viewer and str(viewer.id), post_ids)
+    posts = [_to_out(post, counts, liked) for post in items]
+    authors = await ProfileReader(session).expand(
+        expand, [str(post.author_id) for post in posts], redis
+    )
+    return PostListResponse(items=posts, page=page, size=size, total=total, authors=authors)
 
 
 @router.delete(
@@ -117,10 +208,11 @@ async def list_posts(
 async def delete_post(
     post_id: str,
     session: AsyncSession = Depends(get_session),
+    redis=Depends(get_redis),
     user=Depends(get_current_user),
 ):
     service = PostService(session)
-    await service.delete_post(post_id, str(user.id), user.role == "admin")
+    await service.delete_post(post_id, str(user.id), user.role == "admin", redis)
 
 
 @router.post(
@@ -193,42 +285,42 @@ async def add_comment(
     post_id: str,
     payload: CommentCreate,
     session: AsyncSession = Depends(get_session),
+    redis=Depends(get_redis),
     user=Depends(get_current_user),
 ):
     service = CommentService(session)
-    comment = await service.add_comment(post_id, str(user.id), payload)
-    return CommentOut(
-        id=comment.id,
-        post_id=comment.post_id,
-        author_id=comment.author_id,
-        content=comment.content,
-        created_at=comment.created_at,
-    )
+    comment = await service.add_comment(post_id, str(user.id), payload, redis)
+    return CommentOut.model_validate(comment)
 
 
 @router.get(
     "/{post_id}/comments",
     response_model=CommentListResponse,
     summary="List comments",
-    description="Returns a paginated list of comments for a post, ordered by creation time.",
+    description=(
+        "Returns a paginated list of comments for a post, newest first. "
+        "The first page of each post is served from a short-lived Redis cache. "
+        "Pass `expand=author` to embed the commenters' public profiles. "
+        "Pass `before=<comment id>` to page by cursor; `page` then counts from it. "
+        "A cursor that no longer exists gets `422 invalid_cursor`."
+    ),
     response_description="Paginated list of comments",
 )
 async def list_comments(
     post_id: str,
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     size: int = Query(20, le=100, description="Number of results per page (max 100)"),
+    before: uuid.UUID | None = Query(
+        default=None, description="Keyset cursor: only comments older than this comment id"
+    ),
+    expand: set[str] = Depends(get_expand),
     session: AsyncSession = Depends(get_session),
+    redis=Depends(get_redis),
 ):
     service = CommentService(session)
-    items, total = await service.list_comments(post_id, page, size)
-    serialized = [
-        CommentOut(
-            id=item.id,
-            post_id=item.post_id,
-            author_id=item.author_id,
-            content=item.content,
-            created_at=item.created_at,
-        )
-        for item in items
-    ]
-    return CommentListResponse(items=serialized, page=page, size=size, total=total)
+    items, total = await service.list_comments(post_id, page, size, redis, before)
+    serialized = [CommentOut.model_validate(item) for item in items]
+    authors = await ProfileReader(session).expand(
+        expand, [str(comment.author_id) for comment in serialized], redis
+    )
+    return CommentListResponse(items=serialized, page=page, size=size, total=total, authors=authors)
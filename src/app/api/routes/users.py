@@ -1,10 +1,19 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps.common import get_current_user, get_session
-from app.domain.schemas.users import UserOut, UserPublic, UserSearchResponse, UserUpdate
+from app.api.conditional import validators
+from app.api.deps.common import get_current_user, get_redis, get_session
+from app.cache.versions import user_version
+from app.domain.schemas.users import (
+    FollowSuggestionResponse,
+    UserOut,
+    UserPublic,
+    UserSearchResponse,
+    UserUpdate,
+)
+from app.services.suggestion_service import SuggestionService
 from app.services.user_service import UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -37,13 +46,36 @@ async def get_me(user=Depends(get_current_user)):
 async def update_me(
     payload: UserUpdate,
     session: AsyncSession = Depends(get_session),
+    redis=Depends(get_redis),
     user=Depends(get_current_user),
 ):
     service = UserService(session)
-    updated = await service.update_profile(str(user.id), payload)
+    updated = await service.update_profile(str(user.id), payload, redis)
     return UserOut.model_validate(updated)
 
 
+@router.get(
+    "/me/suggestions",
+    response_model=FollowSuggestionResponse,
+    summary="Suggested users to follow",
+    description=(
+        "Users followed by the people you follow, ranked by `mutual_count`, the number of "
+        "people you follow who follow them. The ranking is cached per user and kept up to "
+        "date by follow events, so it can briefly lag a follow or unfollow. While Redis "
+        "is unavailable the list is empty."
+    ),
+    response_description="Suggested profiles, most mutual follows first",
+)
+async def get_suggestions(
+    limit: int = Query(20, ge=1, le=100, description="Number of suggestions (max 100)"),
+    session: AsyncSession = Depends(get_session),
+    redis=Depends(get_redis),
+    user=Depends(get_current_user),
+):
+    service = SuggestionService(session)
+    return FollowSuggestionResponse(items=await service.suggest(str(user.id), limit, redis))
+
+
 @router.get(
     "",
     response_model=UserSearchResponse,
@@ -51,7 +83,8 @@ async def update_me(
     description=(
         "Full-text search over usernames and bios. "
         "Returns a paginated list of public profiles. "
-        "Leave `query` empty to list all users."
+        "Leave `query` empty to list all users. "
+        "Follower and following counts are read in one batch for the whole page."
     ),
     response_description="Paginated list of matching users",
 )
@@ -62,11 +95,12 @@ async def search_users(
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     size: int = Query(20, le=100, description="Number of results per page (max 100)"),
     session: AsyncSession = Depends(get_session),
+    redis=Depends(get_redis),
 ):
     service = UserService(session)
     items, total = await service.search(query, page, size)
     return UserSearchResponse(
-        items=[UserPublic(id=item.id, username=item.username, bio=item.bio) for item in items],
+        items=await service.public_profiles(items, redis),
         total=total,
         page=page,
         size=size,
@@ -78,11 +112,23 @@ async def search_users(
     response_model=UserPublic,
     summary="Get user profile",
     description=(
-        "Returns the public profile of any user by their UUID. " "Does not require authentication."
+        "Returns the public profile of any user by their UUID, with follower and following "
+        "counts. Does not require authentication. Supports `If-None-Match` / "
+        "`If-Modified-Since` for a `304` without loading the user."
     ),
     response_description="Public user profile",
 )
-async def get_user(user_id: str, session: AsyncSession = Depends(get_session)):
+async def get_user(
+    user_id: str,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    redis=Depends(get_redis),
+):
+    conditional = await validators(redis, [user_version(user_id)], user_id)
+    if conditional.matches(request):
+        return conditional.not_modified()
+    conditional.apply(response)
     service = UserService(session)
     user = await service.me(user_id)
-    return UserPublic.model_validate(user)
+    return (await service.public_profiles([user], redis))[0]
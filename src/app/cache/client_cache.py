@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, defaultdict
+from collections.abc import Sequence
+from typing import Any
+
+import redis.asyncio as aioredis
+
+from app.cache.redis_client import pool_options
+from app.config.settings import settings
+from app.observability.logging import get_logger
+
+logger = get_logger(__name__)
+
+MAX_RECONNECT_DELAY_SECONDS = 30.0
+# Where Redis publishes invalidations for clients that track with REDIRECT over RESP2.
+INVALIDATE_CHANNEL = "__redis__:invalidate"
+
+
+class ClientSideCache:
+    """In-process cache of hash fields with server-assisted invalidation.
+
+    Two dedicated connections, using only redis-py's public connection API: a listener
+    subscribed to ``__redis__:invalidate``, and a tracker that enables
+    ``CLIENT TRACKING ON REDIRECT <listener> BCAST PREFIX ...`` for the configured key
+    prefixes. Redis then publishes the key to the listener whenever any client writes a
+    matching key. Invalidation is per key, not per field: a write to one field of
+    a hash drops every cached field of that hash, which is why this is only worth enabling
+    for read-heavy keys. While the tracking connection is down nothing is served locally.
+    """
+
+    def __init__(self, prefixes: Sequence[str], max_entries: int) -> None:
+        self.prefixes = tuple(prefixes)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._fields: defaultdict[str, set[str]] = defaultdict(set)
+        self._generations: defaultdict[str, int] = defaultdict(int)
+        self._tracking = False
+        self._task: asyncio.Task[None] | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def tracks(self, key: str) -> bool:
+        return self._tracking and key.startswith(self.prefixes)
+
+    async def hmget(
+        self, redis: aioredis.Redis, name: str, fields: Sequence[str]
+    ) -> list[str | None]:
+        """``HMGET`` that serves tracked fields from memory and fetches only the rest."""
+        if not self.tracks(name):
+            return await redis.hmget(name, list(fields))
+        values: dict[str, str | None] = {}
+        missing: list[str] = []
+        for field in fields:
+            cached = self._entries.get((name, field))
+            if cached is None:
+                missing.append(field)
+            else:
+                values[field] = cached
+        self.hits += len(fields) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            generation = self._generations[name]
+            fetched = await redis.hmget(name, missing)
+            # Skip the store if an invalidation arrived while the reply was in flight.
+            store = self._tracking and generation == self._generations[name]
+            for field, value in zip(missing, fetched):
+                values[field] = value
+                if store and value is not None:
+                    self._put(name, field, value)
+        return [values[field] for field in fields]
+
+    def _put(self, name: str, field: str, value: str) -> None:
+        self._entries[(name, field)] = value
+        self._fields[name].add(field)
+        while len(self._entries) > self.max_entries:
+            (old_name, old_field), _ = self._entries.popitem(last=False)
+            self._fields[old_name].discard(old_field)
+
+    def invalidate(self, keys: Sequence[str] | None) -> None:
+        """Drop cached fields for ``keys``; ``None`` (FLUSHDB/FLUSHALL) drops everything."""
+        if keys is None:
+            self.clear()
+            return
+        for key in keys:
+            self._generations[key] += 1
+            for field in self._fields.pop(key, ()):
+                self._entries.pop((key, field), None)
+
+    def clear(self) -> None:
+        for key in list(self._generations):
+            self._generations[key] += 1
+        self._entries.clear()
+        self._fields.clear()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._track_forever())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._tracking = False
+        self.clear()
+
+    async def _track_forever(self) -> None:
+        delay = 0.5
+        while True:
+            try:
+                await self._track()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Client-side cache tracking lost", error=repr(exc), delay=delay)
+            if self._tracking:
+                delay = 0.5
+            self._tracking = False
+            self.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+
+    async def _track(self) -> None:
+        # No health checks: redis-py's PING check expects "PONG", which a subscribed
+        # RESP2 connection never sends. The loop below pings both connections itself.
+        options = pool_options() | {
+            "socket_timeout": None,
+            "max_connections": 2,
+            "health_check_interval": 0,
+        }
+        pool: aioredis.ConnectionPool = aioredis.ConnectionPool.from_url(
+            str(settings.redis_url), **options
+        )
+        try:
+            listener = await pool.get_connection("SUBSCRIBE")
+            await listener.send_command("CLIENT", "ID")
+            listener_id = await listener.read_response()
+            await listener.send_command("SUBSCRIBE", INVALIDATE_CHANNEL)
+            await listener.read_response()
+            tracker = await pool.get_connection("CLIENT")
+            args: list[Any] = ["CLIENT", "TRACKING", "ON", "REDIRECT", listener_id, "BCAST"]
+            for prefix in self.prefixes:
+                args += ["PREFIX", prefix]
+            await tracker.send_command(*args)
+            await tracker.read_response()
+            self.clear()
+            self._tracking = True
+            logger.info("Client-side cache tracking enabled", prefixes=list(self.prefixes))
+            idle = settings.redis_health_check_interval_seconds or None
+            while True:
+                reply = await listener.read_response(timeout=idle)
+                if reply is not None:
+                    self.on_message(reply)
+                    continue
+                # Quiet for a while: PING both, so a dead socket on either is noticed.
+                # Tracking lives on the tracker connection and ends with it.
+                await listener.send_command("PING", check_health=False)
+                await tracker.send_command("PING", check_health=False)
+                await tracker.read_response()
+        finally:
+            await pool.disconnect()
+
+    def on_message(self, reply: list[Any]) -> None:
+        """Handle a message from the listener; subscribed PINGs answer ``["pong", ""]``."""
+        kind = reply[0].decode() if isinstance(reply[0], bytes) else reply[0]
+        if kind != "message":
+            return
+        keys = reply[2]
+        self.invalidate(
+            None
+            if keys is None
+            else [key.decode() if isinstance(key, bytes) else key for key in keys]
+        )
+
+
+client_cache = ClientSideCache(
+    settings.redis_client_cache_prefix_list, settings.redis_client_cache_max_entries
+)
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
+
+import redis.asyncio as aioredis
+
+from app.cache.client_cache import client_cache
+from app.cache.read_through import single_flight
+from app.cache.redis_client import REDIS_UNAVAILABLE
+from app.config.settings import settings
+
+LIKE_COUNTS_KEY = "post:like_counts"
+COMMENT_COUNTS_KEY = "post:comment_counts"
+FOLLOWER_COUNTS_KEY = "user:followers"
+FOLLOWING_COUNTS_KEY = "user:following"
+UNREAD_NOTIFICATIONS_KEY = "user:notifications:unread"
+
+Loader = Callable[[Sequence[str]], Awaitable[dict[str, int]]]
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """Lamping & Veach jump consistent hash: growing N to N+1 moves only 1/(N+1) of keys."""
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return b
+
+
+def _member_hash(member: str) -> int:
+    return int.from_bytes(hashlib.blake2b(member.encode(), digest_size=8).digest(), "big")
+
+
+class CounterStore:
+    """Integer counters for one namespace, spread over ``shards`` Redis hashes.
+
+    ``post:like_counts`` becomes ``post:like_counts:0`` ... ``post:like_counts:{N-1}``, so no
+    single key (or Redis Cluster slot) takes every write and each hash stays small enough
+    to persist and replicate cheaply. Members are placed with a jump consistent hash;
+    after changing ``COUNTER_SHARDS`` the members that moved simply miss and are reloaded
+    from the database by :meth:`read_through`.
+    """
+
+    def __init__(self, namespace: str, shards: int | None = None) -> None:
+        self.namespace = namespace
+        self.shards = shards or settings.counter_shards
+
+    def key_for(self, member: str) -> str:
+        return f"{self.namespace}:{jump_hash(_member_hash(member), self.shards)}"
+
+    def _group(self, members: Iterable[str]) -> dict[str, list[str]]:
+        groups: defaultdict[str, list[str]] = defaultdict(list)
+        for member in members:
+            groups[self.key_for(member)].append(member)
+        return groups
+
+    async def incr(
+        self,
+        redis: aioredis.Redis,
+        member: str,
+        amount: int = 1,
+        floor: int | None = 0,
+        if_cached: bool = False,
+    ) -> int | None:
+        """Add ``amount`` and return the new value, clamped to ``floor`` when given.
+
+        With ``if_cached`` a missing counter is left alone and ``None`` is returned: the next
+        :meth:`read_through` loads it from the database, which already includes this change.
+        """
+        key = self.key_for(member)
+        if if_cached and not await redis.hexists(key, member):
+            return None
+        value = await redis.hincrby(key, member, amount)
+        if floor is not None and value < floor:
+            await redis.hset(key, member, floor)
+            return floor
+        return value
+
+    async def get(self, redis: aioredis.Redis, member: str) -> int | None:
+        return (await self.get_many(redis, [member]))[member]
+
+    async def get_many(
+        self, redis: aioredis.Redis, members: Sequence[str]
+    ) -> dict[str, int | None]:
+        """One HMGET per touched shard, issued concurrently; ``None`` marks a miss.
+
+        While Redis is unavailable every member is a miss, so readers fall back to the
+        database through :meth:`fill_missing`.
+        """
+        groups = self._group(dict.fromkeys(members))
+        try:
+            replies = await asyncio.gather(
+                *(client_cache.hmget(redis, key, fields) for key, fields in groups.items())
+            )
+        except REDIS_UNAVAILABLE:
+            return dict.fromkeys(members)
+        values: dict[str, int | None] = {}
+        for fields, reply in zip(groups.values(), replies):
+            for field, value in zip(fields, reply):
+                values[field] = int(value) if value is not None else None
+        return values
+
+    async def set_many(self, redis: aioredis.Redis, values: Mapping[str, int]) -> None:
+        groups = self._group(values)
+        await asyncio.gather(
+            *(
+                redis.hset(key, mapping={field: values[field] for field in fields})
+                for key, fields in groups.items()
+            )
+        )
+
+    async def fill_missing(
+        self, redis: aioredis.Redis, values: Mapping[str, int | None], loader: Loader
+    ) -> dict[str, int]:
+        """Resolve misses in ``values`` with one ``loader`` call and write them back.
+
+        Concurrent callers missing the same members share one load (see
+        :func:`~app.cache.read_through.single_flight`); the rest read the backfill.
+        """
+        missing = [member for member, value in values.items() if value is None]
+        counts = {member: value for member, value in values.items() if value is not None}
+        if missing:
+
+            async def load() -> dict[str, int]:
+                loaded = await loader(missing)
+                backfill = {member: loaded.get(member, 0) for member in missing}
+                await self.set_many(redis, backfill)
+                return backfill
+
+            async def ready() -> dict[str, int] | None:
+                filled = await self.get_many(redis, missing)
+                if any(value is None for value in filled.values()):
+                    return None
+                return {member: value for member, value in filled.items() if value is not None}
+
+            digest = hashlib.blake2b("\0".join(sorted(missing)).encode(), digest_size=8)
+            lock = f"{self.namespace}:fill:{digest.hexdigest()}"
+            try:
+                counts.update(await single_flight(redis, lock, load, ready))
+            except REDIS_UNAVAILABLE:
+                loaded = await loader(missing)
+                counts.update({member: loaded.get(member, 0) for member in missing})
+        return counts
+
+    async def read_through(
+        self, redis: aioredis.Redis, members: Sequence[str], loader: Loader
+    ) -> dict[str, int]:
+        if not members:
+            return {}
+        return await self.fill_missing(redis, await self.get_many(redis, members), loader)
+
+
+like_counter = CounterStore(LIKE_COUNTS_KEY)
+comment_counter = CounterStore(COMMENT_COUNTS_KEY)
+follower_counter = CounterStore(FOLLOWER_COUNTS_KEY)
+following_counter = CounterStore(FOLLOWING_COUNTS_KEY)
+unread_notification_counter = CounterStore(UNREAD_NOTIFICATIONS_KEY)
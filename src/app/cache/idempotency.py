@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass, field
+
+import orjson
+import redis.asyncio as aioredis
+
+from app.config.settings import settings
+
+PENDING = "pending"
+DONE = "done"
+
+
+@dataclass
+class StoredResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]] = field(default_factory=list)
+    body: bytes = b""
+
+
+@dataclass
+class IdempotencyRecord:
+    state: str
+    fingerprint: str
+    response: StoredResponse | None = None
+
+    def dumps(self) -> bytes:
+        data: dict = {"state": self.state, "fingerprint": self.fingerprint}
+        if self.response is not None:
+            data["status"] = self.response.status
+            data["headers"] = [
+                [k.decode("latin-1"), v.decode("latin-1")] for k, v in self.response.headers
+            ]
+            data["body"] = base64.b64encode(self.response.body).decode()
+        return orjson.dumps(data)
+
+    @classmethod
+    def loads(cls, raw: bytes | str) -> IdempotencyRecord:
+        data = orjson.loads(raw)
+        response = None
+        if data["state"] == DONE:
+            response = StoredResponse(
+                status=data["status"],
+                headers=[(k.encode("latin-1"), v.encode("latin-1")) for k, v in data["headers"]],
+                body=base64.b64decode(data["body"]),
+            )
+        return cls(state=data["state"], fingerprint=data["fingerprint"], response=response)
+
+
+class IdempotencyStore:
+    """Reserve-then-complete records for idempotent writes.
+
+    ``reserve`` is a single ``SET NX``: exactly one request wins a key and runs; every
+    concurrent or later request with the same key gets the existing record instead. The
+    pending reservation expires after ``idempotency_lock_seconds`` so a crashed worker
+    cannot block a key forever; completed responses are kept for
+    ``idempotency_ttl_seconds``.
+    """
+
+    prefix = "idempotency"
+
+    def key(self, scope: str, idempotency_key: str) -> str:
+        return f"{self.prefix}:{scope}:{idempotency_key}"
+
+    async def reserve(
+        self, redis: aioredis.Redis, key: str, fingerprint: str
+    ) -> IdempotencyRecord | None:
+        """Return ``None`` if this caller now owns ``key``, else the record that exists."""
+        pending = IdempotencyRecord(state=PENDING, fingerprint=fingerprint)
+        if await redis.set(key, pending.dumps(), nx=True, ex=settings.idempotency_lock_seconds):
+            return None
+        raw = await redis.get(key)
+        if raw is None:  # expired or released between SET and GET; treat as in flight
+            return pending
+        return IdempotencyRecord.loads(raw)
+
+    async def complete(
+        self, redis: aioredis.Redis, key: str, fingerprint: str, response: StoredResponse
+    ) -> None:
+        record = IdempotencyRecord(state=DONE, fingerprint=fingerprint, response=response)
+        await redis.set(key, record.dumps(), ex=settings.idempotency_ttl_seconds)
+
+    async def release(self, redis: aioredis.Redis, key: str) -> None:
+        """Drop a reservation so the client may retry (used when the request failed)."""
+        await redis.delete(key)
+
+
+idempotency_store = IdempotencyStore()
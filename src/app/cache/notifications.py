@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+
+import orjson
+import redis.asyncio as aioredis
+
+from app.cache.counters import unread_notification_counter
+from app.cache.redis_client import redis_client
+from app.config.settings import settings
+from app.observability.logging import get_logger
+from app.observability.metrics import NOTIFICATIONS_WRITTEN
+
+logger = get_logger(__name__)
+
+LIKE = "like"
+COMMENT = "comment"
+FOLLOW = "follow"
+
+DUE_KEY = "notifications:due"
+# Actors kept per aggregated notification ("alice, bob and 8 others liked your post").
+MAX_ACTORS = 3
+# A pending group outlives its window by this much in case no flusher is running.
+PENDING_TTL_SECONDS = 3600
+
+
+def inbox_key(user_id: str) -> str:
+    return f"notifications:{user_id}"
+
+
+def read_at_key(user_id: str) -> str:
+    return f"notifications:{user_id}:read_at"
+
+
+def _pending_key(member: str) -> str:
+    return f"notifications:pending:{member}"
+
+
+def _actors_key(member: str) -> str:
+    return f"notifications:pending:{member}:actors"
+
+
+class NotificationStore:
+    """Per-user notification inboxes with burst aggregation.
+
+    Events are not written to the inbox one by one. :meth:`record` adds the actor to a
+    pending group keyed by recipient, kind and post (for example every like on one post).
+    The first event of a group schedules it in the ``notifications:due`` sorted set
+    ``window`` seconds out. :meth:`flush_due` turns each due group into a single inbox
+    entry ("N people liked your post") and bumps the recipient's unread counter once.
+
+    An inbox is a list capped at ``notifications_inbox_size``, newest first. A page is
+    one ``LRANGE``. Entries at or before the user's read marker are reported as read.
+    """
+
+    def __init__(self, window_seconds: float | None = None) -> None:
+        self.window = (
+            settings.notifications_window_seconds if window_seconds is None else window_seconds
+        )
+
+    async def record(
+        self,
+        redis: aioredis.Redis,
+        recipient_id: str,
+        kind: str,
+        actor_id: str,
+        post_id: str | None = None,
+    ) -> None:
+        if actor_id == recipient_id:
+            return
+        member = f"{recipient_id}:{kind}:{post_id or ''}"
+        pending, actors = _pending_key(member), _actors_key(member)
+        pipe = redis.pipeline(transaction=True)
+        pipe.hincrby(pending, "count", 1)
+        pipe.hset(pending, mapping={"kind": kind, "post_id": post_id or ""})
+        pipe.lpush(actors, actor_id)
+        pipe.ltrim(actors, 0, MAX_ACTORS - 1)
+        pipe.expire(pending, PENDING_TTL_SECONDS)
+        pipe.expire(actors, PENDING_TTL_SECONDS)
+        # NX: later events in the burst join the group without pushing its deadline out.
+        pipe.zadd(DUE_KEY, {member: time.time() + self.window}, nx=True)
+        await pipe.execute()
+
+    async def flush_due(self, redis: aioredis.Redis, now: float | None = None) -> int:
+        """Write every group whose window has closed; return how many were written."""
+        now = time.time() if now is None else now
+        due = await redis.zrangebyscore(
+            DUE_KEY, "-inf", now, start=0, num=settings.notifications_flush_batch
+        )
+        written = 0
+        for member in due:
+            # ZREM is the claim: with several flushers only one gets 1 back.
+            if not await redis.zrem(DUE_KEY, member):
+                continue
+            pending, actors = _pending_key(member), _actors_key(member)
+            pipe = redis.pipeline(transaction=True)
+            pipe.hgetall(pending)
+            pipe.lrange(actors, 0, -1)
+            pipe.delete(pending, actors)
+            group, actor_ids, _ = await pipe.execute()
+            if not group:
+                continue
+            recipient_id = member.split(":", 1)[0]
+            await self._write(recipient_id, group, actor_ids, redis)
+            written += 1
+        if written:
+            NOTIFICATIONS_WRITTEN.inc(written)
+        return written
+
+    async def _write(
+        self, recipient_id: str, group: dict, actor_ids: list[str], redis: aioredis.Redis
+    ) -> None:
+        # Stamped when written, so it never predates a read marker set before it arrived.
+        entry = {
+            "id": str(uuid.uuid4()),
+            "kind": group["kind"],
+            "post_id": group["post_id"] or None,
+            "actor_ids": actor_ids,
+            "count": int(group["count"]),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        key = inbox_key(recipient_id)
+        pipe = redis.pipeline(transaction=False)
+        pipe.lpush(key, orjson.dumps(entry).decode())
+        pipe.ltrim(key, 0, settings.notifications_inbox_size - 1)
+        await pipe.execute()
+        await unread_notification_counter.incr(redis, recipient_id, 1)
+
+    async def page(
+        self, redis: aioredis.Redis, user_id: str, offset: int, limit: int
+    ) -> list[dict]:
+        raw = await redis.lrange(inbox_key(user_id), offset, offset + limit - 1)
+        read_at = await redis.get(read_at_key(user_id))
+        items = [orjson.loads(item) for item in raw]
+        for item in items:
+            item["read"] = read_at is not None and item["created_at"] <= read_at
+        return items
+
+    async def unread(self, redis: aioredis.Redis, user_id: str) -> int:
+        return await unread_notification_counter.get(redis, user_id) or 0
+
+    async def mark_read(self, redis: aioredis.Redis, user_id: str) -> None:
+        await redis.set(read_at_key(user_id), datetime.now(timezone.utc).isoformat())
+        await unread_notification_counter.set_many(redis, {user_id: 0})
+
+
+class NotificationFlusher:
+    """Runs :meth:`NotificationStore.flush_due` every ``interval`` seconds."""
+
+    def __init__(self, store: NotificationStore, interval: float) -> None:
+        self.store = store
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                written = await self.store.flush_due(await redis_client.get_client())
+                logger.debug("Notifications flushed", written=written)
+            except Exception:  # keep the loop alive; the next run retries
+                logger.exception("Notification flush failed")
+
+
+notification_store = NotificationStore()
+notification_flusher = NotificationFlusher(
+    notification_store, settings.notifications_flush_interval_seconds
+)
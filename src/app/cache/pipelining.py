@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+import redis.asyncio as aioredis
+from fastapi import Depends
+
+from app.cache.redis_client import redis_dependency
+
+# Attributes that are not single commands and must reach the wrapped client untouched.
+_PASSTHROUGH = frozenset({"pipeline", "pubsub", "close", "aclose", "connection_pool"})
+
+
+def _resolve(future: asyncio.Future, result: Any) -> None:
+    if future.done():  # the awaiting task was cancelled
+        return
+    if isinstance(result, Exception):
+        future.set_exception(result)
+    else:
+        future.set_result(result)
+
+
+class AutoPipeline:
+    """Merge commands awaited in the same event-loop tick into one pipelined round trip.
+
+    Wraps a client and exposes the same coroutine methods. Commands are queued and
+    flushed by a callback scheduled with ``call_soon``, so every task that runs before
+    the loop gets back to it (e.g. the branches of an ``asyncio.gather``) shares a
+    single non-transactional pipeline. A command awaited on its own is
+    sent directly, so sequential code pays no extra cost beyond one loop tick.
+    """
+
+    def __init__(self, client: aioredis.Redis) -> None:
+        self._client = client
+        self._pending: list[tuple[str, tuple, dict, asyncio.Future]] = []
+        self._flushes: set[asyncio.Task[None]] = set()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name in _PASSTHROUGH or name.startswith("_") or not callable(attr):
+            return attr
+
+        async def queued(*args: Any, **kwargs: Any) -> Any:
+            return await self._enqueue(name, args, kwargs)
+
+        return queued
+
+    async def _enqueue(self, name: str, args: tuple, kwargs: dict) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending:
+            loop.call_soon(self._schedule_flush)
+        self._pending.append((name, args, kwargs, future))
+        return await future
+
+    def _schedule_flush(self) -> None:
+        task = asyncio.create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self) -> None:
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        if len(batch) == 1:
+            name, args, kwargs, future = batch[0]
+            try:
+                _resolve(future, await getattr(self._client, name)(*args, **kwargs))
+            except Exception as exc:
+                _resolve(future, exc)
+            return
+        pipe = self._client.pipeline(transaction=False)
+        for name, args, kwargs, _ in batch:
+            getattr(pipe, name)(*args, **kwargs)
+        try:
+            results = await pipe.execute(raise_on_error=False)
+        except Exception as exc:
+            for *_, future in batch:
+                _resolve(future, exc)
+            return
+        for (*_, future), result in zip(batch, results):
+            _resolve(future, result)
+
+    async def aclose(self) -> None:
+        """Send anything still queued; called when the owning request finishes."""
+        await self.flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+
+async def auto_pipeline_dependency(
+    redis: aioredis.Redis = Depends(redis_dependency),
+) -> AsyncIterator[AutoPipeline]:
+    """Request-scoped :class:`AutoPipeline` over the shared client."""
+    pipeline = AutoPipeline(redis)
+    try:
+        yield pipeline
+    finally:
+        await pipeline.aclose()
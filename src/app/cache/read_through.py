@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import secrets
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+import orjson
+import redis.asyncio as aioredis
+
+from app.config.settings import settings
+from app.observability.metrics import READ_THROUGH_CACHE
+
+T = TypeVar("T")
+
+POLL_SECONDS = 0.025
+
+
+def lock_key(key: str) -> str:
+    return f"{key}:lock"
+
+
+async def _acquire(redis: aioredis.Redis, key: str) -> str | None:
+    token = secrets.token_hex(8)
+    if await redis.set(lock_key(key), token, nx=True, ex=settings.cache_lock_seconds):
+        return token
+    return None
+
+
+async def _release(redis: aioredis.Redis, key: str, token: str) -> None:
+    # Only the holder deletes; a lock that expired mid-compute may belong to someone else.
+    held = await redis.get(lock_key(key))
+    if held in (token, token.encode()):
+        await redis.delete(lock_key(key))
+
+
+async def single_flight(
+    redis: aioredis.Redis,
+    key: str,
+    compute: Callable[[], Awaitable[T]],
+    ready: Callable[[], Awaitable[T | None]],
+) -> T:
+    """Run ``compute`` in one caller per ``key`` across all workers.
+
+    The caller that wins ``SET NX`` on ``{key}:lock`` computes, and ``compute`` is
+    expected to publish its result where ``ready`` looks. Everyone else polls ``ready``
+    until it returns a value. After ``cache_lock_wait_seconds`` they compute themselves,
+    so a crashed holder costs latency, not errors.
+    """
+    deadline = time.monotonic() + settings.cache_lock_wait_seconds
+    while True:
+        token = await _acquire(redis, key)
+        if token is not None:
+            try:
+                return await compute()
+            finally:
+                await _release(redis, key, token)
+        await asyncio.sleep(POLL_SECONDS)
+        value = await ready()
+        if value is not None:
+            return value
+        if time.monotonic() >= deadline:
+            return await compute()
+
+
+class ReadThroughCache:
+    """A Redis read-through cache that lets one caller, not all of them, rebuild a hot key.
+
+    Each entry stores the value together with how long it took to compute (``delta``)
+    and its logical expiry. Three things keep a popular key from stampeding the
+    database:
+
+    * XFetch early refresh (Vattani et al.): a reader refreshes ahead of expiry with a
+      probability that rises as expiry nears and as ``delta`` grows. Refreshes are spread
+      out instead of all landing at the expiry instant.
+    * Stale-while-revalidate: the key outlives its logical expiry by ``stale_seconds``.
+      A refresh is taken by whichever reader wins the lock, and everyone else keeps
+      getting the stale value meanwhile.
+    * Single-flight on a true miss (:func:`single_flight`): one reader computes while the
+      others wait briefly for its result.
+
+    Values must be JSON serialisable; either a ``str`` or a ``bytes`` client works.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        stale_seconds: float | None = None,
+        beta: float | None = None,
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.stale_seconds = (
+            settings.cache_stale_seconds if stale_seconds is None else stale_seconds
+        )
+        self.beta = settings.cache_xfetch_beta if beta is None else beta
+
+    async def get(
+        self, redis: aioredis.Redis, key: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        entry = await self._read(redis, key)
+        if entry is None:
+            READ_THROUGH_CACHE.labels(cache=self.name, outcome="miss").inc()
+            return await single_flight(
+                redis,
+                key,
+                lambda: self._store(redis, key, compute),
+                lambda: self._value(redis, key),
+            )
+        now = time.time()
+        if not self._should_refresh(entry, now):
+            READ_THROUGH_CACHE.labels(cache=self.name, outcome="hit").inc()
+            return entry["value"]
+        token = await _acquire(redis, key)
+        if token is None:
+            # Someone else is refreshing; serve what we have.
+            READ_THROUGH_CACHE.labels(cache=self.name, outcome="stale").inc()
+            return entry["value"]
+        outcome = "expired" if now >= entry["expiry"] else "early"
+        READ_THROUGH_CACHE.labels(cache=self.name, outcome=outcome).inc()
+        try:
+            return await self._store(redis, key, compute)
+        finally:
+            await _release(redis, key, token)
+
+    def _should_refresh(self, entry: dict, now: float) -> bool:
+        # -log(u) for u in (0, 1] is an Exp(1) draw.
+        jitter = -entry["delta"] * self.beta * math.log(1.0 - random.random())
+        return now + jitter >= entry["expiry"]
+
+    async def _read(self, redis: aioredis.Redis, key: str) -> dict | None:
+        raw = await redis.get(key)
+        return orjson.loads(raw) if raw is not None else None
+
+    async def _value(self, redis: aioredis.Redis, key: str) -> Any:
+        entry = await self._read(redis, key)
+        return entry["value"] if entry is not None else None
+
+    async def _store(
+        self, redis: aioredis.Redis, key: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        started = time.perf_counter()
+        value = await compute()
+        entry = {
+            "value": value,
+            "delta": time.perf_counter() - started,
+            "expiry": time.time() + self.ttl,
+        }
+        await redis.set(key, orjson.dumps(entry), ex=math.ceil(self.ttl + self.stale_seconds))
+        return value
@@ -1,19 +1,108 @@
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Awaitable
+from typing import Any
 
 import redis.asyncio as aioredis
+from redis.asyncio.connection import Connection, SSLConnection
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
 from app.config.settings import settings
+from app.observability.logging import get_logger
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.deadline import bounded, check, detached
+from app.utils.exceptions import DependencyUnavailableError
+
+logger = get_logger(__name__)
+
+# What the breaker counts as Redis being down or too slow.
+REDIS_FAILURES = (RedisConnectionError, RedisTimeoutError, OSError)
+# What callers with a database fallback catch: the above, or the breaker failing fast.
+REDIS_UNAVAILABLE = (DependencyUnavailableError, RedisConnectionError, RedisTimeoutError)
+
+redis_breaker = CircuitBreaker(
+    "redis", settings.redis_breaker_failure_threshold, settings.redis_breaker_reset_seconds
+)
+
+
+class GuardedConnection(Connection):
+    """A connection that honours the request deadline and the Redis circuit breaker.
+
+    ``socket_timeout`` is one static value for the pool, so the per-request bound is
+    applied here instead. A reply abandoned mid-read disconnects the connection (redis-py
+    does this for any interrupted read), so the pool never reuses it out of sync.
+
+    Every command passes :data:`redis_breaker` before it is sent, and connection errors
+    and socket timeouts count against it. Replies count as successes. Running out of
+    request deadline is not counted, since that says more about the request than about
+    Redis.
+    """
+
+    async def connect(self) -> None:
+        if not self.is_connected:
+            redis_breaker.fail_fast()
+        try:
+            await super().connect()
+        except REDIS_FAILURES:
+            redis_breaker.record_failure()
+            raise
+
+    async def send_packed_command(self, *args: Any, **kwargs: Any) -> None:
+        check()
+        redis_breaker.check()
+        try:
+            await super().send_packed_command(*args, **kwargs)
+        except REDIS_FAILURES:
+            redis_breaker.record_failure()
+            raise
+
+    async def read_response(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            response = await bounded(super().read_response(*args, **kwargs))
+        except REDIS_FAILURES:
+            redis_breaker.record_failure()
+            raise
+        if response is not None:  # None is also a pub/sub poll that timed out
+            redis_breaker.record_success()
+        return response
+
+
+class GuardedSSLConnection(GuardedConnection, SSLConnection):
+    pass
+
+
+def pool_options() -> dict[str, Any]:
+    """Connection pool limits shared by every client created from ``REDIS_URL``."""
+    secure = settings.redis_url.startswith("rediss://")
+    return {
+        "connection_class": GuardedSSLConnection if secure else GuardedConnection,
+        "max_connections": settings.redis_max_connections,
+        "socket_timeout": settings.redis_socket_timeout_seconds,
+        "socket_connect_timeout": settings.redis_socket_connect_timeout_seconds,
+        "socket_keepalive": True,
+        "health_check_interval": settings.redis_health_check_interval_seconds,
+        "retry_on_timeout": True,
+    }
 
 
 class RedisClient:
+    """Lazily created Redis clients.
+
+    ``get_client`` decodes replies to ``str`` and is what services use. ``get_bytes_client``
+    has its own pool and returns raw ``bytes`` so cached JSON payloads can be handed to
+    ``orjson`` without a decode/encode round trip.
+    """
+
     def __init__(self) -> None:
         self._client: aioredis.Redis | None = None
+        self._bytes_client: aioredis.Redis | None = None
 
     def init(self) -> aioredis.Redis:
         if self._client is None:
-            self._client = aioredis.from_url(str(settings.redis_url), decode_responses=True)
+            self._client = aioredis.from_url(
+                str(settings.redis_url), decode_responses=True, **pool_options()
+            )
         return self._client
 
     async def get_client(self) -> aioredis.Redis:
@@ -22,10 +111,25 @@ class RedisClient:
         assert self._client is not None
         return self._client
 
+    async def get_bytes_client(self) -> aioredis.Redis:
+        if self._bytes_client is None:
+            self._bytes_client = aioredis.from_url(
+                str(settings.redis_url), decode_responses=False, **pool_options()
+            )
+        return self._bytes_client
+
+    async def ping(self) -> None:
+        """Open a pooled connection now instead of on the first request."""
+        client = await self.get_client()
+        await client.ping()
+
     async def close(self) -> None:
         if self._client:
             await self._client.close()
             self._client = None
+        if self._bytes_client:
+            await self._bytes_client.close()
+            self._bytes_client = None
 
 
 redis_client = RedisClient()
@@ -34,3 +138,23 @@ redis_client = RedisClient()
 async def redis_dependency() -> AsyncIterator[aioredis.Redis]:
     client = await redis_client.get_client()
     yield client
+
+
+async def redis_bytes_dependency() -> AsyncIterator[aioredis.Redis]:
+    client = await redis_client.get_bytes_client()
+    yield client
+
+
+async def best_effort(awaitable: Awaitable[Any], action: str) -> None:
+    """Await a Redis side effect of a write that is already committed.
+
+    If Redis is unavailable the write has still happened, so the failure is logged rather
+    than turned into an error the client would retry. The side effect runs outside the
+    request deadline: a write that is already committed must not end in ``504``, and an
+    abandoned counter update would leave the cache wrong.
+    """
+    try:
+        with detached():
+            await awaitable
+    except REDIS_UNAVAILABLE as exc:
+        logger.warning("Skipped Redis update", action=action, error=type(exc).__name__)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import redis.asyncio as aioredis
+from redis.exceptions import WatchError
+
+from app.cache.redis_client import redis_client
+from app.config.settings import settings
+from app.observability.logging import get_logger
+
+logger = get_logger(__name__)
+
+TRENDING_KEY = "posts:trending"
+EPOCH_KEY = "posts:trending:epoch"
+# Stored scores grow by 2x per half-life since the epoch; rebase long before float limits.
+REBASE_AFTER_HALF_LIVES = 64
+
+
+def _timestamp(at: datetime | float | None) -> float:
+    if at is None:
+        return time.time()
+    if isinstance(at, datetime):
+        return (at if at.tzinfo else at.replace(tzinfo=timezone.utc)).timestamp()
+    return at
+
+
+class TrendingStore:
+    """Time-decayed post popularity in a single sorted set.
+
+    Rather than decaying every member as time passes, an interaction at time ``t`` adds
+    ``weight * 2 ** ((t - epoch) / half_life)``. Newer interactions are worth
+    exponentially more. That ranks posts exactly as if every older score had halved once
+    per half-life, so the top N is a plain ``ZREVRANGE``. Dividing by the same factor at
+    read time turns a stored score back into its current decayed value.
+    :meth:`compact` drops members that have decayed away, caps the set size and
+    periodically rebases the epoch so stored scores stay small. Increments and rebases
+    both ``WATCH`` the epoch, so neither can apply a factor computed for a stale epoch.
+    """
+
+    def __init__(self, key: str = TRENDING_KEY, half_life_seconds: float | None = None) -> None:
+        self.key = key
+        self.half_life = half_life_seconds or settings.trending_half_life_seconds
+
+    def _growth(self, at: float, epoch: float) -> float:
+        return 2 ** ((at - epoch) / self.half_life)
+
+    async def _epoch(self, redis: aioredis.Redis) -> float:
+        raw = await redis.get(EPOCH_KEY)
+        if raw is None:
+            started = repr(time.time())
+            # SET NX so that concurrent first writers agree on a single epoch.
+            await redis.set(EPOCH_KEY, started, nx=True)
+            raw = await redis.get(EPOCH_KEY) or started
+        return float(raw)
+
+    async def record(
+        self,
+        redis: aioredis.Redis,
+        post_id: str,
+        weight: float,
+        at: datetime | float | None = None,
+    ) -> None:
+        timestamp = _timestamp(at)
+        async with redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(EPOCH_KEY)
+                    raw = await pipe.get(EPOCH_KEY)
+                    if raw is None:
+                        await pipe.reset()
+                        await self._epoch(redis)
+                        continue
+                    # EXEC fails if compact() rebased since the read; retry on the new epoch.
+                    pipe.multi()
+                    pipe.zincrby(self.key, weight * self._growth(timestamp, float(raw)), post_id)
+                    await pipe.execute()
+                    return
+                except WatchError:
+                    continue
+
+    async def top(
+        self, redis: aioredis.Redis, limit: int, now: float | None = None
+    ) -> list[tuple[str, float]]:
+        """The ``limit`` highest ranked post ids with their current decayed scores."""
+        epoch = await self._epoch(redis)
+        scale = self._growth(_timestamp(now), epoch)
+        ranked = await redis.zrevrange(self.key, 0, limit - 1, withscores=True)
+        return [(str(member), float(score) / scale) for member, score in ranked]
+
+    async def remove(self, redis: aioredis.Redis, *post_ids: str) -> None:
+        if post_ids:
+            await redis.zrem(self.key, *post_ids)
+
+    async def compact(self, redis: aioredis.Redis, now: float | None = None) -> int:
+        """Prune decayed and excess members, rebase if due; return members removed."""
+        now = _timestamp(now)
+        epoch = await self._epoch(redis)
+        scale = self._growth(now, epoch)
+        removed = await redis.zremrangebyscore(
+            self.key, "-inf", settings.trending_min_score * scale
+        )
+        removed += await redis.zremrangebyrank(self.key, 0, -(settings.trending_max_size + 1))
+        if (now - epoch) / self.half_life >= REBASE_AFTER_HALF_LIVES:
+            await self._rebase(redis, now)
+        return removed
+
+    async def _rebase(self, redis: aioredis.Redis, now: float) -> None:
+        async with redis.pipeline(transaction=True) as pipe:
+            await pipe.watch(EPOCH_KEY)
+            epoch = float(await pipe.get(EPOCH_KEY))
+            if (now - epoch) / self.half_life < REBASE_AFTER_HALF_LIVES:
+                return  # another compactor rebased since compact() read the epoch
+            pipe.multi()
+            pipe.zunionstore(self.key, {self.key: 1 / self._growth(now, epoch)})
+            pipe.set(EPOCH_KEY, repr(now))
+            try:
+                await pipe.execute()
+            except WatchError:
+                # Another compactor rebased first; rescaling again would shrink scores twice.
+                pass
+
+
+class TrendingCompactor:
+    """Runs :meth:`TrendingStore.compact` every ``interval`` seconds."""
+
+    def __init__(self, store: TrendingStore, interval: float) -> None:
+        self.store = store
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                removed = await self.store.compact(await redis_client.get_client())
+                logger.debug("Trending set compacted", removed=removed)
+            except Exception:  # keep the loop alive; the next run retries
+                logger.exception("Trending compaction failed")
+
+
+trending_store = TrendingStore()
+trending_compactor = TrendingCompactor(
+    trending_store, settings.trending_compaction_interval_seconds
+)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import secrets
+import time
+from collections.abc import Sequence
+
+import redis.asyncio as aioredis
+
+from app.cache.redis_client import redis_breaker, redis_client
+from app.config.settings import settings
+
+# Every ETag and feed page includes this version, so bumping it (after a snapshot rebuild
+# or a Redis outage) revalidates all of them. Everything else is scoped to one post, user
+# or author, so a write only invalidates the representations that show it.
+ALL = "all"
+
+
+def post_version(post_id: str) -> str:
+    """Changes with the post's content, like count or comment count."""
+    return f"post:{post_id}"
+
+
+def author_version(author_id: str) -> str:
+    """Changes when ``author_id`` creates or deletes a post, i.e. their set of posts."""
+    return f"author:{author_id}"
+
+
+def user_version(user_id: str) -> str:
+    """Changes with the user's public profile or follower/following counts."""
+    return f"user:{user_id}"
+
+
+def following_version(user_id: str) -> str:
+    """Changes when ``user_id`` follows or unfollows someone, i.e. their feed's authors."""
+    return f"following:{user_id}"
+
+
+def _token() -> str:
+    # Leading timestamp doubles as Last-Modified; the random suffix keeps two changes in
+    # the same microsecond distinct.
+    return f"{time.time():.6f}-{secrets.token_hex(4)}"
+
+
+def modified_at(token: str) -> float:
+    return float(token.split("-", 1)[0])
+
+
+class VersionStore:
+    """Opaque version tokens backing ``ETag`` / ``Last-Modified`` on read endpoints.
+
+    Writers :meth:`bump` the versions of whatever they changed. A new random token is
+    written rather than a counter incremented. A version that expired, or was lost with
+    a Redis flush, therefore comes back as a token no client has seen, and the worst
+    case is a full response instead of a wrong ``304``.
+    """
+
+    prefix = "version"
+
+    def key(self, name: str) -> str:
+        return f"{self.prefix}:{name}"
+
+    async def get_many(self, redis: aioredis.Redis, names: Sequence[str]) -> list[str]:
+        """Current tokens for ``names``, creating any that do not exist yet."""
+        keys = [self.key(name) for name in names]
+        tokens = await redis.mget(keys)
+        missing = [index for index, token in enumerate(tokens) if token is None]
+        if missing:
+            # SET NX so concurrent first readers agree on a single token. Issued together,
+            # so an AutoPipeline sends them in one round trip however many posts or
+            # authors a page touches.
+            await asyncio.gather(
+                *(
+                    redis.set(keys[index], _token(), nx=True, ex=settings.etag_version_ttl_seconds)
+                    for index in missing
+                )
+            )
+            created = await redis.mget([keys[index] for index in missing])
+            for index, token in zip(missing, created):
+                tokens[index] = token or _token()
+        return [str(token) for token in tokens]
+
+    async def bump(self, redis: aioredis.Redis, *names: str) -> None:
+        pipe = redis.pipeline(transaction=False)
+        for name in names:
+            pipe.set(self.key(name), _token(), ex=settings.etag_version_ttl_seconds)
+        await pipe.execute()
+
+
+version_store = VersionStore()
+
+
+async def _revalidate_after_outage() -> None:
+    # Writes made while Redis was unreachable could not bump what they changed.
+    await version_store.bump(await redis_client.get_client(), ALL)
+
+
+redis_breaker.on_recover(_revalidate_after_outage)
@@ -0,0 +1,92 @@
+"""Process entry points.
+
+    python -m app.cli api --workers 4     # HTTP only, safe to scale across cores
+    python -m app.cli dispatcher          # outbox -> Kafka, safe to run several copies
+    python -m app.cli consumer            # Kafka -> Redis projections
+    python -m app.cli rebuild             # recompute Redis projections from PostgreSQL
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import signal
+
+from app.cache.redis_client import redis_client
+from app.config.settings import settings
+from app.db.session import SessionLocal
+from app.observability.logging import configure_logging, get_logger
+from app.observability.startup import startup_timer
+from app.roles import API, CONSUMER, DISPATCHER, parse_roles, start_roles, stop_roles
+from app.services.rebuild_service import TARGETS, SnapshotRebuilder
+
+logger = get_logger(__name__)
+
+REBUILD = "rebuild"
+
+
+async def run_background(roles: set[str]) -> None:
+    """Run non-HTTP roles until SIGINT/SIGTERM."""
+    from prometheus_client import start_http_server
+
+    start_http_server(settings.prometheus_metrics_port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    with startup_timer.phase("start_roles"):
+        await start_roles(roles)
+    startup_timer.report()
+    try:
+        await stop.wait()
+    finally:
+        await stop_roles(roles)
+
+
+async def run_rebuild(targets: list[str], restart: bool) -> None:
+    redis = await redis_client.get_client()
+    try:
+        await SnapshotRebuilder(SessionLocal, redis).run(targets, restart)
+    finally:
+        await redis_client.close()
+
+
+def serve_api(host: str, port: int, workers: int) -> None:
+    import uvicorn
+
+    # Workers re-import app.main and read their roles from the environment.
+    os.environ["APP_ROLES"] = API
+    uvicorn.run("app.main:app", host=host, port=port, workers=workers)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="app.cli", description="Run one deployment role.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    api = sub.add_parser(API, help="Serve HTTP without background tasks")
+    api.add_argument("--host", default="0.0.0.0")
+    api.add_argument("--port", type=int, default=8000)
+    api.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", 1)))
+    sub.add_parser(DISPATCHER, help="Publish outbox entries to Kafka")
+    sub.add_parser(CONSUMER, help="Consume Kafka events into Redis")
+    rebuild = sub.add_parser(REBUILD, help="Recompute Redis derived state from PostgreSQL")
+    rebuild.add_argument(
+        "--target", action="append", choices=TARGETS, help="Projection to rebuild (repeatable)"
+    )
+    rebuild.add_argument(
+        "--restart", action="store_true", help="Ignore checkpoints from an interrupted run"
+    )
+    args = parser.parse_args(argv)
+
+    startup_timer.mark_imported()
+    configure_logging()
+    if args.command == API:
+        serve_api(args.host, args.port, args.workers)
+    elif args.command == REBUILD:
+        asyncio.run(run_rebuild(args.target or list(TARGETS), args.restart))
+    else:
+        asyncio.run(run_background(parse_roles([args.command])))
+
+
+if __name__ == "__main__":
+    main()
@@ -23,3 +23,8 @@ SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False, autoflush
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with SessionLocal() as session:
         yield session
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """For responses that outlive the request-scoped session, such as streamed exports."""
+    return SessionLocal
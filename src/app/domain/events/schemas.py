@@ -26,6 +26,11 @@ class UserFollowedEvent(EventMetadata):
     followed_id: uuid.UUID
 
 
+class UserUnfollowedEvent(EventMetadata):
+    follower_id: uuid.UUID
+    followed_id: uuid.UUID
+
+
 class PostCreatedPayload(BaseModel):
     id: uuid.UUID
     author_id: uuid.UUID
@@ -41,6 +46,8 @@ class PostCreatedEvent(EventMetadata):
 class PostLikedEvent(EventMetadata):
     post_id: uuid.UUID
     user_id: uuid.UUID
+    # Optional so events enqueued before it was added still validate.
+    post_author_id: uuid.UUID | None = None
 
 
 class CommentCreatedPayload(BaseModel):
@@ -53,12 +60,20 @@ class CommentCreatedPayload(BaseModel):
 
 class CommentCreatedEvent(EventMetadata):
     comment: CommentCreatedPayload
+    post_author_id: uuid.UUID | None = None
+
+
+class CommentDeletedEvent(EventMetadata):
+    comment_id: uuid.UUID
+    post_id: uuid.UUID
 
 
 EVENT_TOPIC_MAP: dict[str, type[EventMetadata]] = {
     "user.created": UserCreatedEvent,
     "user.followed": UserFollowedEvent,
+    "user.unfollowed": UserUnfollowedEvent,
     "post.created": PostCreatedEvent,
     "post.liked": PostLikedEvent,
     "comment.created": CommentCreatedEvent,
+    "comment.deleted": CommentDeletedEvent,
 }
@@ -7,6 +7,7 @@ from sqlalchemy import DateTime, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.session import Base
+from app.utils.ids import uuid7
 
 
 class TimestampMixin:
@@ -29,5 +30,13 @@ class UUIDMixin:
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
 
 
+class TimeOrderedUUIDMixin:
+    """UUIDv7 primary key for append-heavy tables: new rows go to the right edge of the
+    index, and the id doubles as a keyset cursor. Rows from before the switch keep their
+    uuid4 ids, so queries must still order by ``created_at`` first."""
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
+
+
 class BaseModel(Base):
     __abstract__ = True
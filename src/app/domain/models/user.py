@@ -3,10 +3,20 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Text, UniqueConstraint, Uuid
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    UniqueConstraint,
+    Uuid,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.domain.models.base import BaseModel, TimestampMixin, UUIDMixin
+from app.domain.models.base import BaseModel, TimeOrderedUUIDMixin, TimestampMixin, UUIDMixin
 
 
 class User(BaseModel, UUIDMixin, TimestampMixin):
@@ -22,52 +32,70 @@ class User(BaseModel, UUIDMixin, TimestampMixin):
 
 class Follow(BaseModel):
     __tablename__ = "follows"
-    __table_args__ = (UniqueConstraint("follower_id", "followed_id", name="uq_follow"),)
+    # uq_follow already serves lookups by follower; the reverse index serves followers lists.
+    __table_args__ = (
+        UniqueConstraint("follower_id", "followed_id", name="uq_follow"),
+        Index("ix_follows_followed_follower", "followed_id", "follower_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    follower_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), nullable=False, index=True)
-    followed_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), nullable=False, index=True)
+    follower_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), nullable=False)
+    followed_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
 
 
-class Post(BaseModel, UUIDMixin, TimestampMixin):
+class Post(BaseModel, TimeOrderedUUIDMixin, TimestampMixin):
     __tablename__ = "posts"
-
-    author_id: Mapped[uuid.UUID] = mapped_column(
-        Uuid(as_uuid=True), ForeignKey("users.id"), index=True
+    # Match the listing shapes: newest first with id as tie-breaker, optionally per author.
+    __table_args__ = (
+        Index("ix_posts_created_at_id", text("created_at DESC"), text("id DESC")),
+        Index(
+            "ix_posts_author_created_at_id", "author_id", text("created_at DESC"), text("id DESC")
+        ),
     )
+
+    author_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("users.id"))
     content: Mapped[str] = mapped_column(Text(), nullable=False)
     media_url: Mapped[str | None] = mapped_column(String(500))
 
 
-class Comment(BaseModel, UUIDMixin, TimestampMixin):
+class Comment(BaseModel, TimeOrderedUUIDMixin, TimestampMixin):
     __tablename__ = "comments"
-
-    post_id: Mapped[uuid.UUID] = mapped_column(
-        Uuid(as_uuid=True), ForeignKey("posts.id"), index=True
+    __table_args__ = (
+        Index("ix_comments_post_created_at", "post_id", text("created_at DESC"), text("id DESC")),
     )
+
+    post_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("posts.id"))
     author_id: Mapped[uuid.UUID] = mapped_column(
         Uuid(as_uuid=True), ForeignKey("users.id"), index=True
     )
     content: Mapped[str] = mapped_column(Text(), nullable=False)
 
 
-class Like(BaseModel, UUIDMixin, TimestampMixin):
+class Like(BaseModel, TimeOrderedUUIDMixin, TimestampMixin):
     __tablename__ = "likes"
+    # uq_like (post_id, user_id) covers lookups and counts by post.
     __table_args__ = (UniqueConstraint("post_id", "user_id", name="uq_like"),)
 
-    post_id: Mapped[uuid.UUID] = mapped_column(
-        Uuid(as_uuid=True), ForeignKey("posts.id"), index=True
-    )
+    post_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("posts.id"))
     user_id: Mapped[uuid.UUID] = mapped_column(
         Uuid(as_uuid=True), ForeignKey("users.id"), index=True
     )
 
 
-class EventOutbox(BaseModel, UUIDMixin):
+class EventOutbox(BaseModel, TimeOrderedUUIDMixin):
     __tablename__ = "event_outbox"
+    # Published rows are never read again; index only the backlog the dispatcher claims.
+    __table_args__ = (
+        Index(
+            "ix_event_outbox_unpublished",
+            "created_at",
+            postgresql_where=text("published = false"),
+            sqlite_where=text("published = 0"),
+        ),
+    )
 
-    topic: Mapped[str] = mapped_column(String(100), index=True)
+    topic: Mapped[str] = mapped_column(String(100))
     payload: Mapped[str] = mapped_column(Text(), nullable=False)
     event_type: Mapped[str] = mapped_column(String(50), nullable=False)
     published: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -5,6 +5,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.domain.schemas.users import UserPublic
+
 
 class CommentCreate(BaseModel):
     content: str = Field(min_length=1, max_length=280)
@@ -24,3 +26,4 @@ class CommentListResponse(BaseModel):
     page: int
     size: int
     total: int
+    authors: list[UserPublic] | None = None
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class PostExport(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: uuid.UUID
+    author_id: uuid.UUID
+    content: str
+    media_url: str | None
+    created_at: datetime
+    updated_at: datetime
+
+
+class CommentExport(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: uuid.UUID
+    post_id: uuid.UUID
+    author_id: uuid.UUID
+    content: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class FollowExport(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    follower_id: uuid.UUID
+    followed_id: uuid.UUID
+    created_at: datetime
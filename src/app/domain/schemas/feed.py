@@ -3,6 +3,7 @@ from __future__ import annotations
 from pydantic import BaseModel, ConfigDict
 
 from app.domain.schemas.posts import PostOut
+from app.domain.schemas.users import UserPublic
 
 
 class FeedResponse(BaseModel):
@@ -10,3 +11,4 @@ class FeedResponse(BaseModel):
     items: list[PostOut]
     page: int
     size: int
+    authors: list[UserPublic] | None = None
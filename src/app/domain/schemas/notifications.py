@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel
+
+from app.domain.schemas.users import UserPublic
+
+
+class NotificationOut(BaseModel):
+    id: uuid.UUID
+    kind: Literal["like", "comment", "follow"]
+    post_id: uuid.UUID | None
+    actor_ids: list[uuid.UUID]
+    count: int
+    created_at: datetime
+    read: bool
+
+
+class NotificationListResponse(BaseModel):
+    items: list[NotificationOut]
+    page: int
+    size: int
+    unread_count: int
+    actors: list[UserPublic] | None = None
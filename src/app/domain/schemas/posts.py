@@ -5,6 +5,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.domain.schemas.users import UserPublic
+
 
 class PostCreate(BaseModel):
     content: str = Field(min_length=1, max_length=280)
@@ -21,6 +23,16 @@ class PostOut(BaseModel):
     created_at: datetime
     updated_at: datetime
     like_count: int = 0
+    comment_count: int = 0
+    liked_by_me: bool = False
+
+
+class TrendingPostOut(PostOut):
+    score: float
+
+
+class TrendingPostsResponse(BaseModel):
+    items: list[TrendingPostOut]
 
 
 class PostListResponse(BaseModel):
@@ -28,3 +40,4 @@ class PostListResponse(BaseModel):
     page: int
     size: int
     total: int
+    authors: list[UserPublic] | None = None
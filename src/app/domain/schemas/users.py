@@ -36,6 +36,8 @@ class UserPublic(UserBase):
     id: uuid.UUID
     username: str
     bio: str | None
+    follower_count: int = 0
+    following_count: int = 0
 
 
 class UserSearchResponse(BaseModel):
@@ -43,3 +45,11 @@ class UserSearchResponse(BaseModel):
     total: int
     page: int
     size: int
+
+
+class FollowSuggestion(UserPublic):
+    mutual_count: int
+
+
+class FollowSuggestionResponse(BaseModel):
+    items: list[FollowSuggestion]
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+import orjson
+import redis.asyncio as aioredis
+
+from app.cache.redis_client import pool_options
+from app.config.settings import settings
+from app.observability.logging import get_logger
+from app.observability.metrics import FEED_STREAM_CONNECTIONS, FEED_STREAM_DROPPED
+from app.utils.exceptions import StreamCapacityError
+
+logger = get_logger(__name__)
+
+# The consumer publishes every post.created here; each API worker subscribes once.
+FEED_CHANNEL = "feed:live"
+MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+
+class FeedSubscription:
+    """One connected client: the authors it follows and a bounded queue of new posts.
+
+    Delivery never waits on a slow client. When the queue is full the post is dropped
+    and counted in ``dropped``, so the stream can tell the client to refetch ``/feed``.
+    """
+
+    def __init__(self, author_ids: Iterable[str], max_pending: int) -> None:
+        self.author_ids = frozenset(author_ids)
+        self.dropped = 0
+        self._queue: asyncio.Queue[str] = asyncio.Queue(max_pending)
+
+    def offer(self, message: str) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            FEED_STREAM_DROPPED.inc()
+
+    async def next(self, timeout: float) -> str | None:
+        """The next post, or ``None`` if nothing arrived within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class FeedBroadcaster:
+    """Fans new posts out from one Redis pub/sub connection to every local subscriber.
+
+    Each worker holds a single subscription to :data:`FEED_CHANNEL` regardless of how many
+    clients are connected. An in-memory index from author id to subscriptions routes each
+    message only to the followers of its author, so an idle connection costs a queue and
+    a few set entries. Messages published while the listener is reconnecting are lost;
+    clients resync from ``/feed`` after reconnecting.
+    """
+
+    def __init__(self, max_connections: int, max_pending: int) -> None:
+        self.max_connections = max_connections
+        self.max_pending = max_pending
+        self._by_author: defaultdict[str, set[FeedSubscription]] = defaultdict(set)
+        self._subscriptions: set[FeedSubscription] = set()
+        self._task: asyncio.Task[None] | None = None
+        self._subscribed = False
+
+    def ensure_capacity(self) -> None:
+        """Raise :class:`StreamCapacityError` if this worker holds ``max_connections``."""
+        if len(self._subscriptions) >= self.max_connections:
+            raise StreamCapacityError()
+
+    @contextmanager
+    def subscribe(self, author_ids: Iterable[str]) -> Iterator[FeedSubscription]:
+        subscription = FeedSubscription(author_ids, self.max_pending)
+        self._subscriptions.add(subscription)
+        for author_id in subscription.author_ids:
+            self._by_author[author_id].add(subscription)
+        FEED_STREAM_CONNECTIONS.inc()
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+            for author_id in subscription.author_ids:
+                followers = self._by_author.get(author_id)
+                if followers is not None:
+                    followers.discard(subscription)
+                    if not followers:
+                        del self._by_author[author_id]
+            FEED_STREAM_CONNECTIONS.dec()
+
+    def dispatch(self, message: str | bytes) -> int:
+        """Route one published post to its author's followers; return how many got it."""
+        data = message.decode() if isinstance(message, bytes) else message
+        try:
+            author_id = str(orjson.loads(data)["author_id"])
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            logger.warning("Malformed feed message", message=data[:200])
+            return 0
+        followers = self._by_author.get(author_id, ())
+        for subscription in followers:
+            subscription.offer(data)
+        return len(followers)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _listen_forever(self) -> None:
+        delay = 0.5
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Feed broadcast subscription lost", error=repr(exc), delay=delay)
+            if self._subscribed:
+                delay = 0.5
+            self._subscribed = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+
+    async def _listen(self) -> None:
+        # A dedicated client: a subscribed connection sits idle between messages, which
+        # the pooled clients' socket timeout would treat as a failure.
+        options = pool_options() | {"socket_timeout": None, "max_connections": 1}
+        client = aioredis.from_url(str(settings.redis_url), decode_responses=True, **options)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(FEED_CHANNEL)
+            self._subscribed = True
+            logger.info("Feed broadcast subscribed", channel=FEED_CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    self.dispatch(message["data"])
+        finally:
+            await pubsub.close()
+            await client.close()
+
+
+feed_broadcaster = FeedBroadcaster(
+    settings.feed_stream_max_connections, settings.feed_stream_max_pending
+)
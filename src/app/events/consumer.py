@@ -2,27 +2,43 @@ from __future__ import annotations
 
 import asyncio
 import json
+import uuid
 from typing import Any, cast
 
 from aiokafka import AIOKafkaConsumer
 from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.cache.counters import comment_counter, follower_counter, following_counter
+from app.cache.notifications import COMMENT, FOLLOW, LIKE, notification_store
 from app.cache.redis_client import redis_client
+from app.cache.trending import trending_store
+from app.cache.versions import following_version, post_version, user_version, version_store
 from app.config.settings import settings
+from app.db.session import SessionLocal
 from app.domain.events.schemas import (
     EVENT_TOPIC_MAP,
     CommentCreatedEvent,
+    CommentDeletedEvent,
     PostCreatedEvent,
     PostLikedEvent,
     UserFollowedEvent,
+    UserUnfollowedEvent,
 )
+from app.events.broadcaster import FEED_CHANNEL
 from app.observability.logging import get_logger
+from app.repositories.comments import CommentRepository
+from app.repositories.posts import PostRepository
+from app.services.comment_service import first_page_cache_key
+from app.services.feed_service import AUTHOR_FEED_LENGTH, author_feed_key
+from app.services.suggestion_service import SuggestionService
 
 logger = get_logger(__name__)
 
 
 class KafkaEventConsumer:
-    def __init__(self) -> None:
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] = SessionLocal) -> None:
+        self._session_factory = session_factory
         self._consumer: AIOKafkaConsumer | None = None
         self._task: asyncio.Task[None] | None = None
         self._stop_event = asyncio.Event()
@@ -30,7 +46,7 @@ class KafkaEventConsumer:
     async def start(self) -> None:
         if self._consumer:
             return
-        self._consumer = AIOKafkaConsumer(
+        kafka_consumer = AIOKafkaConsumer(
             *settings.kafka_topic_list,
             bootstrap_servers=settings.kafka_bootstrap_servers,
             group_id=settings.kafka_group_id,
@@ -38,7 +54,12 @@ class KafkaEventConsumer:
             enable_auto_commit=True,
             value_deserializer=lambda v: json.loads(v.decode("utf-8")),
         )
-        await self._consumer.start()
+        try:
+            await kafka_consumer.start()
+        except BaseException:
+            await kafka_consumer.stop()
+            raise
+        self._consumer = kafka_consumer
         self._stop_event.clear()
         self._task = asyncio.create_task(self._consume_loop())
         logger.info("Kafka consumer started")
@@ -52,6 +73,12 @@ class KafkaEventConsumer:
             logger.info("Kafka consumer stopped")
             self._consumer = None
 
+    async def ping(self) -> None:
+        """Round-trip a metadata request to the cluster; raises if not connected."""
+        if self._consumer is None:
+            raise RuntimeError("Kafka consumer not started")
+        await self._consumer.topics()
+
     async def _consume_loop(self) -> None:
         assert self._consumer is not None
         redis = await redis_client.get_client()
@@ -72,22 +99,108 @@ class KafkaEventConsumer:
         if await redis.get(event_key):
             logger.debug("Event already processed", event_id=str(event.event_id))
             return
+        # PostService updates like counts synchronously; post.liked only feeds trending.
         if topic == "post.liked":
             liked_event = cast(PostLikedEvent, event)
-            await redis.hincrby("post:like_counts", str(liked_event.post_id), 1)
+            await trending_store.record(
+                redis,
+                str(liked_event.post_id),
+                settings.trending_like_weight,
+                liked_event.occurred_at,
+            )
+            author_id = await self._post_author(liked_event.post_id, liked_event.post_author_id)
+            if author_id:
+                await notification_store.record(
+                    redis, author_id, LIKE, str(liked_event.user_id), str(liked_event.post_id)
+                )
         elif topic == "user.followed":
             followed_event = cast(UserFollowedEvent, event)
-            await redis.hincrby("user:followers", str(followed_event.followed_id), 1)
+            # Counters not cached yet are read through from the database, which already
+            # has the new edge; bumping them here would count it twice.
+            await follower_counter.incr(redis, str(followed_event.followed_id), 1, if_cached=True)
+            await following_counter.incr(redis, str(followed_event.follower_id), 1, if_cached=True)
+            async with self._session_factory() as session:
+                await SuggestionService(session).on_followed(
+                    redis, str(followed_event.follower_id), str(followed_event.followed_id)
+                )
+            await notification_store.record(
+                redis, str(followed_event.followed_id), FOLLOW, str(followed_event.follower_id)
+            )
+            await self._follow_changed(
+                redis, str(followed_event.follower_id), str(followed_event.followed_id)
+            )
+        elif topic == "user.unfollowed":
+            unfollowed_event = cast(UserUnfollowedEvent, event)
+            await follower_counter.incr(
+                redis, str(unfollowed_event.followed_id), -1, if_cached=True
+            )
+            await following_counter.incr(
+                redis, str(unfollowed_event.follower_id), -1, if_cached=True
+            )
+            async with self._session_factory() as session:
+                await SuggestionService(session).on_unfollowed(
+                    redis, str(unfollowed_event.follower_id), str(unfollowed_event.followed_id)
+                )
+            await self._follow_changed(
+                redis, str(unfollowed_event.follower_id), str(unfollowed_event.followed_id)
+            )
         elif topic == "post.created":
             post_created = cast(PostCreatedEvent, event)
-            post_data = post_created.post.model_dump()
-            await redis.lpush(f"feed:{post_data['author_id']}", json.dumps(post_data))
-            await redis.ltrim(f"feed:{post_data['author_id']}", 0, 99)
+            post_data = post_created.post.model_dump(mode="json")
+            feed_key = author_feed_key(post_data["author_id"])
+            message = json.dumps(post_data)
+            await redis.lpush(feed_key, message)
+            await redis.ltrim(feed_key, 0, AUTHOR_FEED_LENGTH - 1)
+            await redis.publish(FEED_CHANNEL, message)
         elif topic == "comment.created":
             comment_event = cast(CommentCreatedEvent, event)
-            await redis.hincrby("post:comment_counts", str(comment_event.comment.post_id), 1)
+            post_id = str(comment_event.comment.post_id)
+            await self._reload_comment_count(redis, post_id)
+            await redis.delete(first_page_cache_key(post_id))
+            await version_store.bump(redis, post_version(post_id))
+            await trending_store.record(
+                redis, post_id, settings.trending_comment_weight, comment_event.occurred_at
+            )
+            author_id = await self._post_author(
+                comment_event.comment.post_id, comment_event.post_author_id
+            )
+            if author_id:
+                await notification_store.record(
+                    redis, author_id, COMMENT, str(comment_event.comment.author_id), post_id
+                )
+        elif topic == "comment.deleted":
+            deleted_event = cast(CommentDeletedEvent, event)
+            post_id = str(deleted_event.post_id)
+            await self._reload_comment_count(redis, post_id)
+            await redis.delete(first_page_cache_key(post_id))
+            await version_store.bump(redis, post_version(post_id))
         await redis.set(event_key, "1", ex=settings.idempotency_ttl_seconds)
         logger.debug("Processed event", topic=topic, event_id=str(event.event_id))
 
+    async def _follow_changed(self, redis: Redis, follower_id: str, followed_id: str) -> None:
+        """Both users' counts changed, and the follower's feed has a different author set."""
+        await version_store.bump(
+            redis,
+            user_version(follower_id),
+            user_version(followed_id),
+            following_version(follower_id),
+        )
+
+    async def _reload_comment_count(self, redis: Redis, post_id: str) -> None:
+        """Set the post's comment count from the database rather than adding the event's
+        delta: a reader may already have backfilled a cold counter with a count that
+        includes this comment, and replayed events must not count twice."""
+        async with self._session_factory() as session:
+            counts = await CommentRepository(session).count_for_posts([post_id])
+        await comment_counter.set_many(redis, {post_id: counts.get(post_id, 0)})
+
+    async def _post_author(self, post_id: uuid.UUID, author_id: uuid.UUID | None) -> str | None:
+        """The post's author, from the event if it carries it, else from the database."""
+        if author_id is not None:
+            return str(author_id)
+        async with self._session_factory() as session:
+            post = await PostRepository(session).get(post_id)
+        return str(post.author_id) if post else None
+
 
 consumer = KafkaEventConsumer()
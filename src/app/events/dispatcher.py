@@ -7,9 +7,12 @@ from app.config.settings import settings
 from app.events.producer import producer
 from app.observability.logging import get_logger
 from app.repositories.outbox import OutboxRepository
+from app.utils.exceptions import DependencyUnavailableError
 
 logger = get_logger(__name__)
 
+BATCH_SIZE = 50
+
 
 class OutboxDispatcher:
     def __init__(self, session_factory) -> None:
@@ -30,15 +33,28 @@ class OutboxDispatcher:
 
     async def _run(self) -> None:
         while not self._stop_event.is_set():
-            async with self._session_factory() as session:
-                repo = OutboxRepository(session)
-                entries = await repo.pending(limit=50)
-                for entry in entries:
-                    payload = json.loads(entry.payload)
-                    await producer.publish(entry.topic, payload)
-                    await repo.mark_published(entry)
-                await session.commit()
-            await asyncio.sleep(settings.outbox_dispatch_interval_seconds)
+            try:
+                published = await self.dispatch_batch()
+            except DependencyUnavailableError:
+                # The breaker already logged the outage; entries wait in the outbox.
+                logger.debug("Kafka unavailable, outbox dispatch deferred")
+                published = 0
+            except Exception:  # keep the loop alive; unpublished rows are retried
+                logger.exception("Outbox dispatch failed")
+                published = 0
+            if published < BATCH_SIZE:
+                await asyncio.sleep(settings.outbox_dispatch_interval_seconds)
+
+    async def dispatch_batch(self) -> int:
+        async with self._session_factory() as session:
+            repo = OutboxRepository(session)
+            entries = await repo.claim_pending(limit=BATCH_SIZE)
+            for entry in entries:
+                payload = json.loads(entry.payload)
+                await producer.publish(entry.topic, payload)
+                await repo.mark_published(entry)
+            await session.commit()
+        return len(entries)
 
 
 def create_dispatcher(session_factory) -> OutboxDispatcher:
@@ -4,12 +4,23 @@ import asyncio
 import json
 
 from aiokafka import AIOKafkaProducer
+from aiokafka.errors import KafkaError
 
 from app.config.settings import settings
 from app.observability.logging import get_logger
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.deadline import bounded
+from app.utils.exceptions import DeadlineExceededError
 
 logger = get_logger(__name__)
 
+kafka_breaker = CircuitBreaker(
+    "kafka",
+    settings.kafka_breaker_failure_threshold,
+    settings.kafka_breaker_reset_seconds,
+    failures=(KafkaError, DeadlineExceededError, OSError),
+)
+
 
 class KafkaEventProducer:
     def __init__(self) -> None:
@@ -19,13 +30,19 @@ class KafkaEventProducer:
     async def start(self) -> None:
         async with self._lock:
             if self._producer is None:
-                self._producer = AIOKafkaProducer(
+                kafka_producer = AIOKafkaProducer(
                     bootstrap_servers=settings.kafka_bootstrap_servers,
                     client_id=settings.kafka_client_id,
                     security_protocol=settings.kafka_security_protocol,
                     value_serializer=lambda v: json.dumps(v).encode("utf-8"),
                 )
-                await self._producer.start()
+                try:
+                    await kafka_producer.start()
+                except BaseException:
+                    # A failed or timed-out start must not leave a half-open producer behind.
+                    await kafka_producer.stop()
+                    raise
+                self._producer = kafka_producer
                 logger.info("Kafka producer started")
 
     async def stop(self) -> None:
@@ -34,12 +51,26 @@ class KafkaEventProducer:
             logger.info("Kafka producer stopped")
             self._producer = None
 
+    async def ping(self) -> None:
+        """Round-trip a metadata request to the cluster; raises if not connected."""
+        if self._producer is None:
+            raise RuntimeError("Kafka producer not started")
+        await self._producer.client.fetch_all_metadata()
+
     async def publish(self, topic: str, payload: dict) -> None:
+        """Send one event; fails fast with ``DependencyUnavailableError`` while Kafka is down."""
+        await kafka_breaker.call(self._send(topic, payload))
+        logger.debug("Published event", topic=topic)
+
+    async def _send(self, topic: str, payload: dict) -> None:
         if self._producer is None:
             await self.start()
         assert self._producer is not None
-        await self._producer.send_and_wait(topic, payload)
-        logger.debug("Published event", topic=topic)
+        # On timeout the record may still be delivered; the outbox row stays unpublished
+        # and is sent again, which consumers already deduplicate by event id.
+        await bounded(
+            self._producer.send_and_wait(topic, payload), settings.kafka_send_timeout_seconds
+        )
 
 
 producer = KafkaEventProducer()
@@ -10,24 +10,46 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from app.api.routes import auth, comments, feed, follows, health, posts, users
-from app.cache.redis_client import redis_client
-from app.db.session import SessionLocal
+from app.api.deadline import DeadlineMiddleware
+from app.api.idempotency import IdempotencyMiddleware
+from app.api.routes import (
+    admin,
+    auth,
+    comments,
+    exports,
+    feed,
+    follows,
+    health,
+    notifications,
+    posts,
+    users,
+)
+from app.config.settings import settings
+from app.db.session import engine
 from app.events.consumer import consumer
-from app.events.dispatcher import create_dispatcher
 from app.events.producer import producer
 from app.observability.logging import configure_logging, get_logger
 from app.observability.metrics import setup_metrics
+from app.observability.profiling import SlowRequestProfilerMiddleware
+from app.observability.queries import QueryBudgetMiddleware, install_query_hooks
+from app.observability.startup import startup_timer
 from app.observability.tracing import configure_tracing, instrument_app
+from app.rate_limit.concurrency import ConcurrencyLimitMiddleware
+from app.roles import dispatcher, parse_roles, start_roles, stop_roles
+from app.utils.deadline import install_deadline_hooks
 from app.utils.exceptions import DomainError, to_http_exception
 
+startup_timer.mark_imported()
 configure_logging()
-configure_tracing()
+with startup_timer.phase("tracing"):
+    configure_tracing()
+install_query_hooks(engine.sync_engine)
+install_deadline_hooks(engine.sync_engine)
 
 logger = get_logger(__name__)
 request_id_ctx_var: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
 
-dispatcher = create_dispatcher(SessionLocal)
+__all__ = ["app", "consumer", "create_app", "dispatcher", "producer"]
 
 
 class RequestIdMiddleware(BaseHTTPMiddleware):
@@ -41,21 +63,20 @@ class RequestIdMiddleware(BaseHTTPMiddleware):
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-    """Manage application lifespan (startup and shutdown)."""
-    # Startup
-    redis_client.init()
-    await producer.start()
-    await consumer.start()
-    await dispatcher.start()
+    """Manage application lifespan (startup and shutdown).
+
+    Background components are started according to ``APP_ROLES``; run the API with
+    ``APP_ROLES=api`` when the dispatcher and consumer are deployed separately.
+    """
+    roles = parse_roles(settings.app_role_list)
+    with startup_timer.phase("start_roles"):
+        await start_roles(roles)
+    startup_timer.report()
     logger.info("Application started")
 
     yield
 
-    # Shutdown
-    await dispatcher.stop()
-    await consumer.stop()
-    await producer.stop()
-    await redis_client.close()
+    await stop_roles(roles)
     logger.info("Application stopped")
 
 
@@ -72,13 +93,31 @@ def create_app() -> FastAPI:
             "```\nAuthorization: Bearer <access_token>\n```\n\n"
             "## Rate Limiting\n\n"
             "Write endpoints are rate-limited per IP (default: 60 requests/minute). "
-            "Exceeding the limit returns `429 Too Many Requests`.\n\n"
+            "Exceeding the limit returns `429 Too Many Requests`. When a server is overloaded it "
+            "answers `503` with a `Retry-After` header instead of queueing the request.\n\n"
+            "## Idempotency\n\n"
+            "Any `POST`/`PUT`/`PATCH`/`DELETE` may carry an `Idempotency-Key` header (up to 255 "
+            "characters, e.g. a UUID). The first response for a key is stored for 24 hours and "
+            "replayed unchanged, with `Idempotent-Replayed: true`, to retries from the same "
+            "caller. A retry while the original is still running returns `409`; reusing a key "
+            "for a different request returns `422`.\n\n"
+            "## Deadlines\n\n"
+            "Requests may send `X-Request-Timeout` (seconds, up to 30). Database, Redis and "
+            "Kafka work stops once it has elapsed (10 seconds by default) and the response is "
+            "`504 Gateway Timeout`.\n\n"
             "## Pagination\n\n"
             "All list endpoints accept `page` (1-indexed) and `size` (max 100) query parameters."
         ),
         lifespan=lifespan,
     )
+    app.add_middleware(QueryBudgetMiddleware)
+    app.add_middleware(IdempotencyMiddleware)
+    app.add_middleware(DeadlineMiddleware)
+    if settings.concurrency_limit_enabled:
+        app.add_middleware(ConcurrencyLimitMiddleware)
     app.add_middleware(RequestIdMiddleware)
+    if settings.profiling_enabled:
+        app.add_middleware(SlowRequestProfilerMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -93,7 +132,10 @@ def create_app() -> FastAPI:
     app.include_router(posts.router)
     app.include_router(comments.router)
     app.include_router(feed.router)
+    app.include_router(notifications.router)
+    app.include_router(exports.router)
     app.include_router(health.router)
+    app.include_router(admin.router)
 
     setup_metrics(app)
     instrument_app(app)
@@ -106,4 +148,5 @@ def create_app() -> FastAPI:
     return app
 
 
-app = create_app()
+with startup_timer.phase("create_app"):
+    app = create_app()
@@ -1,9 +1,98 @@
 from __future__ import annotations
 
+from prometheus_client import Counter, Gauge, Histogram
 from prometheus_fastapi_instrumentator import Instrumentator
 
 instrumentator = Instrumentator()
 
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between a scheduled event loop wake-up and when it actually ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+EVENT_LOOP_LAG_LAST = Gauge("event_loop_lag_last_seconds", "Most recent event loop lag measurement")
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement latency by repository operation",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DB_QUERY_ROWS = Histogram(
+    "db_query_rows",
+    "Rows returned or affected per SQL statement by repository operation",
+    ["operation"],
+    buckets=(0, 1, 5, 10, 20, 50, 100, 500, 1000, 5000),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Number of SQL statements issued while handling one HTTP request",
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_QUERY_BUDGET_EXCEEDED = Counter(
+    "db_query_budget_exceeded_total",
+    "Requests that exceeded the query budget or repeated a statement N+1 style",
+    ["route"],
+)
+
+STARTUP_PHASE_SECONDS = Gauge(
+    "app_startup_phase_seconds",
+    "Wall time spent in each startup phase of the current process",
+    ["phase"],
+)
+
 
 def setup_metrics(app):  # type: ignore[annotations]
     instrumentator.instrument(app).expose(app, include_in_schema=False, tags=["metrics"])
+
+
+EXPORT_ROWS = Counter(
+    "app_export_rows_total",
+    "Rows streamed by the NDJSON export endpoints",
+    ["kind"],
+)
+REBUILD_ROWS = Counter(
+    "app_rebuild_rows_total",
+    "Rows whose derived Redis state was recomputed by the snapshot rebuild",
+    ["target"],
+)
+FEED_STREAM_CONNECTIONS = Gauge(
+    "app_feed_stream_connections",
+    "Clients connected to /feed/stream on this worker",
+)
+FEED_STREAM_DROPPED = Counter(
+    "app_feed_stream_dropped_total",
+    "New-post notifications dropped because a stream client fell behind",
+)
+NOTIFICATIONS_WRITTEN = Counter(
+    "app_notifications_written_total",
+    "Aggregated notifications written to user inboxes",
+)
+READ_THROUGH_CACHE = Counter(
+    "app_read_through_cache_total",
+    "Read-through cache lookups by outcome (hit, miss, early, expired, stale)",
+    ["cache", "outcome"],
+)
+CONCURRENCY_LIMIT = Gauge(
+    "app_concurrency_limit",
+    "Current adaptive limit on concurrent requests for this worker",
+)
+CONCURRENCY_IN_FLIGHT = Gauge(
+    "app_concurrency_in_flight",
+    "Requests counted against the adaptive concurrency limit on this worker",
+)
+CONCURRENCY_SHED = Counter(
+    "app_concurrency_shed_total",
+    "Requests rejected with 503 because the concurrency limit was reached",
+    ["priority"],
+)
+CIRCUIT_BREAKER_STATE = Gauge(
+    "app_circuit_breaker_state",
+    "Circuit breaker state per dependency (0 closed, 1 half-open, 2 open)",
+    ["breaker"],
+)
+CIRCUIT_BREAKER_TRANSITIONS = Counter(
+    "app_circuit_breaker_transitions_total",
+    "Circuit breaker state changes by the state entered",
+    ["breaker", "state"],
+)
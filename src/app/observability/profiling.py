@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import FrameType
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.observability.logging import get_logger
+from app.observability.metrics import EVENT_LOOP_LAG, EVENT_LOOP_LAG_LAST
+
+logger = get_logger(__name__)
+
+MAX_STACK_DEPTH = 64
+
+
+def _frame_label(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_name}:{frame.f_lineno}"
+
+
+def _collapse(frame: FrameType | None) -> str:
+    labels: list[str] = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+@dataclass
+class Profile:
+    """Aggregated stack samples of one thread, in collapsed (flamegraph) format."""
+
+    started_at: datetime
+    interval: float
+    duration: float = 0.0
+    samples: int = 0
+    stacks: Counter[str] = field(default_factory=Counter)
+    context: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self, top: int = 50) -> dict[str, Any]:
+        leaves: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(self.duration, 3),
+            "interval_seconds": self.interval,
+            "samples": self.samples,
+            "context": self.context,
+            "top_frames": [
+                {"frame": frame, "samples": count, "ratio": round(count / self.samples, 4)}
+                for frame, count in leaves.most_common(top)
+            ],
+            "collapsed": [f"{stack} {count}" for stack, count in self.stacks.most_common(top)],
+        }
+
+
+class StackSampler:
+    """Samples the stack of ``thread_id`` from a helper thread, py-spy style but in-process.
+
+    Sampling the event loop thread shows where the loop spends its time, including
+    blocking calls that never yield back to asyncio.
+    """
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.profile = Profile(started_at=datetime.now(timezone.utc), interval=interval)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Profile:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.profile.duration = time.perf_counter() - self._started
+        return self.profile
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.profile.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.profile.stacks[_collapse(frame)] += 1
+            self.profile.samples += 1
+
+
+async def profile_event_loop(seconds: float, interval: float) -> Profile:
+    """Sample the running event loop for ``seconds`` while it keeps serving requests."""
+    sampler = StackSampler(threading.get_ident(), interval)
+    sampler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profile = sampler.stop()
+    return profile
+
+
+slow_request_profiles: deque[dict[str, Any]] = deque(maxlen=settings.profiling_keep_profiles)
+
+
+class SlowRequestProfilerMiddleware:
+    """Starts sampling the loop once a request outlives the slow-request threshold.
+
+    Only one capture runs at a time, so a latency spike costs a single sampler thread
+    rather than one per stuck request. Long-lived streams (``text/event-stream``) are
+    meant to stay open, so sampling ends as soon as one starts its response.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.threshold = settings.profiling_slow_request_ms / 1000
+        self.interval = settings.profiling_sample_interval_ms / 1000
+        self._active: StackSampler | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        sampler: StackSampler | None = None
+
+        def _begin() -> None:
+            nonlocal sampler
+            if self._active is None:
+                sampler = self._active = StackSampler(threading.get_ident(), self.interval)
+                sampler.start()
+
+        def _finish() -> None:
+            nonlocal sampler
+            handle.cancel()
+            if sampler is not None:
+                profile = sampler.stop()
+                sampler = self._active = None
+                profile.context = {
+                    "method": scope.get("method"),
+                    "path": scope.get("path"),
+                    "elapsed_seconds": round(time.perf_counter() - started, 3),
+                }
+                slow_request_profiles.append(profile.to_dict())
+                logger.warning("Slow request profiled", **profile.context)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and _is_event_stream(message):
+                _finish()
+            await send(message)
+
+        handle = loop.call_later(self.threshold, _begin)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _finish()
+
+
+def _is_event_stream(message: Message) -> bool:
+    headers = dict(message.get("headers", []))
+    return headers.get(b"content-type", b"").startswith(b"text/event-stream")
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up from a fixed sleep."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - expected)
+            EVENT_LOOP_LAG.observe(lag)
+            EVENT_LOOP_LAG_LAST.set(lag)
+
+
+loop_lag_monitor = LoopLagMonitor(settings.loop_lag_interval_seconds)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from opentelemetry import trace
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.observability.logging import get_logger
+from app.observability.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_QUERY_BUDGET_EXCEEDED,
+    DB_QUERY_DURATION,
+    DB_QUERY_ROWS,
+)
+
+logger = get_logger(__name__)
+
+UNLABELED = "unlabeled"
+
+T = TypeVar("T")
+
+
+@dataclass
+class QueryStats:
+    """Queries issued while handling one request (or one ``track_queries`` block)."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    rows: int = 0
+    operations: Counter[str] = field(default_factory=Counter)
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements executed at least ``threshold`` times: the signature of an N+1 loop."""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_operation: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "repository_operation", default=UNLABELED
+)
+_request_stats: contextvars.ContextVar[QueryStats | None] = contextvars.ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def instrument_repository(cls: type[T]) -> type[T]:
+    """Label every query issued by the repository's public coroutines with ``Class.method``."""
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(attr):
+            continue
+        setattr(cls, name, _labelled(f"{cls.__name__}.{name}", attr))
+    return cls
+
+
+def _labelled(operation: str, fn):
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = _operation.set(operation)
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            _operation.reset(token)
+
+    return wrapper
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, *_: Any) -> None:
+    # Kept on the execution context rather than the connection: a statement that fails
+    # never reaches after_cursor_execute, and its context is simply discarded.
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, *_: Any) -> None:
+    elapsed = time.perf_counter() - context._query_started
+    operation = _operation.get()
+    rows = max(getattr(cursor, "rowcount", -1), 0)
+    DB_QUERY_DURATION.labels(operation=operation).observe(elapsed)
+    DB_QUERY_ROWS.labels(operation=operation).observe(rows)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_seconds += elapsed
+        stats.rows += rows
+        stats.operations[operation] += 1
+        stats.statements[statement] += 1
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """Attach timing hooks to a (sync) engine; pass ``async_engine.sync_engine``."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+def report_query_stats(stats: QueryStats, route: str) -> None:
+    """Export per-request totals and flag budget overruns in logs and on the active span."""
+    DB_QUERIES_PER_REQUEST.observe(stats.count)
+    span = trace.get_current_span()
+    span.set_attribute("db.query_count", stats.count)
+    span.set_attribute("db.query_seconds", round(stats.total_seconds, 6))
+    repeated = stats.repeated(settings.query_repeat_threshold)
+    over_budget = stats.count > settings.query_budget_per_request
+    if not over_budget and not repeated:
+        return
+    DB_QUERY_BUDGET_EXCEEDED.labels(route=route).inc()
+    details = {
+        "route": route,
+        "query_count": stats.count,
+        "query_budget": settings.query_budget_per_request,
+        "query_seconds": round(stats.total_seconds, 6),
+        "operations": dict(stats.operations.most_common(10)),
+        "repeated_statements": len(repeated),
+    }
+    span.add_event("db.query_budget_exceeded", {k: str(v) for k, v in details.items()})
+    span.set_attribute("db.n_plus_one_suspected", bool(repeated))
+    logger.warning(
+        "Query budget exceeded",
+        n_plus_one_suspected=bool(repeated),
+        top_repeated=[sql[:200] for sql, _ in repeated[:3]],
+        **details,
+    )
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with track_queries() as stats:
+            await self.app(scope, receive, send)
+        report_query_stats(stats, getattr(scope.get("route"), "path", "unmatched"))
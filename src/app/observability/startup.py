@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from app import IMPORT_STARTED_AT
+from app.observability.logging import get_logger
+from app.observability.metrics import STARTUP_PHASE_SECONDS
+
+logger = get_logger(__name__)
+
+
+class StartupTimer:
+    """Wall-clock timings of startup phases, exported as a gauge and logged once."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = seconds
+        STARTUP_PHASE_SECONDS.labels(phase=phase).set(seconds)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def mark_imported(self) -> None:
+        """Record time from the first ``import app`` until now."""
+        self.record("import", time.perf_counter() - IMPORT_STARTED_AT)
+
+    def report(self) -> None:
+        logger.info(
+            "Startup timings",
+            **{f"{phase}_ms": round(seconds * 1000, 1) for phase, seconds in self.phases.items()},
+        )
+
+
+startup_timer = StartupTimer()
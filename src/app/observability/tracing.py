@@ -2,13 +2,6 @@ from __future__ import annotations
 
 import logging
 
-from opentelemetry import trace
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-
 from app.config.settings import settings
 
 # Suppress noisy OTLP exporter errors when collector is not available
@@ -17,11 +10,21 @@ logging.getLogger("opentelemetry.sdk.trace.export").setLevel(logging.CRITICAL)
 
 
 def configure_tracing() -> bool:
-    """Configure OpenTelemetry tracing if endpoint is configured."""
+    """Configure OpenTelemetry tracing if endpoint is configured.
+
+    The SDK and OTLP exporter are imported here rather than at module level: they add
+    a few hundred milliseconds to startup and most local/test processes never use them.
+    """
     if not settings.otel_exporter_otlp_endpoint:
         return False
 
     try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
         resource = Resource.create({"service.name": settings.otel_service_name})
         provider = TracerProvider(resource=resource)
 
@@ -44,6 +47,8 @@ def instrument_app(app) -> None:  # type: ignore[annotations]
     """Instrument FastAPI app with OpenTelemetry if configured."""
     if settings.otel_exporter_otlp_endpoint:
         try:
+            from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
             FastAPIInstrumentor.instrument_app(app)
         except Exception as e:
             logging.warning(f"Failed to instrument app with tracing: {e}")
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import time
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.observability.metrics import CONCURRENCY_IN_FLIGHT, CONCURRENCY_LIMIT, CONCURRENCY_SHED
+from app.utils.exceptions import OverloadedError, to_http_exception
+
+CRITICAL = "critical"
+HIGH = "high"
+NORMAL = "normal"
+LOW = "low"
+
+# Longest matching prefix wins. Critical paths bypass the limiter entirely: probes and
+# scrapes must keep answering while the API sheds load. /feed/stream holds no DB
+# connection and has its own cap (FEED_STREAM_MAX_CONNECTIONS).
+ROUTE_PRIORITIES: dict[str, str] = {
+    "/health": CRITICAL,
+    "/metrics": CRITICAL,
+    "/feed/stream": CRITICAL,
+    "/auth": HIGH,
+    "/feed": LOW,
+    "/exports": LOW,
+    "/posts/trending": LOW,
+    "/users/me/suggestions": LOW,
+}
+# Share of the current limit each priority may fill; lower priorities are shed first.
+PRIORITY_SHARE: dict[str, float] = {HIGH: 1.0, NORMAL: 0.9, LOW: 0.7}
+
+
+def route_priority(path: str) -> str:
+    matches = [prefix for prefix in ROUTE_PRIORITIES if path.startswith(prefix)]
+    return ROUTE_PRIORITIES[max(matches, key=len)] if matches else NORMAL
+
+
+class AIMDLimiter:
+    """Per-process concurrency limit driven by observed latency (additive increase,
+    multiplicative decrease).
+
+    A request that reaches its response within ``target_latency`` while the limiter is
+    nearly full raises the limit by ``1 / limit``, roughly one slot per limit's worth of
+    requests. A slower response, or a 5xx, multiplies it by ``backoff``, at most once
+    per ``target_latency`` so a burst of slow responses counts as one signal. The limit
+    stays in ``[min_limit, max_limit]``.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        target_latency: float,
+        backoff: float,
+    ) -> None:
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        CONCURRENCY_LIMIT.set(self.limit)
+
+    def try_acquire(self, priority: str) -> bool:
+        if self.in_flight >= max(1, int(self.limit * PRIORITY_SHARE[priority])):
+            return False
+        self.in_flight += 1
+        CONCURRENCY_IN_FLIGHT.set(self.in_flight)
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        CONCURRENCY_IN_FLIGHT.set(self.in_flight)
+
+    def observe(self, latency: float, failed: bool = False) -> None:
+        if failed or latency > self.target_latency:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.target_latency:
+                self._last_decrease = now
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+        elif self.in_flight >= self.limit / 2:
+            # Only grow while the limit is actually in use, or an idle worker would
+            # drift to max_limit and offer no protection at the next spike.
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        CONCURRENCY_LIMIT.set(self.limit)
+
+
+class ConcurrencyLimitMiddleware:
+    """Shed requests beyond the adaptive limit with an immediate ``503``.
+
+    Without this, excess requests queue on the database pool and time out together.
+    Latency is measured to the start of the response, so streamed exports are judged
+    by time to first byte. They still hold their slot until the body is done.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: AIMDLimiter | None = None) -> None:
+        self.app = app
+        self.limiter = limiter or AIMDLimiter(
+            settings.concurrency_initial_limit,
+            settings.concurrency_min_limit,
+            settings.concurrency_max_limit,
+            settings.concurrency_target_latency_seconds,
+            settings.concurrency_backoff_ratio,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        priority = route_priority(scope["path"])
+        if priority == CRITICAL:
+            await self.app(scope, receive, send)
+            return
+        limiter = self.limiter
+        if not limiter.try_acquire(priority):
+            CONCURRENCY_SHED.labels(priority=priority).inc()
+            await _shed(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        observed = False
+
+        async def timed_send(message: Message) -> None:
+            nonlocal observed
+            if message["type"] == "http.response.start" and not observed:
+                observed = True
+                limiter.observe(time.perf_counter() - started, message["status"] >= 500)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        except BaseException:
+            if not observed:
+                limiter.observe(time.perf_counter() - started, failed=True)
+            raise
+        finally:
+            limiter.release()
+
+
+async def _shed(scope: Scope, receive: Receive, send: Send) -> None:
+    http_exc = to_http_exception(OverloadedError())
+    response = JSONResponse(
+        status_code=http_exc.status_code,
+        content=http_exc.detail,
+        headers={"Retry-After": str(settings.concurrency_retry_after_seconds)},
+    )
+    await response(scope, receive, send)
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from fastapi import Depends, Request
 
-from app.cache.redis_client import redis_dependency
+from app.cache.redis_client import REDIS_UNAVAILABLE, redis_dependency
 from app.config.settings import settings
-from app.utils.exceptions import RateLimitError
+from app.observability.logging import get_logger
+from app.utils.exceptions import DependencyUnavailableError, RateLimitError
+
+logger = get_logger(__name__)
 
 
 async def rate_limiter(
@@ -16,6 +19,15 @@ async def rate_limiter(
     identifier = request.client.host if request.client else "anon"
     path = request.scope.get("path", "/")
     key = f"rate:{identifier}:{path}"
+    try:
+        await _consume(redis, key, requests_per_window, window_seconds)
+    except REDIS_UNAVAILABLE as exc:
+        if not settings.rate_limit_fail_open:
+            raise DependencyUnavailableError() from exc
+        logger.warning("Rate limiter unavailable, request allowed", path=path)
+
+
+async def _consume(redis, key: str, requests_per_window: int, window_seconds: int) -> None:
     ttl = await redis.ttl(key)
     current = await redis.get(key)
     count = int(current) if current else 0
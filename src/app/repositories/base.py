@@ -3,7 +3,10 @@ from __future__ import annotations
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.observability.queries import instrument_repository
 
+
+@instrument_repository
 class BaseRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
+from typing import Sequence
 
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncScalarResult, AsyncSession
 
 from app.domain.models.user import Comment
+from app.observability.queries import instrument_repository
 
 
 def _as_uuid(value: uuid.UUID | str) -> uuid.UUID:
     return value if isinstance(value, uuid.UUID) else uuid.UUID(value)
 
 
+@instrument_repository
 class CommentRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -24,19 +28,60 @@ class CommentRepository:
         await self.session.flush()
         return comment
 
-    async def list_for_post(self, post_id, limit: int, offset: int):
+    async def position(
+        self, post_id, comment_id: uuid.UUID | str
+    ) -> tuple[datetime, uuid.UUID] | None:
+        """``(created_at, id)`` of a comment on ``post_id``, the keyset position for
+        :meth:`list_for_post`."""
+        stmt = select(Comment.created_at).where(
+            Comment.id == _as_uuid(comment_id), Comment.post_id == _as_uuid(post_id)
+        )
+        created_at = await self.session.scalar(stmt)
+        return None if created_at is None else (created_at, _as_uuid(comment_id))
+
+    async def list_for_post(
+        self,
+        post_id,
+        limit: int,
+        offset: int,
+        before: tuple[datetime, uuid.UUID] | None = None,
+    ) -> list[Comment]:
+        """Newest first; with ``before`` (a :meth:`position`), only comments older than it."""
         stmt = (
             select(Comment)
             .where(Comment.post_id == _as_uuid(post_id))
-            .order_by(Comment.created_at.desc())
+            .order_by(Comment.created_at.desc(), Comment.id.desc())
             .limit(limit)
             .offset(offset)
         )
+        if before is not None:
+            created_at, cursor = before
+            stmt = stmt.where(
+                tuple_(Comment.created_at, Comment.id)
+                < tuple_(
+                    literal(created_at, Comment.created_at.type),
+                    literal(cursor, Comment.id.type),
+                )
+            )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def stream(self, author_id: str | None, batch_size: int) -> AsyncScalarResult[Comment]:
+        """Server-side cursor over comments, oldest first, fetched ``batch_size`` rows at a time."""
+        stmt = select(Comment).order_by(Comment.created_at, Comment.id)
+        if author_id:
+            stmt = stmt.where(Comment.author_id == _as_uuid(author_id))
+        return await self.session.stream_scalars(stmt.execution_options(yield_per=batch_size))
+
+    async def count_for_posts(self, post_ids: Sequence[uuid.UUID | str]) -> dict[str, int]:
+        uuid_ids = [_as_uuid(post_id) for post_id in post_ids]
+        stmt = (
+            select(Comment.post_id, func.count())
+            .where(Comment.post_id.in_(uuid_ids))
+            .group_by(Comment.post_id)
+        )
         result = await self.session.execute(stmt)
-        items = result.scalars().all()
-        count_stmt = select(func.count()).where(Comment.post_id == _as_uuid(post_id))
-        total = await self.session.scalar(count_stmt)
-        return items, int(total or 0)
+        return {str(post_id): int(count) for post_id, count in result.all()}
 
     async def get(self, comment_id):
         stmt = select(Comment).where(Comment.id == _as_uuid(comment_id))
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
 import uuid
+from typing import Sequence
 
-from sqlalchemy import Select, func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, desc, func, select
+from sqlalchemy.ext.asyncio import AsyncScalarResult, AsyncSession
 
 from app.domain.models.user import Follow
+from app.observability.queries import instrument_repository
 
 
 def _as_uuid(value: uuid.UUID | str) -> uuid.UUID:
     return value if isinstance(value, uuid.UUID) else uuid.UUID(value)
 
 
+@instrument_repository
 class FollowRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -22,7 +25,8 @@ class FollowRepository:
         await self.session.flush()
         return follow
 
-    async def delete(self, follower_id, followed_id) -> None:
+    async def delete(self, follower_id, followed_id) -> bool:
+        """Delete the edge if it exists and report whether it did."""
         stmt = select(Follow).where(
             Follow.follower_id == _as_uuid(follower_id), Follow.followed_id == _as_uuid(followed_id)
         )
@@ -30,35 +34,105 @@ class FollowRepository:
         follow = result.scalar_one_or_none()
         if follow:
             await self.session.delete(follow)
+        return follow is not None
 
-    async def list_followers(self, user_id: str, limit: int, offset: int):
+    async def list_followers(self, user_id: str, limit: int, offset: int) -> Sequence[Follow]:
         stmt: Select[tuple[Follow]] = (
             select(Follow)
             .where(Follow.followed_id == _as_uuid(user_id))
             .limit(limit)
             .offset(offset)
         )
-        result = await self.session.execute(stmt)
-        items = result.scalars().all()
-        count_stmt = select(func.count()).where(Follow.followed_id == _as_uuid(user_id))
-        total = await self.session.scalar(count_stmt)
-        return items, int(total or 0)
+        return (await self.session.execute(stmt)).scalars().all()
 
-    async def list_following(self, user_id: str, limit: int, offset: int):
+    async def list_following(self, user_id: str, limit: int, offset: int) -> Sequence[Follow]:
         stmt = (
             select(Follow)
             .where(Follow.follower_id == _as_uuid(user_id))
             .limit(limit)
             .offset(offset)
         )
+        return (await self.session.execute(stmt)).scalars().all()
+
+    async def stream(
+        self, batch_size: int, follower_id: str | None = None, followed_id: str | None = None
+    ) -> AsyncScalarResult[Follow]:
+        """Server-side cursor over follow edges, optionally restricted to one side."""
+        stmt = select(Follow).order_by(Follow.id)
+        if follower_id:
+            stmt = stmt.where(Follow.follower_id == _as_uuid(follower_id))
+        if followed_id:
+            stmt = stmt.where(Follow.followed_id == _as_uuid(followed_id))
+        return await self.session.stream_scalars(stmt.execution_options(yield_per=batch_size))
+
+    async def count_followers(self, user_ids: Sequence[uuid.UUID | str]) -> dict[str, int]:
+        stmt = (
+            select(Follow.followed_id, func.count())
+            .where(Follow.followed_id.in_([_as_uuid(user_id) for user_id in user_ids]))
+            .group_by(Follow.followed_id)
+        )
+        result = await self.session.execute(stmt)
+        return {str(user_id): int(count) for user_id, count in result.all()}
+
+    async def count_following(self, user_ids: Sequence[uuid.UUID | str]) -> dict[str, int]:
+        stmt = (
+            select(Follow.follower_id, func.count())
+            .where(Follow.follower_id.in_([_as_uuid(user_id) for user_id in user_ids]))
+            .group_by(Follow.follower_id)
+        )
         result = await self.session.execute(stmt)
-        items = result.scalars().all()
-        count_stmt = select(func.count()).where(Follow.follower_id == _as_uuid(user_id))
-        total = await self.session.scalar(count_stmt)
-        return items, int(total or 0)
+        return {str(user_id): int(count) for user_id, count in result.all()}
 
     async def exists(self, follower_id, followed_id) -> bool:
         stmt = select(Follow).where(
             Follow.follower_id == _as_uuid(follower_id), Follow.followed_id == _as_uuid(followed_id)
         )
         return (await self.session.execute(stmt)).scalar_one_or_none() is not None
+
+    async def following_ids(self, user_id: str, limit: int) -> Sequence[uuid.UUID]:
+        stmt = (
+            select(Follow.followed_id).where(Follow.follower_id == _as_uuid(user_id)).limit(limit)
+        )
+        return (await self.session.execute(stmt)).scalars().all()
+
+    async def follower_ids(self, user_id: str, limit: int) -> Sequence[uuid.UUID]:
+        stmt = (
+            select(Follow.follower_id).where(Follow.followed_id == _as_uuid(user_id)).limit(limit)
+        )
+        return (await self.session.execute(stmt)).scalars().all()
+
+    async def following_among(
+        self, user_ids: Sequence[uuid.UUID | str], followed_id: str
+    ) -> set[str]:
+        """Which of ``user_ids`` already follow ``followed_id``."""
+        stmt = select(Follow.follower_id).where(
+            Follow.followed_id == _as_uuid(followed_id),
+            Follow.follower_id.in_([_as_uuid(user_id) for user_id in user_ids]),
+        )
+        return {str(user_id) for user_id in (await self.session.execute(stmt)).scalars()}
+
+    async def second_degree(
+        self, user_id: str, via: Sequence[uuid.UUID | str], limit: int
+    ) -> list[tuple[str, int]]:
+        """Users followed by ``via`` but not by ``user_id``, ranked by how many of ``via``.
+
+        One grouped query over the ``via`` set replaces a self-join per followed user.
+        """
+        if not via:
+            return []
+        uid = _as_uuid(user_id)
+        already = select(Follow.followed_id).where(Follow.follower_id == uid)
+        mutual = func.count().label("mutual")
+        stmt = (
+            select(Follow.followed_id, mutual)
+            .where(
+                Follow.follower_id.in_([_as_uuid(member) for member in via]),
+                Follow.followed_id != uid,
+                Follow.followed_id.not_in(already),
+            )
+            .group_by(Follow.followed_id)
+            .order_by(desc(mutual), Follow.followed_id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [(str(candidate), int(count)) for candidate, count in result.all()]
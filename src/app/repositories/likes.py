@@ -1,17 +1,20 @@
 from __future__ import annotations
 
 import uuid
+from typing import Sequence
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.models.user import Like
+from app.observability.queries import instrument_repository
 
 
 def _as_uuid(value: uuid.UUID | str) -> uuid.UUID:
     return value if isinstance(value, uuid.UUID) else uuid.UUID(value)
 
 
+@instrument_repository
 class LikeRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -40,3 +43,23 @@ class LikeRepository:
     async def count(self, post_id) -> int:
         stmt = select(func.count()).where(Like.post_id == _as_uuid(post_id))
         return int(await self.session.scalar(stmt) or 0)
+
+    async def liked_post_ids(
+        self, user_id: uuid.UUID | str, post_ids: Sequence[uuid.UUID | str]
+    ) -> set[str]:
+        """Which of ``post_ids`` ``user_id`` has liked, in one query."""
+        stmt = select(Like.post_id).where(
+            Like.user_id == _as_uuid(user_id),
+            Like.post_id.in_([_as_uuid(post_id) for post_id in post_ids]),
+        )
+        return {str(post_id) for post_id in (await self.session.execute(stmt)).scalars()}
+
+    async def count_for_posts(self, post_ids: Sequence[uuid.UUID | str]) -> dict[str, int]:
+        uuid_ids = [_as_uuid(post_id) for post_id in post_ids]
+        stmt = (
+            select(Like.post_id, func.count())
+            .where(Like.post_id.in_(uuid_ids))
+            .group_by(Like.post_id)
+        )
+        result = await self.session.execute(stmt)
+        return {str(post_id): int(count) for post_id, count in result.all()}
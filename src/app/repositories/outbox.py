@@ -6,8 +6,10 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.models.user import EventOutbox
+from app.observability.queries import instrument_repository
 
 
+@instrument_repository
 class OutboxRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -23,6 +25,22 @@ class OutboxRepository:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def claim_pending(self, limit: int = 100):
+        """Lock up to ``limit`` unpublished rows, skipping rows claimed by other dispatchers.
+
+        The locks last until the session's transaction ends, so concurrent dispatcher
+        processes each publish a disjoint batch.
+        """
+        stmt = (
+            select(EventOutbox)
+            .where(EventOutbox.published.is_(False))
+            .order_by(EventOutbox.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
     async def mark_published(self, entry: EventOutbox) -> None:
         entry.published = True
         await self.session.flush()
@@ -1,18 +1,21 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 from typing import Sequence
 
-from sqlalchemy import Select, func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncScalarResult, AsyncSession
 
 from app.domain.models.user import Like, Post
+from app.observability.queries import instrument_repository
 
 
 def _as_uuid(value: uuid.UUID | str) -> uuid.UUID:
     return value if isinstance(value, uuid.UUID) else uuid.UUID(value)
 
 
+@instrument_repository
 class PostRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -28,19 +31,81 @@ class PostRepository:
         stmt = select(Post).where(Post.id == _as_uuid(post_id))
         return (await self.session.execute(stmt)).scalar_one_or_none()
 
-    async def list(self, author_id: str | None, limit: int, offset: int) -> tuple[list[Post], int]:
+    async def get_many(self, post_ids: Sequence[uuid.UUID | str]) -> Sequence[Post]:
+        stmt = select(Post).where(Post.id.in_([_as_uuid(post_id) for post_id in post_ids]))
+        return (await self.session.execute(stmt)).scalars().all()
+
+    async def position(self, post_id: uuid.UUID | str) -> tuple[datetime, uuid.UUID] | None:
+        """``(created_at, id)`` of a post, the keyset position for :meth:`list`."""
+        stmt = select(Post.created_at).where(Post.id == _as_uuid(post_id))
+        created_at = await self.session.scalar(stmt)
+        return None if created_at is None else (created_at, _as_uuid(post_id))
+
+    async def list(
+        self,
+        author_id: str | None,
+        limit: int,
+        offset: int,
+        before: tuple[datetime, uuid.UUID] | None = None,
+    ) -> tuple[list[Post], int]:
+        """Newest first. With ``before`` (a :meth:`position`) the page is the keyset page of
+        posts older than that position; ``offset`` then counts from the cursor."""
         stmt: Select[tuple[Post]] = select(Post)
         count_stmt = select(func.count()).select_from(Post)
         if author_id:
             author_uuid = _as_uuid(author_id)
             stmt = stmt.where(Post.author_id == author_uuid)
             count_stmt = count_stmt.where(Post.author_id == author_uuid)
-        stmt = stmt.order_by(Post.created_at.desc()).limit(limit).offset(offset)
+        if before is not None:
+            # Bound by the cursor row's created_at rather than the uuid7 timestamp, so
+            # pages stay exact across rows that still carry uuid4 ids.
+            created_at, cursor = before
+            stmt = stmt.where(
+                tuple_(Post.created_at, Post.id)
+                < tuple_(literal(created_at, Post.created_at.type), literal(cursor, Post.id.type))
+            )
+        stmt = stmt.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit).offset(offset)
         result = await self.session.execute(stmt)
         items = result.scalars().all()
         total = await self.session.scalar(count_stmt)
         return list(items), int(total or 0)
 
+    async def stream(self, author_id: str | None, batch_size: int) -> AsyncScalarResult[Post]:
+        """Server-side cursor over posts, oldest first, fetched ``batch_size`` rows at a time."""
+        stmt = select(Post).order_by(Post.created_at, Post.id)
+        if author_id:
+            stmt = stmt.where(Post.author_id == _as_uuid(author_id))
+        return await self.session.stream_scalars(stmt.execution_options(yield_per=batch_size))
+
+    async def ids_after(self, after: uuid.UUID | str | None, limit: int) -> Sequence[uuid.UUID]:
+        """Keyset page of post ids in primary-key order, starting after ``after``."""
+        stmt = select(Post.id).order_by(Post.id).limit(limit)
+        if after is not None:
+            stmt = stmt.where(Post.id > _as_uuid(after))
+        return (await self.session.execute(stmt)).scalars().all()
+
+    async def latest_for_authors(
+        self, author_ids: Sequence[uuid.UUID | str], per_author: int
+    ) -> Sequence[Post]:
+        """The newest ``per_author`` posts of each author, newest first, in one query."""
+        rank = (
+            func.row_number()
+            .over(partition_by=Post.author_id, order_by=(Post.created_at.desc(), Post.id.desc()))
+            .label("rank")
+        )
+        ranked = (
+            select(Post.id, rank)
+            .where(Post.author_id.in_([_as_uuid(author_id) for author_id in author_ids]))
+            .subquery()
+        )
+        stmt = (
+            select(Post)
+            .join(ranked, ranked.c.id == Post.id)
+            .where(ranked.c.rank <= per_author)
+            .order_by(Post.author_id, Post.created_at.desc(), Post.id.desc())
+        )
+        return (await self.session.execute(stmt)).scalars().all()
+
     async def delete(self, post: Post) -> None:
         await self.session.delete(post)
 
@@ -53,7 +118,7 @@ class PostRepository:
         stmt = (
             select(Post)
             .where(Post.author_id.in_(uuid_ids))
-            .order_by(Post.created_at.desc())
+            .order_by(Post.created_at.desc(), Post.id.desc())
             .limit(limit)
             .offset(offset)
         )
@@ -7,8 +7,10 @@ from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.models.user import User
+from app.observability.queries import instrument_repository
 
 
+@instrument_repository
 class UserRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -45,6 +47,18 @@ class UserRepository:
         stmt = select(User).where(User.id == user_id)
         return (await self.session.execute(stmt)).scalar_one_or_none()
 
+    async def get_many(self, user_ids: Sequence[uuid.UUID | str]) -> Sequence[User]:
+        uuid_ids = [uuid.UUID(u) if isinstance(u, str) else u for u in user_ids]
+        stmt = select(User).where(User.id.in_(uuid_ids))
+        return (await self.session.execute(stmt)).scalars().all()
+
+    async def ids_after(self, after: uuid.UUID | str | None, limit: int) -> Sequence[uuid.UUID]:
+        """Keyset page of user ids in primary-key order, starting after ``after``."""
+        stmt = select(User.id).order_by(User.id).limit(limit)
+        if after is not None:
+            stmt = stmt.where(User.id > (uuid.UUID(after) if isinstance(after, str) else after))
+        return (await self.session.execute(stmt)).scalars().all()
+
     async def update(self, user: User, **kwargs) -> User:
         for key, value in kwargs.items():
             if value is not None:
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+
+from app.cache.client_cache import client_cache
+from app.cache.notifications import notification_flusher
+from app.cache.redis_client import redis_client
+from app.cache.trending import trending_compactor
+from app.config.settings import settings
+from app.db.session import SessionLocal
+from app.events.broadcaster import feed_broadcaster
+from app.events.consumer import consumer
+from app.events.dispatcher import create_dispatcher
+from app.events.producer import producer
+from app.observability.logging import get_logger
+from app.observability.profiling import loop_lag_monitor
+from app.observability.startup import startup_timer
+
+logger = get_logger(__name__)
+
+API = "api"
+DISPATCHER = "dispatcher"
+CONSUMER = "consumer"
+ROLES = (API, DISPATCHER, CONSUMER)
+
+MAX_RETRY_DELAY_SECONDS = 30.0
+
+dispatcher = create_dispatcher(SessionLocal)
+_background_connects: set[asyncio.Task[None]] = set()
+
+
+def parse_roles(raw: str | Iterable[str]) -> set[str]:
+    roles = {role.strip() for role in (raw.split(",") if isinstance(raw, str) else raw)}
+    roles.discard("")
+    unknown = roles - set(ROLES)
+    if unknown:
+        raise ValueError(f"Unknown role(s): {', '.join(sorted(unknown))}")
+    return roles
+
+
+def uses_kafka(roles: set[str]) -> bool:
+    return DISPATCHER in roles or CONSUMER in roles
+
+
+async def _connect(name: str, connect: Callable[[], Awaitable[None]]) -> None:
+    with startup_timer.phase(f"connect_{name}"):
+        await asyncio.wait_for(connect(), settings.startup_timeout_seconds)
+
+
+async def _connect_with_retry(name: str, connect: Callable[[], Awaitable[None]]) -> None:
+    delay = 0.5
+    while True:
+        try:
+            await _connect(name, connect)
+            logger.info("Connected", component=name)
+            return
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("Connect failed, retrying", component=name, error=repr(exc), delay=delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RETRY_DELAY_SECONDS)
+
+
+async def start_roles(roles: set[str]) -> None:
+    """Start only the components the given roles need.
+
+    The API never publishes directly (writes go through the outbox), so only the
+    dispatcher role owns a Kafka producer and only the consumer role joins the group.
+    Connections are opened concurrently, each bounded by ``startup_timeout_seconds``.
+    In ``lazy`` startup mode they are opened in the background with retries so the
+    process can answer liveness probes immediately; ``/health/readiness`` reports
+    when they are up.
+    """
+    redis_client.init()
+    connectors: dict[str, Callable[[], Awaitable[None]]] = {"redis": redis_client.ping}
+    if DISPATCHER in roles:
+        connectors["kafka_producer"] = producer.start
+    if CONSUMER in roles:
+        connectors["kafka_consumer"] = consumer.start
+
+    if settings.startup_mode == "lazy":
+        for name, connect in connectors.items():
+            task = asyncio.create_task(_connect_with_retry(name, connect))
+            _background_connects.add(task)
+            task.add_done_callback(_background_connects.discard)
+    else:
+        await asyncio.gather(*(_connect(name, connect) for name, connect in connectors.items()))
+
+    if API in roles and settings.redis_client_cache_enabled:
+        await client_cache.start()
+    if API in roles:
+        await feed_broadcaster.start()
+    # The dispatcher starts the producer on first publish if it is not up yet.
+    if DISPATCHER in roles:
+        await dispatcher.start()
+    if CONSUMER in roles:
+        await trending_compactor.start()
+        await notification_flusher.start()
+    await loop_lag_monitor.start()
+    logger.info("Roles started", roles=sorted(roles), startup_mode=settings.startup_mode)
+
+
+async def stop_roles(roles: set[str]) -> None:
+    for task in list(_background_connects):
+        task.cancel()
+    await asyncio.gather(*_background_connects, return_exceptions=True)
+    await loop_lag_monitor.stop()
+    await client_cache.stop()
+    await feed_broadcaster.stop()
+    if CONSUMER in roles:
+        await trending_compactor.stop()
+        await notification_flusher.stop()
+        await consumer.stop()
+    if DISPATCHER in roles:
+        await dispatcher.stop()
+        await producer.stop()
+    await redis_client.close()
+    logger.info("Roles stopped", roles=sorted(roles))
+
+
+async def ping_kafka(roles: set[str]) -> None:
+    """Check the Kafka clients this process owns; raises if any is not connected."""
+    checks = []
+    if DISPATCHER in roles:
+        checks.append(producer.ping())
+    if CONSUMER in roles:
+        checks.append(consumer.ping())
+    await asyncio.gather(*checks)
@@ -1,14 +1,39 @@
 from __future__ import annotations
 
+import uuid
 from datetime import datetime, timezone
 
+import redis.asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.read_through import ReadThroughCache
+from app.cache.redis_client import REDIS_UNAVAILABLE, best_effort
+from app.domain.models.user import Comment
 from app.domain.schemas.comments import CommentCreate
 from app.repositories.comments import CommentRepository
 from app.repositories.outbox import OutboxRepository
 from app.repositories.posts import PostRepository
-from app.utils.exceptions import NotFoundError, UnauthorizedError
+from app.services.counts import PostCountReader
+from app.utils.exceptions import InvalidCursorError, NotFoundError, UnauthorizedError
+
+# The newest comments of a post are cached as one list deep enough to serve any first page.
+FIRST_PAGE_TTL_SECONDS = 60
+FIRST_PAGE_DEPTH = 100
+first_page_cache = ReadThroughCache("comments_first_page", FIRST_PAGE_TTL_SECONDS)
+
+
+def first_page_cache_key(post_id: str) -> str:
+    return f"comments:{post_id}:first"
+
+
+def _serialize(comment: Comment) -> dict:
+    return {
+        "id": str(comment.id),
+        "post_id": str(comment.post_id),
+        "author_id": str(comment.author_id),
+        "content": comment.content,
+        "created_at": comment.created_at.isoformat() if comment.created_at else None,
+    }
 
 
 class CommentService:
@@ -17,9 +42,13 @@ class CommentService:
         self.comments = CommentRepository(session)
         self.posts = PostRepository(session)
         self.outbox = OutboxRepository(session)
+        self.counts = PostCountReader(session)
 
-    async def add_comment(self, post_id: str, author_id: str, payload: CommentCreate):
-        if not await self.posts.get(post_id):
+    async def add_comment(
+        self, post_id: str, author_id: str, payload: CommentCreate, redis: aioredis.Redis
+    ):
+        post = await self.posts.get(post_id)
+        if not post:
             raise NotFoundError("Post not found")
         comment = await self.comments.create(
             post_id=post_id,
@@ -39,21 +68,62 @@ class CommentService:
                     "content": comment.content,
                     "created_at": comment.created_at.isoformat() if comment.created_at else None,
                 },
+                "post_author_id": str(post.author_id),
             },
         )
         await self.session.commit()
+        await best_effort(redis.delete(first_page_cache_key(str(comment.post_id))), "comment_cache")
         return comment
 
-    async def list_comments(self, post_id: str, page: int, size: int):
-        limit = size
-        offset = (page - 1) * size
-        return await self.comments.list_for_post(post_id, limit, offset)
+    async def list_comments(
+        self,
+        post_id: str,
+        page: int,
+        size: int,
+        redis: aioredis.Redis,
+        before: uuid.UUID | None = None,
+    ):
+        total = (await self.counts.comment_counts([post_id], redis))[post_id]
+        if page > 1 or size > FIRST_PAGE_DEPTH or before is not None:
+            offset = (page - 1) * size
+            cursor = None
+            if before is not None:
+                cursor = await self.comments.position(post_id, before)
+                if cursor is None:
+                    raise InvalidCursorError()
+            return await self.comments.list_for_post(post_id, size, offset, cursor), total
+        try:
+            items = await first_page_cache.get(
+                redis, first_page_cache_key(post_id), lambda: self._load_first_page(post_id)
+            )
+        except REDIS_UNAVAILABLE:
+            # Without Redis the first page comes straight from PostgreSQL.
+            return await self.comments.list_for_post(post_id, size, 0), total
+        return items[:size], total
+
+    async def _load_first_page(self, post_id: str) -> list[dict]:
+        comments = await self.comments.list_for_post(post_id, FIRST_PAGE_DEPTH, 0)
+        return [_serialize(comment) for comment in comments]
 
-    async def delete_comment(self, comment_id: str, user_id: str, is_admin: bool):
+    async def delete_comment(
+        self, comment_id: str, user_id: str, is_admin: bool, redis: aioredis.Redis
+    ):
         comment = await self.comments.get(comment_id)
         if not comment:
             raise NotFoundError("Comment not found")
         if str(comment.author_id) != user_id and not is_admin:
             raise UnauthorizedError("Cannot delete comment")
+        post_id = str(comment.post_id)
         await self.comments.delete(comment)
+        await self.outbox.enqueue(
+            topic="comment.deleted",
+            event_type="comment.deleted",
+            payload={
+                "event_id": str(uuid.uuid4()),
+                "occurred_at": datetime.now(timezone.utc).isoformat(),
+                "comment_id": str(comment.id),
+                "post_id": post_id,
+            },
+        )
         await self.session.commit()
+        await best_effort(redis.delete(first_page_cache_key(post_id)), "comment_cache")
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Sequence
+
+import redis.asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.counters import comment_counter, follower_counter, following_counter, like_counter
+from app.repositories.comments import CommentRepository
+from app.repositories.follows import FollowRepository
+from app.repositories.likes import LikeRepository
+
+
+class PostCountReader:
+    """Bulk like/comment count hydration shared by post listings and the feed."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.likes = LikeRepository(session)
+        self.comments = CommentRepository(session)
+
+    async def like_counts(self, post_ids: Sequence[str], redis: aioredis.Redis) -> dict[str, int]:
+        return await like_counter.read_through(redis, post_ids, self.likes.count_for_posts)
+
+    async def comment_counts(
+        self, post_ids: Sequence[str], redis: aioredis.Redis
+    ) -> dict[str, int]:
+        return await comment_counter.read_through(redis, post_ids, self.comments.count_for_posts)
+
+    async def hydrate(
+        self, post_ids: Sequence[str], redis: aioredis.Redis
+    ) -> dict[str, tuple[int, int]]:
+        """Return ``{post_id: (like_count, comment_count)}`` for a page of posts.
+
+        All shard HMGETs are issued together so an :class:`~app.cache.pipelining.AutoPipeline`
+        sends them in one round trip; DB backfills stay sequential on the shared session.
+        """
+        ids = list(dict.fromkeys(post_ids))
+        if not ids:
+            return {}
+        cached_likes, cached_comments = await asyncio.gather(
+            like_counter.get_many(redis, ids), comment_counter.get_many(redis, ids)
+        )
+        likes = await like_counter.fill_missing(redis, cached_likes, self.likes.count_for_posts)
+        comments = await comment_counter.fill_missing(
+            redis, cached_comments, self.comments.count_for_posts
+        )
+        return {post_id: (likes.get(post_id, 0), comments.get(post_id, 0)) for post_id in ids}
+
+
+class UserCountReader:
+    """Bulk follower/following count hydration for user profiles and follow listings."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.follows = FollowRepository(session)
+
+    async def follower_counts(
+        self, user_ids: Sequence[str], redis: aioredis.Redis
+    ) -> dict[str, int]:
+        return await follower_counter.read_through(redis, user_ids, self.follows.count_followers)
+
+    async def following_counts(
+        self, user_ids: Sequence[str], redis: aioredis.Redis
+    ) -> dict[str, int]:
+        return await following_counter.read_through(redis, user_ids, self.follows.count_following)
+
+    async def hydrate(
+        self, user_ids: Sequence[str], redis: aioredis.Redis
+    ) -> dict[str, tuple[int, int]]:
+        """Return ``{user_id: (follower_count, following_count)}``."""
+        ids = list(dict.fromkeys(user_ids))
+        if not ids:
+            return {}
+        cached_followers, cached_following = await asyncio.gather(
+            follower_counter.get_many(redis, ids), following_counter.get_many(redis, ids)
+        )
+        followers = await follower_counter.fill_missing(
+            redis, cached_followers, self.follows.count_followers
+        )
+        following = await following_counter.fill_missing(
+            redis, cached_following, self.follows.count_following
+        )
+        return {user_id: (followers.get(user_id, 0), following.get(user_id, 0)) for user_id in ids}
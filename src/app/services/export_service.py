@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncScalarResult, AsyncSession, async_sessionmaker
+
+from app.config.settings import settings
+from app.domain.schemas.exports import CommentExport, FollowExport, PostExport
+from app.observability.metrics import EXPORT_ROWS
+from app.repositories.comments import CommentRepository
+from app.repositories.follows import FollowRepository
+from app.repositories.posts import PostRepository
+
+Opener = Callable[[AsyncSession, int], Awaitable[AsyncScalarResult[Any]]]
+
+
+class ExportService:
+    """NDJSON exports read through server-side cursors.
+
+    Each export opens its own session, because the response body is produced after the
+    request-scoped session has been closed. Rows are fetched ``export_batch_size`` at a
+    time and written out one batch per chunk, so memory stays flat whatever the size.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.session_factory = session_factory
+
+    def posts(self, author_id: str | None) -> AsyncIterator[bytes]:
+        return self._ndjson(
+            "posts", PostExport, lambda s, n: PostRepository(s).stream(author_id, n)
+        )
+
+    def comments(self, author_id: str | None) -> AsyncIterator[bytes]:
+        return self._ndjson(
+            "comments", CommentExport, lambda s, n: CommentRepository(s).stream(author_id, n)
+        )
+
+    def follows(
+        self, follower_id: str | None = None, followed_id: str | None = None
+    ) -> AsyncIterator[bytes]:
+        return self._ndjson(
+            "follows",
+            FollowExport,
+            lambda s, n: FollowRepository(s).stream(n, follower_id, followed_id),
+        )
+
+    async def _ndjson(
+        self, kind: str, schema: type[BaseModel], open_stream: Opener
+    ) -> AsyncIterator[bytes]:
+        batch_size = settings.export_batch_size
+        async with self.session_factory() as session:
+            rows = await open_stream(session, batch_size)
+            async for partition in rows.partitions(batch_size):
+                chunk = b"".join(
+                    schema.model_validate(row).model_dump_json().encode() + b"\n"
+                    for row in partition
+                )
+                EXPORT_ROWS.labels(kind=kind).inc(len(partition))
+                yield chunk
@@ -1,14 +1,32 @@
 from __future__ import annotations
 
-import json
+import hashlib
 
 import redis.asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.read_through import ReadThroughCache
+from app.cache.redis_client import REDIS_UNAVAILABLE
+from app.cache.versions import ALL, author_version, following_version, version_store
+from app.config.settings import settings
 from app.repositories.follows import FollowRepository
+from app.repositories.likes import LikeRepository
 from app.repositories.posts import PostRepository
+from app.services.counts import PostCountReader
 
 FEED_TTL_SECONDS = 60
+feed_cache = ReadThroughCache("feed", FEED_TTL_SECONDS)
+# Keyed by the following version, so an entry is never stale and can live longer.
+FEED_AUTHORS_TTL_SECONDS = 300
+feed_authors_cache = ReadThroughCache("feed_authors", FEED_AUTHORS_TTL_SECONDS)
+# Upper bound on the followed authors a feed page is built from.
+FEED_MAX_AUTHORS = 1000
+# Each author's newest posts, kept by the consumer on post.created.
+AUTHOR_FEED_LENGTH = 100
+
+
+def author_feed_key(author_id: str) -> str:
+    return f"feed:{author_id}"
 
 
 class FeedService:
@@ -16,18 +34,65 @@ class FeedService:
         self.session = session
         self.posts = PostRepository(session)
         self.follows = FollowRepository(session)
+        self.likes = LikeRepository(session)
+        self.counts = PostCountReader(session)
+
+    async def get_feed(
+        self,
+        user_id: str,
+        page: int,
+        size: int,
+        redis: aioredis.Redis,
+        cache: aioredis.Redis | None = None,
+    ):
+        """``cache`` is an optional bytes-mode client for the page payload."""
+        items = await self.page(user_id, page, size, redis, cache)
+        return await self.with_viewer_state(items, user_id, redis)
+
+    async def page(
+        self,
+        user_id: str,
+        page: int,
+        size: int,
+        redis: aioredis.Redis,
+        cache: aioredis.Redis | None = None,
+    ) -> list[dict]:
+        """One feed page without counts or viewer state, served from the page cache.
 
-    async def get_feed(self, user_id: str, page: int, size: int, redis: aioredis.Redis):
-        cache_key = f"feed:{user_id}:{page}:{size}"
-        cached = await redis.get(cache_key)
-        if cached:
-            items = json.loads(cached)
-            return items
-        follows, _ = await self.follows.list_following(user_id, 1000, 0)
-        author_ids = [follow.followed_id for follow in follows] or [user_id]
+        The cache key carries the versions of the followed set and of each followed
+        author's posts. A new post or a follow is visible at once, and a post anywhere
+        else leaves the page cached.
+        """
+        cache = cache or redis
+        try:
+            everything, following = await version_store.get_many(
+                redis, [ALL, following_version(user_id)]
+            )
+            author_ids = await feed_authors_cache.get(
+                cache,
+                f"feed:authors:{user_id}:{following}",
+                lambda: self._feed_authors(user_id),
+            )
+            authors = await version_store.get_many(
+                redis, [author_version(author_id) for author_id in author_ids]
+            )
+            digest = hashlib.sha256("|".join([everything, following, *authors]).encode())
+            cache_key = f"feed:{user_id}:{page}:{size}:{digest.hexdigest()[:32]}"
+            return await feed_cache.get(
+                cache, cache_key, lambda: self._load_page(author_ids, page, size)
+            )
+        except REDIS_UNAVAILABLE:
+            # Without Redis the page comes straight from PostgreSQL.
+            return await self._load_page(await self._feed_authors(user_id), page, size)
+
+    async def _feed_authors(self, user_id: str) -> list[str]:
+        followed = await self.follows.following_ids(user_id, FEED_MAX_AUTHORS)
+        return [str(author_id) for author_id in followed] or [user_id]
+
+    async def _load_page(self, author_ids: list[str], page: int, size: int) -> list[dict]:
         offset = (page - 1) * size
         posts = await self.posts.list_feed(author_ids, size, offset)
-        items = [
+        return [
             {
                 "id": str(post.id),
                 "author_id": str(post.author_id),
@@ -35,9 +100,24 @@ class FeedService:
                 "media_url": post.media_url,
                 "created_at": post.created_at.isoformat() if post.created_at else None,
                 "updated_at": post.updated_at.isoformat() if post.updated_at else None,
-                "like_count": 0,
             }
             for post in posts
         ]
-        await redis.set(cache_key, json.dumps(items), ex=FEED_TTL_SECONDS)
+
+    async def followed_authors(self, user_id: str) -> list[str]:
+        """Authors whose new posts ``/feed/stream`` pushes to ``user_id``."""
+        followed = await self.follows.following_ids(user_id, settings.feed_stream_max_following)
+        return [str(author_id) for author_id in followed]
+
+    async def with_viewer_state(
+        self, items: list[dict], user_id: str, redis: aioredis.Redis
+    ) -> list[dict]:
+        # Counters and likes change far more often than the cached page, so neither is
+        # cached with it.
+        post_ids = [item["id"] for item in items]
+        counts = await self.counts.hydrate(post_ids, redis)
+        liked = await self.likes.liked_post_ids(user_id, post_ids) if post_ids else set()
+        for item in items:
+            item["like_count"], item["comment_count"] = counts[item["id"]]
+            item["liked_by_me"] = item["id"] in liked
         return items
@@ -3,11 +3,13 @@ from __future__ import annotations
 import uuid
 from datetime import datetime, timezone
 
+import redis.asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.repositories.follows import FollowRepository
 from app.repositories.outbox import OutboxRepository
 from app.repositories.users import UserRepository
+from app.services.counts import UserCountReader
 from app.utils.exceptions import ConflictError, NotFoundError
 
 
@@ -17,6 +19,7 @@ class FollowService:
         self.follows = FollowRepository(session)
         self.users = UserRepository(session)
         self.outbox = OutboxRepository(session)
+        self.counts = UserCountReader(session)
 
     async def follow(self, follower_id: str, followed_id: str):
         if follower_id == followed_id:
@@ -39,15 +42,29 @@ class FollowService:
         await self.session.commit()
 
     async def unfollow(self, follower_id: str, followed_id: str):
-        await self.follows.delete(follower_id, followed_id)
+        if await self.follows.delete(follower_id, followed_id):
+            await self.outbox.enqueue(
+                topic="user.unfollowed",
+                event_type="user.unfollowed",
+                payload={
+                    "event_id": str(uuid.uuid4()),
+                    "occurred_at": datetime.now(timezone.utc).isoformat(),
+                    "follower_id": follower_id,
+                    "followed_id": followed_id,
+                },
+            )
         await self.session.commit()
 
-    async def list_followers(self, user_id: str, page: int, size: int):
+    async def list_followers(self, user_id: str, page: int, size: int, redis: aioredis.Redis):
         limit = size
         offset = (page - 1) * size
-        return await self.follows.list_followers(user_id, limit, offset)
+        items = await self.follows.list_followers(user_id, limit, offset)
+        total = (await self.counts.follower_counts([user_id], redis))[user_id]
+        return items, total
 
-    async def list_following(self, user_id: str, page: int, size: int):
+    async def list_following(self, user_id: str, page: int, size: int, redis: aioredis.Redis):
         limit = size
         offset = (page - 1) * size
-        return await self.follows.list_following(user_id, limit, offset)
+        items = await self.follows.list_following(user_id, limit, offset)
+        total = (await self.counts.following_counts([user_id], redis))[user_id]
+        return items, total
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import redis.asyncio as aioredis
+
+from app.cache.notifications import notification_store
+from app.cache.redis_client import REDIS_UNAVAILABLE
+from app.utils.exceptions import DependencyUnavailableError
+
+
+class NotificationService:
+    """Reads a user's inbox; entries are written by the consumer's notification flusher."""
+
+    async def inbox(self, user_id: str, page: int, size: int, redis: aioredis.Redis):
+        """One page of notifications, newest first, and the unread count.
+
+        The inbox lives only in Redis. While Redis is unavailable this raises
+        :class:`DependencyUnavailableError` (``503``) rather than show an empty inbox.
+        """
+        try:
+            items = await notification_store.page(redis, user_id, (page - 1) * size, size)
+            return items, await notification_store.unread(redis, user_id)
+        except REDIS_UNAVAILABLE as exc:
+            raise DependencyUnavailableError("Notifications are unavailable") from exc
+
+    async def mark_read(self, user_id: str, redis: aioredis.Redis) -> None:
+        await notification_store.mark_read(redis, user_id)
@@ -2,15 +2,30 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime, timezone
+from typing import Sequence
 
 import redis.asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.counters import like_counter
+from app.cache.idempotency import PENDING
+from app.cache.redis_client import REDIS_UNAVAILABLE, best_effort
+from app.cache.trending import trending_store
+from app.cache.versions import author_version, post_version, version_store
+from app.config.settings import settings
 from app.domain.schemas.posts import PostCreate
 from app.repositories.likes import LikeRepository
 from app.repositories.outbox import OutboxRepository
 from app.repositories.posts import PostRepository
-from app.utils.exceptions import ConflictError, NotFoundError, UnauthorizedError
+from app.services.counts import PostCountReader
+from app.utils.exceptions import (
+    ConflictError,
+    DependencyUnavailableError,
+    IdempotencyInProgressError,
+    InvalidCursorError,
+    NotFoundError,
+    UnauthorizedError,
+)
 
 
 class PostService:
@@ -19,37 +34,67 @@ class PostService:
         self.posts = PostRepository(session)
         self.likes = LikeRepository(session)
         self.outbox = OutboxRepository(session)
+        self.counts = PostCountReader(session)
 
     async def create_post(self, user_id: str, payload: PostCreate, redis: aioredis.Redis):
+        # Legacy body-level key; the Idempotency-Key header (IdempotencyMiddleware) is
+        # preferred. Reserving with SET NX closes the window where two concurrent retries
+        # both missed the GET and created duplicate posts.
+        reserved = False
         if payload.idempotency_key:
             cache_key = f"idempotency:post:{payload.idempotency_key}:{user_id}"
-            existing_id = await redis.get(cache_key)
-            if existing_id:
-                existing = await self.posts.get(existing_id)
-                if existing:
-                    return existing
-        post = await self.posts.create(
-            author_id=user_id,
-            content=payload.content,
-            media_url=payload.media_url,
-        )
-        event_payload = {
-            "event_id": str(post.id),
-            "occurred_at": datetime.now(timezone.utc).isoformat(),
-            "post": {
-                "id": str(post.id),
-                "author_id": str(post.author_id),
-                "content": post.content,
-                "media_url": post.media_url,
-                "created_at": post.created_at.isoformat() if post.created_at else None,
-            },
-        }
-        await self.outbox.enqueue(
-            topic="post.created", payload=event_payload, event_type="post.created"
-        )
-        await self.session.commit()
-        if payload.idempotency_key:
-            await redis.set(cache_key, str(post.id), ex=3600)
+            try:
+                reserved = bool(
+                    await redis.set(
+                        cache_key, PENDING, nx=True, ex=settings.idempotency_lock_seconds
+                    )
+                )
+            except REDIS_UNAVAILABLE as exc:
+                if not settings.idempotency_fail_open:
+                    raise DependencyUnavailableError() from exc
+                # Policy allows creating the post without the duplicate check.
+            else:
+                if not reserved:
+                    existing_id = await redis.get(cache_key)
+                    existing = (
+                        await self.posts.get(existing_id)
+                        if existing_id and existing_id != PENDING
+                        else None
+                    )
+                    if existing:
+                        return existing
+                    raise IdempotencyInProgressError()
+        try:
+            post = await self.posts.create(
+                author_id=user_id,
+                content=payload.content,
+                media_url=payload.media_url,
+            )
+            event_payload = {
+                "event_id": str(post.id),
+                "occurred_at": datetime.now(timezone.utc).isoformat(),
+                "post": {
+                    "id": str(post.id),
+                    "author_id": str(post.author_id),
+                    "content": post.content,
+                    "media_url": post.media_url,
+                    "created_at": post.created_at.isoformat() if post.created_at else None,
+                },
+            }
+            await self.outbox.enqueue(
+                topic="post.created", payload=event_payload, event_type="post.created"
+            )
+            await self.session.commit()
+        except BaseException:
+            if reserved:
+                await best_effort(redis.delete(cache_key), "post_idempotency")
+            raise
+        if reserved:
+            await best_effort(
+                redis.set(cache_key, str(post.id), ex=settings.idempotency_ttl_seconds),
+                "post_idempotency",
+            )
+        await best_effort(version_store.bump(redis, author_version(user_id)), "bump_versions")
         return post
 
     async def get_post(self, post_id: str):
@@ -58,13 +103,37 @@ class PostService:
             raise NotFoundError("Post not found")
         return post
 
-    async def list_posts(self, page: int, size: int, author_id: str | None):
+    async def list_posts(
+        self, page: int, size: int, author_id: str | None, before: uuid.UUID | None = None
+    ):
         limit = size
         offset = (page - 1) * size
-        items, total = await self.posts.list(author_id, limit, offset)
+        cursor = None
+        if before is not None:
+            # A deleted cursor must not read as an empty page, i.e. the end of the list.
+            cursor = await self.posts.position(before)
+            if cursor is None:
+                raise InvalidCursorError()
+        items, total = await self.posts.list(author_id, limit, offset, cursor)
         return items, total
 
-    async def delete_post(self, post_id: str, current_user_id: str, is_admin: bool):
+    async def trending(self, limit: int, redis: aioredis.Redis):
+        """Top posts by decayed score as ``[(post, score)]``; one ZREVRANGE and one IN query.
+
+        The ranking only exists in Redis, so while Redis is unavailable the list is empty.
+        """
+        try:
+            ranked = await trending_store.top(redis, limit)
+        except REDIS_UNAVAILABLE:
+            return []
+        posts = {str(post.id): post for post in await self.posts.get_many([p for p, _ in ranked])}
+        deleted = [post_id for post_id, _ in ranked if post_id not in posts]
+        await best_effort(trending_store.remove(redis, *deleted), "trending_prune")
+        return [(posts[post_id], score) for post_id, score in ranked if post_id in posts]
+
+    async def delete_post(
+        self, post_id: str, current_user_id: str, is_admin: bool, redis: aioredis.Redis
+    ):
         post = await self.posts.get(post_id)
         if not post:
             raise NotFoundError("Post not found")
@@ -72,36 +141,58 @@ class PostService:
             raise UnauthorizedError("Cannot delete post")
         await self.posts.delete(post)
         await self.session.commit()
+        await best_effort(
+            version_store.bump(redis, author_version(str(post.author_id)), post_version(post_id)),
+            "bump_versions",
+        )
 
     async def like_post(self, post_id: str, user_id: str, redis: aioredis.Redis):
+        post = await self.posts.get(post_id)
+        if not post:
+            raise NotFoundError("Post not found")
         if await self.likes.exists(post_id, user_id):
             raise ConflictError("Already liked")
         await self.likes.create(post_id, user_id)
-        await redis.hincrby("post:like_counts", post_id, 1)
         event_payload = {
             "event_id": str(uuid.uuid4()),
             "occurred_at": datetime.now(timezone.utc).isoformat(),
             "post_id": post_id,
             "user_id": user_id,
+            "post_author_id": str(post.author_id),
         }
         await self.outbox.enqueue(
             topic="post.liked", payload=event_payload, event_type="post.liked"
         )
         await self.session.commit()
+        # The request is the only writer of like counts; the post.liked consumer does not
+        # touch them, so a like is never counted twice. A cold counter is left for the
+        # read path to load from the database, which already includes this like.
+        await best_effort(like_counter.incr(redis, post_id, 1, if_cached=True), "like_count")
+        await best_effort(version_store.bump(redis, post_version(post_id)), "bump_versions")
 
     async def unlike_post(self, post_id: str, user_id: str, redis: aioredis.Redis):
         if not await self.likes.exists(post_id, user_id):
             return
         await self.likes.delete(post_id, user_id)
-        new_count = await redis.hincrby("post:like_counts", post_id, -1)
-        if new_count < 0:
-            await redis.hset("post:like_counts", post_id, 0)
         await self.session.commit()
+        await best_effort(like_counter.incr(redis, post_id, -1, if_cached=True), "like_count")
+        await best_effort(version_store.bump(redis, post_version(post_id)), "bump_versions")
 
     async def count_likes(self, post_id: str, redis: aioredis.Redis) -> int:
-        cached = await redis.hget("post:like_counts", post_id)
-        if cached is not None:
-            return int(cached)
-        count = await self.likes.count(post_id)
-        await redis.hset("post:like_counts", post_id, count)
-        return count
+        counts = await self.counts.like_counts([post_id], redis)
+        return counts[post_id]
+
+    async def count_comments(self, post_id: str, redis: aioredis.Redis) -> int:
+        counts = await self.counts.comment_counts([post_id], redis)
+        return counts[post_id]
+
+    async def liked_by(self, user_id: str | None, post_ids: Sequence[str]) -> set[str]:
+        """The subset of ``post_ids`` the viewer liked; empty for anonymous viewers."""
+        if user_id is None or not post_ids:
+            return set()
+        return await self.likes.liked_post_ids(user_id, post_ids)
+
+    async def hydrate_counts(
+        self, post_ids: Sequence[str], redis: aioredis.Redis
+    ) -> dict[str, tuple[int, int]]:
+        return await self.counts.hydrate(post_ids, redis)
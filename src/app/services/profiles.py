@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Sequence
+
+import redis.asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.redis_client import REDIS_UNAVAILABLE, best_effort
+from app.domain.schemas.users import UserPublic
+from app.repositories.users import UserRepository
+from app.services.counts import UserCountReader
+
+PROFILE_TTL_SECONDS = 300
+# Counts change far more often than profiles, so they are never cached with them.
+_COUNT_FIELDS = {"follower_count", "following_count"}
+EXPAND_AUTHOR = "author"
+
+
+def profile_cache_key(user_id: str) -> str:
+    return f"user:profile:{user_id}"
+
+
+class ProfileReader:
+    """Public profiles for every author on a page: one MGET, then one IN query for misses."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.users = UserRepository(session)
+        self.counts = UserCountReader(session)
+
+    async def load(self, user_ids: Sequence[str], redis: aioredis.Redis) -> list[UserPublic]:
+        """Return the distinct profiles for ``user_ids`` in order of first appearance."""
+        ids = list(dict.fromkeys(user_ids))
+        if not ids:
+            return []
+        try:
+            cached = await redis.mget([profile_cache_key(user_id) for user_id in ids])
+        except REDIS_UNAVAILABLE:
+            # Every profile is a miss and is loaded from PostgreSQL.
+            cached = [None] * len(ids)
+        profiles: dict[str, UserPublic] = {}
+        missing: list[str] = []
+        for user_id, raw in zip(ids, cached):
+            if raw is None:
+                missing.append(user_id)
+            else:
+                profiles[user_id] = UserPublic.model_validate_json(raw)
+        if missing:
+            fresh = {
+                str(user.id): UserPublic.model_validate(user)
+                for user in await self.users.get_many(missing)
+            }
+            await best_effort(
+                asyncio.gather(
+                    *(
+                        redis.set(
+                            profile_cache_key(user_id),
+                            profile.model_dump_json(exclude=_COUNT_FIELDS),
+                            ex=PROFILE_TTL_SECONDS,
+                        )
+                        for user_id, profile in fresh.items()
+                    )
+                ),
+                "profile_cache",
+            )
+            profiles.update(fresh)
+        counts = await self.counts.hydrate(list(profiles), redis)
+        return [
+            with_counts(profiles[user_id], counts[user_id])
+            for user_id in ids
+            if user_id in profiles
+        ]
+
+    async def expand(
+        self, expand: set[str], user_ids: Sequence[str], redis: aioredis.Redis
+    ) -> list[UserPublic] | None:
+        """``authors`` for a list response: ``None`` unless ``expand=author`` was requested."""
+        if EXPAND_AUTHOR not in expand:
+            return None
+        return await self.load(user_ids, redis)
+
+
+def with_counts(profile: UserPublic, counts: tuple[int, int]) -> UserPublic:
+    """``profile`` with ``(follower_count, following_count)`` filled in."""
+    follower_count, following_count = counts
+    return profile.model_copy(
+        update={"follower_count": follower_count, "following_count": following_count}
+    )
+
+
+async def invalidate_profile(user_id: str, redis: aioredis.Redis) -> None:
+    await redis.delete(profile_cache_key(user_id))
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import datetime, timezone
+from typing import cast
+
+import redis.asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache.counters import (
+    CounterStore,
+    comment_counter,
+    follower_counter,
+    following_counter,
+    like_counter,
+)
+from app.cache.pipelining import AutoPipeline
+from app.cache.versions import ALL, version_store
+from app.config.settings import settings
+from app.domain.events.schemas import PostCreatedPayload
+from app.observability.logging import get_logger
+from app.observability.metrics import REBUILD_ROWS
+from app.repositories.comments import CommentRepository
+from app.repositories.follows import FollowRepository
+from app.repositories.likes import LikeRepository
+from app.repositories.posts import PostRepository
+from app.repositories.users import UserRepository
+from app.services.feed_service import AUTHOR_FEED_LENGTH, author_feed_key
+from app.utils.exceptions import RebuildInProgressError
+
+logger = get_logger(__name__)
+
+LIKES = "likes"
+COMMENTS = "comments"
+FOLLOWERS = "followers"
+FOLLOWING = "following"
+FEEDS = "feeds"
+TARGETS = (LIKES, COMMENTS, FOLLOWERS, FOLLOWING, FEEDS)
+
+LOCK_KEY = "rebuild:lock"
+CHECKPOINT_KEY = "rebuild:checkpoint"
+STATUS_KEY = "rebuild:status"
+# Checkpoint value of a target that finished in the current (possibly resumed) run.
+DONE = "done"
+LOCK_SECONDS = 300
+
+Loader = Callable[[Sequence[uuid.UUID]], Awaitable[dict[str, int]]]
+
+
+class SnapshotRebuilder:
+    """Recompute the Redis projections from PostgreSQL.
+
+    Each target walks its key space (post or user ids) in primary-key order, ``batch_size``
+    ids at a time. One grouped aggregate query per batch computes the values, and the
+    writes for the batch go out in one pipelined round trip. After every batch the last id
+    is checkpointed in Redis, so an interrupted run resumes where it stopped. The job also
+    sleeps ``pause_seconds`` between batches to leave headroom for live traffic.
+
+    Values are overwritten rather than merged. A delta applied by the consumer between a
+    batch's query and its write can be lost; rerunning the target fixes that.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        redis: aioredis.Redis,
+        batch_size: int | None = None,
+        pause_seconds: float | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.redis = redis
+        self.batch_size = batch_size or settings.rebuild_batch_size
+        self.pause_seconds = (
+            settings.rebuild_pause_seconds if pause_seconds is None else pause_seconds
+        )
+
+    async def acquire(self) -> None:
+        """Take the cluster-wide rebuild lock or raise :class:`RebuildInProgressError`."""
+        if not await self.redis.set(LOCK_KEY, "1", nx=True, ex=LOCK_SECONDS):
+            raise RebuildInProgressError()
+
+    async def run(self, targets: Sequence[str] = TARGETS, restart: bool = False) -> dict[str, int]:
+        await self.acquire()
+        return await self.run_locked(targets, restart)
+
+    async def run_locked(
+        self, targets: Sequence[str] = TARGETS, restart: bool = False
+    ) -> dict[str, int]:
+        """Rebuild ``targets`` (the lock must be held) and return rows processed per target."""
+        processed: dict[str, int] = {}
+        try:
+            if restart:
+                await self.redis.delete(CHECKPOINT_KEY)
+            await self.redis.delete(STATUS_KEY)
+            await self._status(state="running", started_at=_now())
+            for target in targets:
+                processed[target] = await self._rebuild(target)
+            await self.redis.delete(CHECKPOINT_KEY)
+            # Counts changed under every cached representation; revalidate all ETags.
+            await version_store.bump(self.redis, ALL)
+            await self._status(state="finished", finished_at=_now())
+            logger.info("Snapshot rebuild finished", processed=processed)
+            return processed
+        except BaseException as exc:
+            await self._status(state="failed", error=repr(exc), finished_at=_now())
+            raise
+        finally:
+            await self.redis.delete(LOCK_KEY)
+
+    async def status(self) -> dict:
+        return {
+            "running": await self.redis.get(LOCK_KEY) is not None,
+            "checkpoints": await self.redis.hgetall(CHECKPOINT_KEY),
+            "last_run": await self.redis.hgetall(STATUS_KEY),
+        }
+
+    async def _rebuild(self, target: str) -> int:
+        after = await self.redis.hget(CHECKPOINT_KEY, target)
+        if after == DONE:
+            return 0
+        processed = 0
+        while True:
+            async with self.session_factory() as session:
+                if target in (FOLLOWERS, FOLLOWING, FEEDS):
+                    ids = await UserRepository(session).ids_after(after, self.batch_size)
+                else:
+                    ids = await PostRepository(session).ids_after(after, self.batch_size)
+                if not ids:
+                    break
+                await self._write_batch(session, target, ids)
+            after = str(ids[-1])
+            processed += len(ids)
+            REBUILD_ROWS.labels(target=target).inc(len(ids))
+            await self.redis.hset(CHECKPOINT_KEY, target, after)
+            await self._status(target=target, **{f"{target}_processed": processed})
+            await self.redis.expire(LOCK_KEY, LOCK_SECONDS)
+            await asyncio.sleep(self.pause_seconds)
+        await self.redis.hset(CHECKPOINT_KEY, target, DONE)
+        return processed
+
+    async def _write_batch(
+        self, session: AsyncSession, target: str, ids: Sequence[uuid.UUID]
+    ) -> None:
+        if target == LIKES:
+            await self._write_counts(like_counter, ids, LikeRepository(session).count_for_posts)
+        elif target == COMMENTS:
+            comments = CommentRepository(session)
+            await self._write_counts(comment_counter, ids, comments.count_for_posts)
+        elif target == FOLLOWERS:
+            follows = FollowRepository(session)
+            await self._write_counts(follower_counter, ids, follows.count_followers)
+        elif target == FOLLOWING:
+            follows = FollowRepository(session)
+            await self._write_counts(following_counter, ids, follows.count_following)
+        elif target == FEEDS:
+            await self._write_feeds(session, ids)
+        else:
+            raise ValueError(f"Unknown rebuild target: {target}")
+
+    async def _write_counts(
+        self, store: CounterStore, ids: Sequence[uuid.UUID], loader: Loader
+    ) -> None:
+        counts = await loader(ids)
+        pipeline = AutoPipeline(self.redis)
+        values = {str(member): counts.get(str(member), 0) for member in ids}
+        await store.set_many(cast(aioredis.Redis, pipeline), values)
+        await pipeline.aclose()
+
+    async def _write_feeds(self, session: AsyncSession, author_ids: Sequence[uuid.UUID]) -> None:
+        posts = await PostRepository(session).latest_for_authors(author_ids, AUTHOR_FEED_LENGTH)
+        feeds: defaultdict[str, list[str]] = defaultdict(list)
+        for post in posts:
+            payload = PostCreatedPayload.model_validate(post, from_attributes=True)
+            feeds[str(post.author_id)].append(payload.model_dump_json())
+        pipe = self.redis.pipeline(transaction=False)
+        for author_id in author_ids:
+            key = author_feed_key(str(author_id))
+            pipe.delete(key)
+            if feeds[str(author_id)]:
+                pipe.rpush(key, *feeds[str(author_id)])
+        await pipe.execute()
+
+    async def _status(self, **fields: object) -> None:
+        await self.redis.hset(STATUS_KEY, mapping={k: str(v) for k, v in fields.items()})
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
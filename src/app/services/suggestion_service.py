@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import redis.asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.redis_client import REDIS_UNAVAILABLE
+from app.config.settings import settings
+from app.domain.schemas.users import FollowSuggestion
+from app.repositories.follows import FollowRepository
+from app.services.profiles import ProfileReader
+
+
+def suggestions_key(user_id: str) -> str:
+    return f"user:suggestions:{user_id}"
+
+
+def suggestions_built_key(user_id: str) -> str:
+    # An empty sorted set does not exist in Redis, so "built, nothing to suggest" needs a marker.
+    return f"user:suggestions:{user_id}:built"
+
+
+class SuggestionService:
+    """Friends-of-friends "who to follow" suggestions, ranked by mutual follows.
+
+    A candidate's score is the number of users you follow who follow them. The top
+    ``suggestions_cache_size`` are computed with one grouped query over the users you
+    follow, then stored as a sorted set that lives for ``suggestions_ttl_seconds``.
+    While a set is cached, follow and unfollow events adjust it in place
+    (:meth:`on_followed`, :meth:`on_unfollowed`) rather than recomputing it. A candidate
+    that was cut off by the size cap can only return through a recompute after expiry.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.follows = FollowRepository(session)
+        self.profiles = ProfileReader(session)
+
+    async def suggest(
+        self, user_id: str, limit: int, redis: aioredis.Redis
+    ) -> list[FollowSuggestion]:
+        """Empty while Redis is unavailable: recomputing the grouped query per request
+        would put the cost of the outage on PostgreSQL."""
+        try:
+            if await redis.get(suggestions_built_key(user_id)) is None:
+                await self.build(user_id, redis)
+            ranked = await redis.zrevrange(suggestions_key(user_id), 0, limit - 1, withscores=True)
+        except REDIS_UNAVAILABLE:
+            return []
+        mutual = {str(member): int(score) for member, score in ranked}
+        profiles = await self.profiles.load(list(mutual), redis)
+        return [
+            FollowSuggestion(**profile.model_dump(), mutual_count=mutual[str(profile.id)])
+            for profile in profiles
+        ]
+
+    async def build(self, user_id: str, redis: aioredis.Redis) -> None:
+        following = await self.follows.following_ids(user_id, settings.suggestions_max_following)
+        ranked = await self.follows.second_degree(
+            user_id, following, settings.suggestions_cache_size
+        )
+        key = suggestions_key(user_id)
+        pipe = redis.pipeline(transaction=True)
+        pipe.delete(key)
+        if ranked:
+            pipe.zadd(key, dict(ranked))
+            pipe.expire(key, settings.suggestions_ttl_seconds)
+        pipe.set(suggestions_built_key(user_id), "1", ex=settings.suggestions_ttl_seconds)
+        await pipe.execute()
+
+    async def on_followed(self, redis: aioredis.Redis, follower_id: str, followed_id: str) -> None:
+        """``follower_id`` now follows ``followed_id``.
+
+        The follower stops seeing ``followed_id`` and gains one mutual for everyone
+        ``followed_id`` follows. Each of the follower's own followers gains one mutual
+        for ``followed_id``.
+        """
+        if await redis.get(suggestions_built_key(follower_id)) is not None:
+            gained = await self.follows.second_degree(
+                follower_id, [followed_id], settings.suggestions_cache_size
+            )
+            key = suggestions_key(follower_id)
+            pipe = redis.pipeline(transaction=False)
+            pipe.zrem(key, followed_id)
+            for candidate, _ in gained:
+                pipe.zincrby(key, 1, candidate)
+            pipe.zremrangebyrank(key, 0, -(settings.suggestions_cache_size + 1))
+            pipe.expire(key, settings.suggestions_ttl_seconds)
+            await pipe.execute()
+        await self._adjust_followers(redis, follower_id, followed_id, 1)
+
+    async def on_unfollowed(
+        self, redis: aioredis.Redis, follower_id: str, followed_id: str
+    ) -> None:
+        # Which mutuals the unfollow took away is not known without the graph; rebuild lazily.
+        await redis.delete(suggestions_key(follower_id), suggestions_built_key(follower_id))
+        await self._adjust_followers(redis, follower_id, followed_id, -1)
+
+    async def _adjust_followers(
+        self, redis: aioredis.Redis, user_id: str, candidate: str, delta: int
+    ) -> None:
+        """Add ``delta`` mutuals for ``candidate`` to the cached sets of ``user_id``'s followers."""
+        followers = [
+            str(follower)
+            for follower in await self.follows.follower_ids(
+                user_id, settings.suggestions_fanout_limit
+            )
+        ]
+        cached = await self._cached(redis, followers)
+        if candidate in cached:
+            cached.remove(candidate)
+        if not cached:
+            return
+        skip = await self.follows.following_among(cached, candidate)
+        pipe = redis.pipeline(transaction=False)
+        for follower in cached:
+            if follower in skip:
+                continue
+            key = suggestions_key(follower)
+            pipe.zincrby(key, delta, candidate)
+            if delta > 0:
+                pipe.zremrangebyrank(key, 0, -(settings.suggestions_cache_size + 1))
+            else:
+                pipe.zremrangebyscore(key, "-inf", 0)
+            # The set may not exist yet (built empty); never leave it without a TTL.
+            pipe.expire(key, settings.suggestions_ttl_seconds)
+        await pipe.execute()
+
+    async def _cached(self, redis: aioredis.Redis, user_ids: Sequence[str]) -> list[str]:
+        if not user_ids:
+            return []
+        built = await redis.mget([suggestions_built_key(user_id) for user_id in user_ids])
+        return [user_id for user_id, marker in zip(user_ids, built) if marker is not None]
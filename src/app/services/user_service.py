@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+from typing import Sequence
+
+import redis.asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.security import hash_password
-from app.domain.schemas.users import UserUpdate
+from app.cache.redis_client import best_effort
+from app.cache.versions import user_version, version_store
+from app.domain.models.user import User
+from app.domain.schemas.users import UserPublic, UserUpdate
 from app.repositories.users import UserRepository
+from app.services.counts import UserCountReader
+from app.services.profiles import invalidate_profile, with_counts
 from app.utils.exceptions import NotFoundError
 
 
@@ -12,6 +20,7 @@ class UserService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
         self.users = UserRepository(session)
+        self.counts = UserCountReader(session)
 
     async def me(self, user_id: str):
         user = await self.users.get(user_id)
@@ -19,7 +28,7 @@ class UserService:
             raise NotFoundError("User not found")
         return user
 
-    async def update_profile(self, user_id: str, payload: UserUpdate):
+    async def update_profile(self, user_id: str, payload: UserUpdate, redis: aioredis.Redis):
         user = await self.me(user_id)
         updated = await self.users.update(
             user,
@@ -29,6 +38,8 @@ class UserService:
             password_hash=hash_password(payload.password) if payload.password else None,
         )
         await self.session.commit()
+        await best_effort(invalidate_profile(user_id, redis), "invalidate_profile")
+        await best_effort(version_store.bump(redis, user_version(user_id)), "bump_versions")
         return updated
 
     async def search(self, query: str | None, page: int, size: int):
@@ -36,3 +47,12 @@ class UserService:
         offset = (page - 1) * size
         items, total = await self.users.list(query, limit, offset)
         return items, total
+
+    async def public_profiles(
+        self, users: Sequence[User], redis: aioredis.Redis
+    ) -> list[UserPublic]:
+        """Public profiles with follower/following counts, read in one batch."""
+        counts = await self.counts.hydrate([str(user.id) for user in users], redis)
+        return [
+            with_counts(UserPublic.model_validate(user), counts[str(user.id)]) for user in users
+        ]
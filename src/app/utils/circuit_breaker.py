@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from app.observability.logging import get_logger
+from app.observability.metrics import CIRCUIT_BREAKER_STATE, CIRCUIT_BREAKER_TRANSITIONS
+from app.utils.deadline import detached
+from app.utils.exceptions import DependencyUnavailableError
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """Fail fast while a dependency is down instead of waiting on it per request.
+
+    ``failure_threshold`` consecutive failures open the breaker, and :meth:`check`
+    then raises :class:`DependencyUnavailableError` at once. After ``reset_seconds``
+    the next caller is let through as a probe (half-open). Its success closes the
+    breaker and its failure reopens it. A probe that never reports back is replaced
+    after another ``reset_seconds``. Callers either use :meth:`call` or report outcomes
+    themselves with :meth:`record_success` / :meth:`record_failure`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_seconds: float,
+        failures: tuple[type[BaseException], ...] = (Exception,),
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = failures
+        self.state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_at = 0.0
+        self._on_recover: list[Callable[[], Awaitable[None]]] = []
+        self._recoveries: set[asyncio.Task[None]] = set()
+        CIRCUIT_BREAKER_STATE.labels(breaker=name).set(_STATE_VALUES[CLOSED])
+
+    def on_recover(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Run ``callback`` in the background whenever the breaker closes after opening."""
+        self._on_recover.append(callback)
+
+    def check(self) -> None:
+        if self.state == CLOSED:
+            return
+        now = time.monotonic()
+        if self.state == OPEN and now - self._opened_at >= self.reset_seconds:
+            self._probe_at = now
+            self._transition(HALF_OPEN)
+            return
+        if self.state == HALF_OPEN and now - self._probe_at >= self.reset_seconds:
+            self._probe_at = now
+            return
+        raise DependencyUnavailableError(f"{self.name} is unavailable")
+
+    def fail_fast(self) -> None:
+        """Raise while open, without taking the half-open probe slot like :meth:`check`."""
+        if self.state == OPEN and time.monotonic() - self._opened_at < self.reset_seconds:
+            raise DependencyUnavailableError(f"{self.name} is unavailable")
+
+    def record_success(self) -> None:
+        self._consecutive_failures = 0
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+            with detached():
+                for callback in self._on_recover:
+                    task = asyncio.get_running_loop().create_task(self._recover(callback))
+                    self._recoveries.add(task)
+                    task.add_done_callback(self._recoveries.discard)
+
+    def record_failure(self) -> None:
+        self._consecutive_failures += 1
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self._consecutive_failures >= self.failure_threshold
+        ):
+            self._opened_at = time.monotonic()
+            self._transition(OPEN)
+
+    async def call(self, awaitable: Awaitable[T]) -> T:
+        try:
+            self.check()
+        except DependencyUnavailableError:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise
+        try:
+            result = await awaitable
+        except self.failures:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def _transition(self, state: str) -> None:
+        logger.warning("Circuit breaker state changed", breaker=self.name, state=state)
+        self.state = state
+        CIRCUIT_BREAKER_STATE.labels(breaker=self.name).set(_STATE_VALUES[state])
+        CIRCUIT_BREAKER_TRANSITIONS.labels(breaker=self.name, state=state).inc()
+
+    async def _recover(self, callback: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await callback()
+        except Exception:
+            logger.exception("Circuit breaker recovery hook failed", breaker=self.name)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import math
+import time
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.utils.exceptions import DeadlineExceededError
+
+T = TypeVar("T")
+
+# Absolute time.monotonic() by which the current request must be answered.
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "request_deadline", default=None
+)
+
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline, or ``None`` when there is none."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check() -> None:
+    if expired():
+        raise DeadlineExceededError()
+
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[None]:
+    """Run the block with at most ``seconds`` left; never extends an outer deadline."""
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(deadline if outer is None else min(outer, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def detached() -> Iterator[None]:
+    """Clear the deadline, e.g. around ``create_task`` for work that outlives the request."""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+async def bounded(awaitable: Awaitable[T], default: float | None = None) -> T:
+    """Await under the current deadline, tightened to ``default`` seconds if given.
+
+    Raises :class:`DeadlineExceededError` instead of letting the call run on after the
+    caller has given up.
+    """
+    left = remaining()
+    timeout = left if default is None else default if left is None else min(left, default)
+    if timeout is None:
+        return await awaitable
+    if timeout <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceededError()
+    try:
+        async with asyncio.timeout(timeout):
+            return await awaitable
+    except TimeoutError as exc:
+        raise DeadlineExceededError() from exc
+
+
+def _check_deadline(*_: Any) -> None:
+    check()
+
+
+def _set_statement_timeout(
+    session: Session, transaction: SessionTransaction, connection: Connection  # noqa: ARG001
+) -> None:
+    left = remaining()
+    if left is None or connection.dialect.name != "postgresql":
+        return
+    # Rounded up so the server gives up no earlier than the request does.
+    timeout_ms = max(1, math.ceil(left * 1000))
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
+def install_deadline_hooks(engine: Engine) -> None:
+    """Bound SQL by the request deadline; pass ``async_engine.sync_engine``.
+
+    A statement is refused once the deadline has passed. PostgreSQL transactions begun
+    under a deadline get ``SET LOCAL statement_timeout`` so the server cancels a slow
+    statement rather than holding the connection after the client has gone.
+    """
+    if event.contains(engine, "before_cursor_execute", _check_deadline):
+        return
+    event.listen(engine, "before_cursor_execute", _check_deadline)
+    event.listen(Session, "after_begin", _set_statement_timeout)
@@ -27,11 +27,54 @@ class RateLimitError(DomainError):
     message = "Too many requests"
 
 
+class IdempotencyInProgressError(ConflictError):
+    message = "A request with this Idempotency-Key is still being processed"
+
+
+class IdempotencyKeyReusedError(DomainError):
+    message = "Idempotency-Key was already used for a different request"
+
+
+class RebuildInProgressError(ConflictError):
+    message = "A snapshot rebuild is already running"
+
+
+class StreamCapacityError(DomainError):
+    message = "Too many open streams on this server, retry shortly"
+
+
+class OverloadedError(DomainError):
+    message = "Server is overloaded, retry shortly"
+
+
+class DeadlineExceededError(DomainError):
+    message = "Request deadline exceeded"
+
+
+class DependencyUnavailableError(DomainError):
+    message = "A required service is unavailable, retry shortly"
+
+
+class InvalidCursorError(DomainError):
+    message = "The cursor no longer exists; restart from the first page"
+
+
 HTTP_ERROR_MAP: dict[type[DomainError], tuple[int, str]] = {
     NotFoundError: (status.HTTP_404_NOT_FOUND, "resource_not_found"),
     UnauthorizedError: (status.HTTP_401_UNAUTHORIZED, "unauthorized"),
     ConflictError: (status.HTTP_409_CONFLICT, "conflict"),
     RateLimitError: (status.HTTP_429_TOO_MANY_REQUESTS, "rate_limited"),
+    IdempotencyInProgressError: (status.HTTP_409_CONFLICT, "idempotency_in_progress"),
+    RebuildInProgressError: (status.HTTP_409_CONFLICT, "rebuild_in_progress"),
+    StreamCapacityError: (status.HTTP_503_SERVICE_UNAVAILABLE, "stream_capacity"),
+    OverloadedError: (status.HTTP_503_SERVICE_UNAVAILABLE, "overloaded"),
+    DeadlineExceededError: (status.HTTP_504_GATEWAY_TIMEOUT, "deadline_exceeded"),
+    DependencyUnavailableError: (status.HTTP_503_SERVICE_UNAVAILABLE, "dependency_unavailable"),
+    IdempotencyKeyReusedError: (
+        status.HTTP_422_UNPROCESSABLE_ENTITY,
+        "idempotency_key_reused",
+    ),
+    InvalidCursorError: (status.HTTP_422_UNPROCESSABLE_ENTITY, "invalid_cursor"),
 }
 
 
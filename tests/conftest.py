@@ -1,13 +1,12 @@
-from collections import defaultdict
-
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
-from app.api.deps.common import get_redis, get_session
+from app.api.deps.common import get_cache_redis, get_redis, get_session
 from app.cache.redis_client import redis_client
-from app.db.session import Base
+from app.db.session import Base, get_session_factory
 from app.main import consumer, create_app, dispatcher, producer
+from benchmarks.fakes import InMemoryRedis
 
 
 class FakeAsyncComponent:
@@ -17,45 +16,7 @@ class FakeAsyncComponent:
     async def stop(self):
         return None
 
-
-class InMemoryRedis:
-    def __init__(self):
-        self.store = defaultdict(int)
-        self.hash_store = defaultdict(dict)
-
-    async def get(self, key):
-        return self.store.get(key)
-
-    async def set(self, key, value, ex=None):
-        self.store[key] = value
-
-    async def ttl(self, key):
-        return -1
-
-    def pipeline(self):
-        return self
-
-    def incr(self, key, amount):
-        self.store[key] = int(self.store.get(key, 0)) + amount
-        return self
-
-    def expire(self, key, ttl):
-        return self
-
-    async def execute(self):
-        return None
-
-    async def hincrby(self, name, key, amount):
-        self.hash_store[name][key] = int(self.hash_store[name].get(key, 0)) + amount
-        return self.hash_store[name][key]
-
-    async def hget(self, name, key):
-        return self.hash_store[name].get(key)
-
-    async def hset(self, name, key, value):
-        self.hash_store[name][key] = value
-
-    async def close(self):
+    async def ping(self):
         return None
 
 
@@ -79,6 +40,8 @@ def app(monkeypatch):
     monkeypatch.setattr(producer, "stop", FakeAsyncComponent().stop)
     monkeypatch.setattr(consumer, "start", FakeAsyncComponent().start)
     monkeypatch.setattr(consumer, "stop", FakeAsyncComponent().stop)
+    monkeypatch.setattr(producer, "ping", FakeAsyncComponent().ping)
+    monkeypatch.setattr(consumer, "ping", FakeAsyncComponent().ping)
     monkeypatch.setattr(dispatcher, "start", FakeAsyncComponent().start)
     monkeypatch.setattr(dispatcher, "stop", FakeAsyncComponent().stop)
 
@@ -98,10 +61,13 @@ def app(monkeypatch):
         return fake_redis
 
     monkeypatch.setattr(redis_client, "get_client", _get_client)
+    monkeypatch.setattr(redis_client, "get_bytes_client", _get_client)
 
     application = create_app()
     application.dependency_overrides[get_session] = _override_session
+    application.dependency_overrides[get_session_factory] = lambda: TestSession
     application.dependency_overrides[get_redis] = _override_redis
+    application.dependency_overrides[get_cache_redis] = _override_redis
     return application
 
 
@@ -20,3 +20,15 @@ def test_post_liked_schema():
         user_id="123e4567-e89b-12d3-a456-426614174111",
     )
     assert str(event.post_id) == "123e4567-e89b-12d3-a456-426614174000"
+    # Added later and optional, so events already in the topic still validate.
+    assert event.post_author_id is None
+
+
+def test_user_unfollowed_schema_is_registered():
+    event = schemas.EVENT_TOPIC_MAP["user.unfollowed"].model_validate(
+        {
+            "follower_id": "123e4567-e89b-12d3-a456-426614174000",
+            "followed_id": "123e4567-e89b-12d3-a456-426614174111",
+        }
+    )
+    assert isinstance(event, schemas.UserUnfollowedEvent)
@@ -1,4 +1,8 @@
 import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.api.deps.common import get_redis
+from app.main import producer
 
 
 @pytest.mark.integration
@@ -9,3 +13,40 @@ def test_health_endpoints(client):
 
     readiness = client.get("/health/readiness")
     assert readiness.status_code == 200
+    assert readiness.json()["checks"] == {"database": "ok", "redis": "ok", "kafka": "ok"}
+
+
+@pytest.mark.integration
+def test_readiness_reports_failing_dependency(client, monkeypatch):
+    async def _down():
+        raise ConnectionError("broker unreachable")
+
+    monkeypatch.setattr(producer, "ping", _down)
+    readiness = client.get("/health/readiness")
+    assert readiness.status_code == 503
+    body = readiness.json()
+    assert body["status"] == "not_ready"
+    assert body["checks"]["kafka"] == "error: ConnectionError"
+    assert body["checks"]["database"] == "ok"
+
+
+@pytest.mark.integration
+def test_readiness_reports_redis_outage_as_degraded(app, client):
+    class DownRedis:
+        async def ping(self):
+            raise RedisConnectionError("Connection refused")
+
+    app.dependency_overrides[get_redis] = DownRedis
+    readiness = client.get("/health/readiness")
+    assert readiness.status_code == 200
+    body = readiness.json()
+    assert body["status"] == "degraded"
+    assert body["checks"]["redis"] == "degraded: ConnectionError"
+    assert body["breakers"] == {"redis": "closed", "kafka": "closed"}
+
+
+@pytest.mark.integration
+def test_trending_route_is_not_shadowed_by_post_detail(client):
+    response = client.get("/posts/trending", params={"limit": 5})
+    assert response.status_code == 200
+    assert response.json() == {"items": []}
@@ -1,5 +1,10 @@
+import json
+
 import pytest
 
+from app.rate_limit.dependency import rate_limiter
+from app.utils.exceptions import RateLimitError
+
 
 @pytest.mark.integration
 def test_register_and_login_flow(client):
@@ -58,3 +63,251 @@ def test_register_and_login_flow(client):
     assert client.post(f"/follows/{target_id}", headers=headers).status_code == 204
     assert client.get(f"/follows/{target_id}/followers").status_code == 200
     assert client.delete(f"/follows/{target_id}", headers=headers).status_code == 204
+
+
+@pytest.mark.integration
+def test_idempotency_key_replays_write_responses(client):
+    payload = {"email": "retry@example.com", "username": "retry", "password": "Password123!"}
+    tokens = client.post("/auth/register", json=payload).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}", "Idempotency-Key": "k-1"}
+
+    first = client.post("/posts", json={"content": "only once"}, headers=headers)
+    retry = client.post("/posts", json={"content": "only once"}, headers=headers)
+    assert first.status_code == retry.status_code == 201
+    assert retry.content == first.content
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert client.get("/posts").json()["total"] == 1
+
+    reused = client.post("/posts", json={"content": "something else"}, headers=headers)
+    assert reused.status_code == 422
+    assert reused.json()["code"] == "idempotency_key_reused"
+
+    post_id = first.json()["id"]
+    like_headers = {**headers, "Idempotency-Key": "k-2"}
+    assert client.post(f"/posts/{post_id}/likes", headers=like_headers).status_code == 204
+    assert client.post(f"/posts/{post_id}/likes", headers=like_headers).status_code == 204
+    assert client.get(f"/posts/{post_id}/likes/count").json()["count"] == 1
+
+
+@pytest.mark.integration
+def test_idempotency_key_is_released_after_a_transient_error(app, client):
+    payload = {"email": "limited@example.com", "username": "limited", "password": "Password123!"}
+    tokens = client.post("/auth/register", json=payload).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}", "Idempotency-Key": "k-429"}
+    limited = iter([True])
+
+    async def _limit_once():
+        if next(limited, False):
+            raise RateLimitError()
+
+    app.dependency_overrides[rate_limiter] = _limit_once
+    first = client.post("/posts", json={"content": "later"}, headers=headers)
+    retry = client.post("/posts", json={"content": "later"}, headers=headers)
+    assert first.status_code == 429
+    assert retry.status_code == 201
+    assert "Idempotent-Replayed" not in retry.headers
+
+    missing = {**headers, "Idempotency-Key": "k-404"}
+    assert (
+        client.delete("/posts/00000000-0000-0000-0000-000000000000", headers=missing).status_code
+        == 404
+    )
+    replayed = client.delete("/posts/00000000-0000-0000-0000-000000000000", headers=missing)
+    assert replayed.status_code == 404
+    assert replayed.headers["Idempotent-Replayed"] == "true"
+
+
+@pytest.mark.integration
+def test_expand_author_embeds_deduplicated_profiles(client):
+    payload = {"email": "author@example.com", "username": "author", "password": "Password123!"}
+    tokens = client.post("/auth/register", json=payload).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    post_id = client.post("/posts", json={"content": "one"}, headers=headers).json()["id"]
+    client.post("/posts", json={"content": "two"}, headers=headers)
+    client.post(f"/posts/{post_id}/comments", json={"content": "self"}, headers=headers)
+
+    assert client.get("/posts").json()["authors"] is None
+    listing = client.get("/posts", params={"expand": "author"}).json()
+    assert len(listing["items"]) == 2
+    assert [author["username"] for author in listing["authors"]] == ["author"]
+
+    comments = client.get(f"/posts/{post_id}/comments", params={"expand": "author"}).json()
+    assert comments["authors"][0]["id"] == comments["items"][0]["author_id"]
+
+    client.patch("/users/me", json={"bio": "updated"}, headers=headers)
+    listing = client.get("/posts", params={"expand": "author"}).json()
+    assert listing["authors"][0]["bio"] == "updated"
+    assert client.get("/posts", params={"expand": "nope"}).status_code == 422
+
+
+@pytest.mark.integration
+def test_exports_stream_ndjson(client, monkeypatch):
+    from app.config.settings import settings
+
+    monkeypatch.setattr(settings, "export_batch_size", 2)
+    users = []
+    for name in ("exporter", "followed"):
+        payload = {"email": f"{name}@example.com", "username": name, "password": "Password123!"}
+        tokens = client.post("/auth/register", json=payload).json()
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        users.append((client.get("/users/me", headers=headers).json()["id"], headers))
+    (me, headers), (other, other_headers) = users
+    for i in range(5):
+        client.post("/posts", json={"content": f"post {i}"}, headers=headers)
+    client.post("/posts", json={"content": "not mine"}, headers=other_headers)
+    client.post(f"/follows/{other}", headers=headers)
+
+    response = client.get("/exports/posts", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["content"] for row in rows] == [f"post {i}" for i in range(5)]
+    assert {row["author_id"] for row in rows} == {me}
+
+    following = client.get("/exports/follows", headers=headers).text.splitlines()
+    assert [json.loads(line)["followed_id"] for line in following] == [other]
+    followers = client.get(
+        "/exports/follows", params={"user_id": other, "direction": "followers"}, headers=headers
+    )
+    assert followers.status_code == 401
+
+
+@pytest.mark.integration
+def test_liked_by_me_reflects_the_viewer(client):
+    payload = {"email": "viewer@example.com", "username": "viewer", "password": "Password123!"}
+    tokens = client.post("/auth/register", json=payload).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    liked = client.post("/posts", json={"content": "liked"}, headers=headers).json()["id"]
+    client.post("/posts", json={"content": "not liked"}, headers=headers)
+    client.post(f"/posts/{liked}/likes", headers=headers)
+
+    items = client.get("/posts", headers=headers).json()["items"]
+    assert {item["content"]: item["liked_by_me"] for item in items} == {
+        "liked": True,
+        "not liked": False,
+    }
+    assert client.get(f"/posts/{liked}", headers=headers).json()["liked_by_me"] is True
+    assert client.get(f"/posts/{liked}").json()["liked_by_me"] is False
+    feed = client.get("/feed", headers=headers).json()["items"]
+    assert [item["liked_by_me"] for item in feed if item["id"] == liked] == [True]
+
+
+@pytest.mark.integration
+def test_notifications_inbox_and_read_marker(client):
+    payload = {"email": "inbox@example.com", "username": "inbox", "password": "Password123!"}
+    tokens = client.post("/auth/register", json=payload).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    inbox = client.get("/notifications", params={"expand": "author"}, headers=headers)
+    assert inbox.status_code == 200
+    assert inbox.json() == {"items": [], "page": 1, "size": 20, "unread_count": 0, "actors": []}
+    assert client.post("/notifications/read", headers=headers).status_code == 204
+    assert client.get("/notifications").status_code == 401
+
+    missing = "123e4567-e89b-12d3-a456-426614174000"
+    assert client.post(f"/posts/{missing}/likes", headers=headers).status_code == 404
+
+
+@pytest.mark.integration
+def test_conditional_get_returns_304_until_the_post_changes(client):
+    payload = {"email": "etag@example.com", "username": "etag", "password": "Password123!"}
+    tokens = client.post("/auth/register", json=payload).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    post_id = client.post("/posts", json={"content": "cache me"}, headers=headers).json()["id"]
+
+    first = client.get(f"/posts/{post_id}", headers=headers)
+    etag = first.headers["etag"]
+    assert first.headers["vary"] == "Authorization"
+    again = client.get(f"/posts/{post_id}", headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    # liked_by_me differs per viewer, so an anonymous copy has its own ETag.
+    assert client.get(f"/posts/{post_id}", headers={"If-None-Match": etag}).status_code == 200
+
+    listing = client.get("/posts", headers=headers)
+    feed = client.get("/feed", headers=headers)
+    client.post(f"/posts/{post_id}/likes", headers=headers)
+    changed = client.get(f"/posts/{post_id}", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["like_count"] == 1
+    assert changed.headers["etag"] != etag
+    for path, previous in (("/posts", listing), ("/feed", feed)):
+        conditional = {**headers, "If-None-Match": previous.headers["etag"]}
+        assert client.get(path, headers=conditional).status_code == 200
+
+    # Activity on posts that are not on the page leaves its ETag alone.
+    author_id = client.get("/users/me", headers=headers).json()["id"]
+    own = client.get("/posts", params={"author_id": author_id}, headers=headers)
+    feed = client.get("/feed", headers=headers)
+    other = {"email": "etag2@example.com", "username": "etag2", "password": "Password123!"}
+    other_token = client.post("/auth/register", json=other).json()["access_token"]
+    other_headers = {"Authorization": f"Bearer {other_token}"}
+    other_post = client.post("/posts", json={"content": "unrelated"}, headers=other_headers)
+    client.post(f"/posts/{other_post.json()['id']}/likes", headers=other_headers)
+    for path, params, previous in (
+        ("/posts", {"author_id": author_id}, own),
+        ("/feed", {}, feed),
+    ):
+        conditional = {**headers, "If-None-Match": previous.headers["etag"]}
+        assert client.get(path, params=params, headers=conditional).status_code == 304
+
+
+@pytest.mark.integration
+def test_listings_ignore_if_modified_since(client):
+    payload = {"email": "ims@example.com", "username": "ims", "password": "Password123!"}
+    tokens = client.post("/auth/register", json=payload).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    post_ids = [
+        client.post("/posts", json={"content": f"post {i}"}, headers=headers).json()["id"]
+        for i in range(4)
+    ]
+    listing = client.get("/posts", params={"size": 3}, headers=headers)
+    assert "last-modified" not in listing.headers
+
+    # Deleting the newest post pulls an older, unchanged one onto the page; no version the
+    # page is built from changes, so a date cannot tell the copies apart.
+    assert client.delete(f"/posts/{post_ids[-1]}", headers=headers).status_code == 204
+    since = {**headers, "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    fresh = client.get("/posts", params={"size": 3}, headers=since)
+    assert fresh.status_code == 200
+    assert [item["id"] for item in fresh.json()["items"]] == post_ids[-2::-1]
+    assert client.get("/feed", headers=since).status_code == 200
+
+
+@pytest.mark.integration
+def test_posts_and_comments_page_by_id_cursor(client):
+    payload = {"email": "cursor@example.com", "username": "cursor", "password": "Password123!"}
+    tokens = client.post("/auth/register", json=payload).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    author_id = client.get("/users/me", headers=headers).json()["id"]
+    post_ids = [
+        client.post("/posts", json={"content": f"post {i}"}, headers=headers).json()["id"]
+        for i in range(3)
+    ]
+    params = {"author_id": author_id, "size": 2}
+    first = client.get("/posts", params=params).json()["items"]
+    assert [item["id"] for item in first] == post_ids[:0:-1]
+    rest = client.get("/posts", params={**params, "before": first[-1]["id"]}).json()["items"]
+    assert [item["id"] for item in rest] == post_ids[:1]
+
+    comment_ids = [
+        client.post(
+            f"/posts/{post_ids[0]}/comments", json={"content": f"c{i}"}, headers=headers
+        ).json()["id"]
+        for i in range(3)
+    ]
+    older = client.get(f"/posts/{post_ids[0]}/comments", params={"before": comment_ids[1]})
+    assert [item["id"] for item in older.json()["items"]] == comment_ids[:1]
+    assert client.get("/posts", params={"before": "not-a-uuid"}).status_code == 422
+
+    # A cursor deleted between two page requests is an error, not an empty last page.
+    assert client.delete(f"/comments/{comment_ids[1]}", headers=headers).status_code == 204
+    gone = client.get(f"/posts/{post_ids[0]}/comments", params={"before": comment_ids[1]})
+    assert gone.status_code == 422
+    assert gone.json()["code"] == "invalid_cursor"
+    other_post = client.get(f"/posts/{post_ids[1]}/comments", params={"before": comment_ids[0]})
+    assert other_post.status_code == 422
+    assert client.delete(f"/posts/{first[-1]['id']}", headers=headers).status_code == 204
+    assert client.get("/posts", params={"before": first[-1]["id"]}).status_code == 422
@@ -1,6 +1,13 @@
+import asyncio
+
 import pytest
 
+from app.cache.client_cache import ClientSideCache
+from app.cache.counters import _member_hash, jump_hash
+from app.cache.pipelining import AutoPipeline
+from app.cache.read_through import ReadThroughCache
 from app.cache.redis_client import redis_client
+from app.config.settings import settings
 
 
 class DummyRedis:
@@ -15,7 +22,8 @@ class DummyRedis:
 async def test_redis_client_lifecycle(monkeypatch):
     dummy = DummyRedis()
 
-    def fake_from_url(url, decode_responses=True):  # noqa: ARG001
+    def fake_from_url(url, decode_responses=True, **options):  # noqa: ARG001
+        assert options["max_connections"] == settings.redis_max_connections
         return dummy
 
     monkeypatch.setattr("app.cache.redis_client.aioredis.from_url", fake_from_url)
@@ -28,3 +36,207 @@ async def test_redis_client_lifecycle(monkeypatch):
 
     await redis_client.close()
     assert dummy.closed
+
+
+class CountingRedis:
+    """Counts network round trips; a pipeline execute is one regardless of its size."""
+
+    def __init__(self) -> None:
+        self.hashes = {"h": {"a": "1", "b": "2"}}
+        self.round_trips = 0
+
+    def _hmget(self, name, keys):
+        return [self.hashes.get(name, {}).get(key) for key in keys]
+
+    async def hmget(self, name, keys):
+        self.round_trips += 1
+        return self._hmget(name, keys)
+
+    async def get(self, key):  # noqa: ARG002
+        self.round_trips += 1
+        return None
+
+    def pipeline(self, transaction=True):  # noqa: ARG002
+        return CountingPipeline(self)
+
+
+class CountingPipeline:
+    def __init__(self, redis: CountingRedis) -> None:
+        self.redis = redis
+        self.ops: list = []
+
+    def hmget(self, name, keys):
+        self.ops.append(self.redis._hmget(name, keys))
+
+    def get(self, key):  # noqa: ARG002
+        self.ops.append(None)
+
+    async def execute(self, raise_on_error=True):  # noqa: ARG002
+        self.redis.round_trips += 1
+        return self.ops
+
+
+@pytest.mark.asyncio
+async def test_auto_pipeline_merges_concurrent_commands():
+    redis = CountingRedis()
+    auto = AutoPipeline(redis)
+
+    first, second, missing = await asyncio.gather(
+        auto.hmget("h", ["a"]), auto.hmget("h", ["b"]), auto.get("nope")
+    )
+    assert (first, second, missing) == (["1"], ["2"], None)
+    assert redis.round_trips == 1
+
+    assert await auto.hmget("h", ["a", "b"]) == ["1", "2"]
+    assert redis.round_trips == 2
+    await auto.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_side_cache_serves_hits_until_invalidated():
+    redis = CountingRedis()
+    cache = ClientSideCache(["h"], max_entries=10)
+    cache._tracking = True
+
+    assert await cache.hmget(redis, "h", ["a", "b"]) == ["1", "2"]
+    assert await cache.hmget(redis, "h", ["a", "b"]) == ["1", "2"]
+    assert redis.round_trips == 1 and cache.hits == 2
+
+    redis.hashes["h"]["a"] = "5"
+    cache.on_message([b"message", b"__redis__:invalidate", [b"h"]])
+    assert await cache.hmget(redis, "h", ["a"]) == ["5"]
+    assert redis.round_trips == 2
+
+    # Keys outside the tracked prefixes always go to Redis.
+    await cache.hmget(redis, "other", ["a"])
+    await cache.hmget(redis, "other", ["a"])
+    assert redis.round_trips == 4
+
+
+class ScriptedConnection:
+    def __init__(self, replies: list[object]) -> None:
+        self.replies = replies
+        self.sent: list[tuple[object, ...]] = []
+
+    async def send_command(self, *args, check_health=True):  # noqa: ARG002
+        self.sent.append(args)
+
+    async def read_response(self, timeout=None):  # noqa: ARG002
+        if not self.replies:
+            raise ConnectionError("closed")
+        return self.replies.pop(0)
+
+
+class ScriptedPool:
+    def __init__(self, listener: ScriptedConnection, tracker: ScriptedConnection) -> None:
+        self.connections = [listener, tracker]
+        self.disconnected = False
+
+    async def get_connection(self, command_name):  # noqa: ARG002
+        return self.connections.pop(0)
+
+    async def disconnect(self):
+        self.disconnected = True
+
+
+@pytest.mark.asyncio
+async def test_client_side_cache_tracks_through_a_redirected_subscription(monkeypatch):
+    listener = ScriptedConnection(
+        [
+            42,
+            [b"subscribe", b"__redis__:invalidate", 1],
+            [b"message", b"__redis__:invalidate", [b"h"]],
+            None,
+            [b"pong", b""],
+        ]
+    )
+    tracker = ScriptedConnection([b"OK", b"PONG"])
+    pool = ScriptedPool(listener, tracker)
+    monkeypatch.setattr(
+        "app.cache.client_cache.aioredis.ConnectionPool.from_url",
+        lambda url, **options: pool,  # noqa: ARG005
+    )
+    cache = ClientSideCache(["h", "p:"], max_entries=10)
+    cache._put("h", "a", "1")
+
+    with pytest.raises(ConnectionError):
+        await cache._track()
+
+    assert listener.sent == [("CLIENT", "ID"), ("SUBSCRIBE", "__redis__:invalidate"), ("PING",)]
+    assert tracker.sent == [
+        ("CLIENT", "TRACKING", "ON", "REDIRECT", 42, "BCAST", "PREFIX", "h", "PREFIX", "p:"),
+        ("PING",),
+    ]
+    # Anything cached before tracking started may be stale, so it is all dropped.
+    assert not cache._entries
+    assert pool.disconnected
+
+
+def test_jump_hash_moves_few_members_when_growing():
+    members = [_member_hash(f"post-{i}") for i in range(2000)]
+    before = [jump_hash(m, 16) for m in members]
+    after = [jump_hash(m, 17) for m in members]
+    assert set(before) == set(range(16))
+    moved = sum(b != a for b, a in zip(before, after))
+    assert all(a == 16 for b, a in zip(before, after) if b != a)
+    assert moved < len(members) * 0.1
+
+
+class KeyValueRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, object] = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):  # noqa: ARG002
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+
+@pytest.mark.asyncio
+async def test_read_through_cache_computes_a_cold_key_once():
+    redis = KeyValueRedis()
+    cache = ReadThroughCache("test", ttl=60)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"n": calls}
+
+    results = await asyncio.gather(*(cache.get(redis, "k", compute) for _ in range(10)))
+    assert calls == 1
+    assert results == [{"n": 1}] * 10
+    assert "k:lock" not in redis.values
+
+
+@pytest.mark.asyncio
+async def test_read_through_cache_serves_stale_while_one_caller_refreshes():
+    redis = KeyValueRedis()
+    cache = ReadThroughCache("test", ttl=0, stale_seconds=30, beta=0)
+    release = asyncio.Event()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            await release.wait()
+        return calls
+
+    assert await cache.get(redis, "k", compute) == 1
+    # Expired: the first reader takes the refresh, the others get the stale value.
+    refresh = asyncio.create_task(cache.get(redis, "k", compute))
+    await asyncio.sleep(0)
+    assert await asyncio.gather(*(cache.get(redis, "k", compute) for _ in range(5))) == [1] * 5
+    release.set()
+    assert await refresh == 2
+    assert calls == 2
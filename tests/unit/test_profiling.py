@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+import pytest
+
+from app.observability import profiling
+from app.observability.metrics import EVENT_LOOP_LAG_LAST
+
+
+def _busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_profile_event_loop_sees_blocking_code():
+    task = asyncio.create_task(profiling.profile_event_loop(0.2, 0.002))
+    await asyncio.sleep(0.01)
+    _busy_wait(0.1)
+    profile = await task
+
+    assert profile.samples > 0
+    frames = [item["frame"] for item in profile.to_dict()["top_frames"]]
+    assert any("_busy_wait" in frame for frame in frames)
+
+
+@pytest.mark.asyncio
+async def test_slow_request_middleware_captures_profile(monkeypatch):
+    monkeypatch.setattr(profiling.settings, "profiling_slow_request_ms", 10)
+    profiling.slow_request_profiles.clear()
+
+    async def slow_app(scope, receive, send):
+        await asyncio.sleep(0.02)
+        _busy_wait(0.05)
+
+    middleware = profiling.SlowRequestProfilerMiddleware(slow_app)
+    await middleware({"type": "http", "method": "GET", "path": "/slow"}, None, None)
+
+    assert len(profiling.slow_request_profiles) == 1
+    captured = profiling.slow_request_profiles[0]
+    assert captured["context"]["path"] == "/slow"
+    assert captured["samples"] > 0
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_reports_blocking():
+    monitor = profiling.LoopLagMonitor(0.01)
+    await monitor.start()
+    await asyncio.sleep(0.015)
+    _busy_wait(0.05)
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+    assert EVENT_LOOP_LAG_LAST._value.get() > 0
+
+
+def test_profile_endpoints_require_admin(client):
+    payload = {"email": "nonadmin@example.com", "username": "nonadmin", "password": "Password123!"}
+    token = client.post("/auth/register", json=payload).json()["access_token"]
+    response = client.post(
+        "/admin/profile", params={"seconds": 0.01}, headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 401
@@ -0,0 +1,63 @@
+import uuid
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.session import Base
+from app.observability import queries
+from app.observability.metrics import DB_QUERY_BUDGET_EXCEEDED
+from app.repositories.likes import LikeRepository
+from app.repositories.posts import PostRepository
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    queries.install_query_hooks(engine.sync_engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    async with Session() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_queries_are_labelled_by_repository_method(session):
+    with queries.track_queries() as stats:
+        await PostRepository(session).list(None, 10, 0)
+        await LikeRepository(session).count(uuid.uuid4())
+
+    assert stats.count == 3
+    assert stats.operations["PostRepository.list"] == 2
+    assert stats.operations["LikeRepository.count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_statements_flag_n_plus_one(session, monkeypatch):
+    monkeypatch.setattr(queries.settings, "query_repeat_threshold", 3)
+    likes = LikeRepository(session)
+    with queries.track_queries() as stats:
+        for _ in range(4):
+            await likes.count(uuid.uuid4())
+
+    repeated = stats.repeated(3)
+    assert len(repeated) == 1 and repeated[0][1] == 4
+
+    before = DB_QUERY_BUDGET_EXCEEDED.labels(route="/posts")._value.get()
+    queries.report_query_stats(stats, "/posts")
+    assert DB_QUERY_BUDGET_EXCEEDED.labels(route="/posts")._value.get() == before + 1
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_leave_no_timing_state_behind(session):
+    with queries.track_queries() as stats:
+        async with session.bind.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(DBAPIError):
+                    await conn.exec_driver_sql("SELECT * FROM missing_table")
+            await conn.exec_driver_sql("SELECT 1")
+            assert "query_started" not in conn.info
+
+    assert stats.count == 1
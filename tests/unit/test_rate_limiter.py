@@ -1,8 +1,21 @@
+import asyncio
+
 import pytest
 from fastapi import Request
+from redis.exceptions import ConnectionError as RedisConnectionError
 
+from app.config.settings import settings
+from app.rate_limit.concurrency import (
+    CRITICAL,
+    HIGH,
+    LOW,
+    NORMAL,
+    AIMDLimiter,
+    ConcurrencyLimitMiddleware,
+    route_priority,
+)
 from app.rate_limit.dependency import rate_limiter
-from app.utils.exceptions import RateLimitError
+from app.utils.exceptions import DependencyUnavailableError, RateLimitError
 
 
 class FakePipeline:
@@ -52,3 +65,72 @@ async def test_rate_limiter_blocks_after_threshold():
     await rate_limiter(request=request, redis=redis, requests_per_window=1, window_seconds=60)
     with pytest.raises(RateLimitError):
         await rate_limiter(request=request, redis=redis, requests_per_window=1, window_seconds=60)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_fails_open_when_redis_is_down(monkeypatch):
+    class DownRedis:
+        async def ttl(self, key):
+            raise RedisConnectionError("Connection refused")
+
+    request = Request({"client": ("127.0.0.1", 1234), "type": "http", "path": "/posts"})
+    await rate_limiter(request=request, redis=DownRedis())
+
+    monkeypatch.setattr(settings, "rate_limit_fail_open", False)
+    with pytest.raises(DependencyUnavailableError):
+        await rate_limiter(request=request, redis=DownRedis())
+
+
+def test_aimd_limiter_grows_under_load_and_backs_off_on_slow_responses():
+    limiter = AIMDLimiter(10, min_limit=2, max_limit=12, target_latency=0.1, backoff=0.5)
+    assert route_priority("/health/live") == CRITICAL
+    assert route_priority("/auth/login") == HIGH
+    assert route_priority("/feed") == LOW and route_priority("/feed/stream") == CRITICAL
+    assert route_priority("/posts") == NORMAL
+
+    # Low priority traffic only gets 70% of the limit; auth may still use the rest.
+    assert all(limiter.try_acquire(LOW) for _ in range(7))
+    assert not limiter.try_acquire(LOW)
+    assert limiter.try_acquire(HIGH)
+
+    limiter.observe(0.01)
+    assert limiter.limit == pytest.approx(10.1)
+    limiter.observe(1.0)
+    assert limiter.limit == pytest.approx(5.05)
+    # A burst of slow responses is one congestion signal, not one per response.
+    limiter.observe(1.0, failed=True)
+    assert limiter.limit == pytest.approx(5.05)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_middleware_sheds_with_retry_after():
+    limiter = AIMDLimiter(1, min_limit=1, max_limit=1, target_latency=1.0, backoff=0.5)
+    started = asyncio.Event()
+    finish = asyncio.Event()
+
+    async def app(scope, receive, send):  # noqa: ARG001
+        started.set()
+        await finish.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    middleware = ConcurrencyLimitMiddleware(app, limiter)
+    sent: list[dict] = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    scope = {"type": "http", "method": "GET", "path": "/posts", "headers": []}
+    slow = asyncio.create_task(middleware(scope, receive, send))
+    await started.wait()
+    await middleware(scope, receive, send)
+    assert sent[0]["status"] == 503
+    assert (b"retry-after", b"1") in sent[0]["headers"]
+
+    finish.set()
+    await slow
+    assert sent[-2]["status"] == 200
+    assert limiter.in_flight == 0
@@ -1,16 +1,40 @@
-from collections import defaultdict
+import json
+import time
 
 import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from app.cache.counters import CounterStore, follower_counter, following_counter
+from app.cache.idempotency import IdempotencyStore, StoredResponse
+from app.cache.notifications import DUE_KEY, notification_store
+from app.cache.trending import EPOCH_KEY, TrendingStore, trending_store
 from app.db.session import Base
+from app.domain.schemas.comments import CommentCreate
 from app.domain.schemas.posts import PostCreate
+from app.events import dispatcher as dispatcher_module
+from app.events.broadcaster import FeedBroadcaster
+from app.events.consumer import KafkaEventConsumer
+from app.events.dispatcher import OutboxDispatcher
+from app.repositories.comments import CommentRepository
+from app.repositories.outbox import OutboxRepository
 from app.repositories.users import UserRepository
 from app.services.auth_service import AuthService
+from app.services.comment_service import CommentService, first_page_cache_key
 from app.services.feed_service import FeedService
 from app.services.follow_service import FollowService
+from app.services.notification_service import NotificationService
 from app.services.post_service import PostService
-from app.utils.exceptions import ConflictError
+from app.services.profiles import ProfileReader
+from app.services.rebuild_service import CHECKPOINT_KEY, LOCK_KEY, SnapshotRebuilder
+from app.services.suggestion_service import SuggestionService, suggestions_key
+from app.utils.exceptions import (
+    ConflictError,
+    DependencyUnavailableError,
+    RebuildInProgressError,
+    StreamCapacityError,
+)
+from benchmarks.fakes import InMemoryRedis
 
 
 @pytest.fixture
@@ -31,27 +55,17 @@ async def _create_user(session, email: str, username: str):
     return await repo.get_by_username(username)
 
 
-class FakeRedis:
-    def __init__(self) -> None:
-        self.store: dict[str, str] = {}
-        self.hash_store: dict[str, dict[str, int]] = defaultdict(dict)
+def _session_factory(session):
+    """Stand-in for ``async_sessionmaker`` that hands out the test's session."""
 
-    async def get(self, key: str):
-        return self.store.get(key)
+    class _SessionFactory:
+        async def __aenter__(self):
+            return session
 
-    async def set(self, key: str, value: str, ex: int | None = None):  # noqa: ARG002
-        self.store[key] = value
+        async def __aexit__(self, *exc):
+            return None
 
-    async def hincrby(self, name: str, key: str, amount: int):
-        self.hash_store[name][key] = int(self.hash_store[name].get(key, 0)) + amount
-        return self.hash_store[name][key]
-
-    async def hget(self, name: str, key: str):
-        value = self.hash_store[name].get(key)
-        return str(value) if value is not None else None
-
-    async def hset(self, name: str, key: str, value: int):
-        self.hash_store[name][key] = value
+    return _SessionFactory
 
 
 @pytest.mark.asyncio
@@ -60,15 +74,27 @@ async def test_follow_service_flow(session):
     followed = await _create_user(session, "beta@example.com", "beta")
     service = FollowService(session)
 
+    redis = InMemoryRedis()
+    consumer = KafkaEventConsumer(_session_factory(session))
+    event = {"follower_id": str(follower.id), "followed_id": str(followed.id)}
+
     await service.follow(str(follower.id), str(followed.id))
-    items, total = await service.list_followers(str(followed.id), page=1, size=10)
+    # Not cached yet: read through from the database, so the event must not add to it.
+    await consumer._handle_message(redis, "user.followed", event)
+    items, total = await service.list_followers(str(followed.id), page=1, size=10, redis=redis)
     assert total == 1
     assert items[0].follower_id == follower.id
+    _, following = await service.list_following(str(follower.id), page=1, size=10, redis=redis)
+    assert following == 1
 
     await service.unfollow(str(follower.id), str(followed.id))
-    items, total = await service.list_followers(str(followed.id), page=1, size=10)
+    pending = await OutboxRepository(session).claim_pending()
+    assert [entry.topic for entry in pending][-1] == "user.unfollowed"
+    await consumer._handle_message(redis, "user.unfollowed", event)
+    items, total = await service.list_followers(str(followed.id), page=1, size=10, redis=redis)
     assert total == 0
     assert items == []
+    assert await following_counter.get(redis, str(follower.id)) == 0
 
 
 @pytest.mark.asyncio
@@ -83,7 +109,7 @@ async def test_follow_service_prevents_self_follow(session):
 async def test_post_service_like_flow(session):
     user = await _create_user(session, "gamma@example.com", "gamma")
     service = PostService(session)
-    redis = FakeRedis()
+    redis = InMemoryRedis()
 
     post = await service.create_post(str(user.id), PostCreate(content="hello world"), redis)
     assert post.content == "hello world"
@@ -96,6 +122,25 @@ async def test_post_service_like_flow(session):
     assert await service.count_likes(str(post.id), redis) == 0
 
 
+@pytest.mark.asyncio
+async def test_likes_leave_a_cold_counter_to_the_database(session):
+    service = PostService(session)
+    redis = InMemoryRedis()
+    author = await _create_user(session, "kappa@example.com", "kappa")
+    post_id = str((await service.create_post(str(author.id), PostCreate(content="hi"), redis)).id)
+    fans = [await _create_user(session, f"fan{i}@example.com", f"fan{i}") for i in range(4)]
+    for fan in fans[:3]:
+        await service.like_post(post_id, str(fan.id), redis)
+
+    redis.hash_store.clear()
+    await service.like_post(post_id, str(fans[3].id), redis)
+    assert await service.count_likes(post_id, redis) == 4
+
+    redis.hash_store.clear()
+    await service.unlike_post(post_id, str(fans[0].id), redis)
+    assert await service.count_likes(post_id, redis) == 3
+
+
 @pytest.mark.asyncio
 async def test_feed_service_returns_cached_posts(session):
     follower = await _create_user(session, "delta@example.com", "delta")
@@ -104,7 +149,7 @@ async def test_feed_service_returns_cached_posts(session):
     await follow_service.follow(str(follower.id), str(followed.id))
 
     post_service = PostService(session)
-    redis = FakeRedis()
+    redis = InMemoryRedis()
     await post_service.create_post(str(followed.id), PostCreate(content="feed post"), redis)
 
     feed_service = FeedService(session)
@@ -113,6 +158,91 @@ async def test_feed_service_returns_cached_posts(session):
     cached_items = await feed_service.get_feed(str(follower.id), page=1, size=10, redis=redis)
     assert cached_items == items
 
+    def pages():
+        return {key for key in redis.store if key.startswith(f"feed:{follower.id}:1:")}
+
+    cached = pages()
+    # A post by someone the follower does not follow leaves the cached page in place.
+    await post_service.create_post(str(follower.id), PostCreate(content="elsewhere"), redis)
+    await feed_service.get_feed(str(follower.id), page=1, size=10, redis=redis)
+    assert pages() == cached
+    await post_service.create_post(str(followed.id), PostCreate(content="second"), redis)
+    items = await feed_service.get_feed(str(follower.id), page=1, size=10, redis=redis)
+    assert items[0]["content"] == "second"
+    assert len(pages()) == len(cached) + 1
+
+
+class DownRedis:
+    """Every command fails as if Redis were unreachable."""
+
+    def __getattr__(self, name):
+        async def command(*args, **kwargs):  # noqa: ARG001
+            raise RedisConnectionError("Connection refused")
+
+        return command
+
+    def pipeline(self, transaction=True):  # noqa: ARG002
+        return DownPipeline()
+
+
+class DownPipeline:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self  # noqa: ARG005
+
+    async def execute(self, raise_on_error=True):  # noqa: ARG002
+        raise RedisConnectionError("Connection refused")
+
+
+@pytest.mark.asyncio
+async def test_posts_and_feed_fall_back_to_the_database_without_redis(session):
+    follower = await _create_user(session, "down1@example.com", "down1")
+    author = await _create_user(session, "down2@example.com", "down2")
+    await FollowService(session).follow(str(follower.id), str(author.id))
+    redis = DownRedis()
+
+    posts = PostService(session)
+    post = await posts.create_post(str(author.id), PostCreate(content="no cache"), redis)
+    await posts.like_post(str(post.id), str(follower.id), redis)
+    assert await posts.count_likes(str(post.id), redis) == 1
+
+    items = await FeedService(session).get_feed(str(follower.id), page=1, size=10, redis=redis)
+    assert [(item["content"], item["like_count"]) for item in items] == [("no cache", 1)]
+
+
+@pytest.mark.asyncio
+async def test_comment_writes_commit_once_without_redis(session):
+    user = await _create_user(session, "down3@example.com", "down3")
+    redis = DownRedis()
+    post = await PostService(session).create_post(str(user.id), PostCreate(content="hi"), redis)
+    comments = CommentService(session)
+
+    comment = await comments.add_comment(
+        str(post.id), str(user.id), CommentCreate(content="kept"), redis
+    )
+    await comments.delete_comment(str(comment.id), str(user.id), False, redis)
+    assert await CommentRepository(session).list_for_post(str(post.id), 10, 0) == []
+
+
+@pytest.mark.asyncio
+async def test_reads_degrade_without_redis(session):
+    reader = await _create_user(session, "down4@example.com", "down4")
+    author = await _create_user(session, "down5@example.com", "down5")
+    await FollowService(session).follow(str(reader.id), str(author.id))
+    redis = DownRedis()
+    post = await PostService(session).create_post(str(author.id), PostCreate(content="hi"), redis)
+    comments = CommentService(session)
+    await comments.add_comment(str(post.id), str(reader.id), CommentCreate(content="c"), redis)
+
+    items, total = await comments.list_comments(str(post.id), page=1, size=10, redis=redis)
+    assert (len(items), total) == (1, 1)
+    profiles = await ProfileReader(session).load([str(author.id)], redis)
+    assert [(p.username, p.follower_count) for p in profiles] == [("down5", 1)]
+    # Rankings and suggestions only exist in Redis: empty rather than an error.
+    assert await PostService(session).trending(10, redis) == []
+    assert await SuggestionService(session).suggest(str(reader.id), 10, redis) == []
+    with pytest.raises(DependencyUnavailableError):
+        await NotificationService().inbox(str(author.id), 1, 10, redis)
+
 
 @pytest.mark.asyncio
 async def test_auth_service_refresh_token(session):
@@ -127,3 +257,332 @@ async def test_auth_service_refresh_token(session):
     assert rotated.refresh_token != tokens.refresh_token
     # ensure original user still resolvable
     assert user.email == "zeta@example.com"
+
+
+@pytest.mark.asyncio
+async def test_comment_counts_and_first_page_cache(session):
+    user = await _create_user(session, "eta@example.com", "eta")
+    redis = InMemoryRedis()
+    post = await PostService(session).create_post(str(user.id), PostCreate(content="hi"), redis)
+    post_id = str(post.id)
+    comments = CommentService(session)
+
+    first = await comments.add_comment(post_id, str(user.id), CommentCreate(content="one"), redis)
+    await comments.add_comment(post_id, str(user.id), CommentCreate(content="two"), redis)
+    items, total = await comments.list_comments(post_id, page=1, size=10, redis=redis)
+    assert total == 2
+    assert len(items) == 2
+    assert first_page_cache_key(post_id) in redis.store
+
+    await comments.delete_comment(str(first.id), str(user.id), False, redis)
+    assert first_page_cache_key(post_id) not in redis.store
+    consumer = KafkaEventConsumer(_session_factory(session))
+    await consumer._handle_message(
+        redis, "comment.deleted", {"comment_id": str(first.id), "post_id": post_id}
+    )
+    counts = await PostService(session).hydrate_counts([post_id], redis)
+    assert counts[post_id] == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_comment_events_keep_counts_exact_after_a_backfill(session):
+    user = await _create_user(session, "theta@example.com", "theta")
+    redis = InMemoryRedis()
+    post = await PostService(session).create_post(str(user.id), PostCreate(content="hi"), redis)
+    post_id = str(post.id)
+    comments = CommentService(session)
+    created = [
+        await comments.add_comment(post_id, str(user.id), CommentCreate(content=str(i)), redis)
+        for i in range(6)
+    ]
+    pending = await OutboxRepository(session).claim_pending()
+    last = [entry for entry in pending if entry.topic == "comment.created"][-1]
+
+    # A read between the commit and the event backfills a count that already includes it.
+    redis.hash_store.clear()
+    assert (await PostService(session).hydrate_counts([post_id], redis))[post_id] == (0, 6)
+    consumer = KafkaEventConsumer(_session_factory(session))
+    await consumer._handle_message(redis, "comment.created", json.loads(last.payload))
+    counts = await PostService(session).hydrate_counts([post_id], redis)
+    assert counts[post_id] == (0, 6)
+
+    await comments.delete_comment(str(created[0].id), str(user.id), False, redis)
+    redis.hash_store.clear()
+    await consumer._handle_message(
+        redis, "comment.deleted", {"comment_id": str(created[0].id), "post_id": post_id}
+    )
+    counts = await PostService(session).hydrate_counts([post_id], redis)
+    assert counts[post_id] == (0, 5)
+
+
+@pytest.mark.asyncio
+async def test_counter_store_shards_and_bulk_reads():
+    redis = InMemoryRedis()
+    store = CounterStore("test:counts", shards=8)
+    members = [f"post-{i}" for i in range(40)]
+    for i, member in enumerate(members):
+        await store.incr(redis, member, i)
+    assert len(redis.hash_store) > 1
+    assert all(key.startswith("test:counts:") for key in redis.hash_store)
+
+    values = await store.get_many(redis, members + ["unknown"])
+    assert values["post-7"] == 7 and values["unknown"] is None
+    assert await store.incr(redis, "post-1", -5) == 0
+
+    async def loader(ids):
+        return {member: 99 for member in ids}
+
+    counts = await store.read_through(redis, ["post-3", "fresh"], loader)
+    assert counts == {"post-3": 3, "fresh": 99}
+    assert await store.get(redis, "fresh") == 99
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_publishes_claimed_outbox_batch(session, monkeypatch):
+    await _create_user(session, "theta@example.com", "theta")
+    published = []
+
+    async def fake_publish(topic, payload):
+        published.append((topic, payload))
+
+    monkeypatch.setattr(dispatcher_module.producer, "publish", fake_publish)
+
+    class _SessionFactory:
+        async def __aenter__(self):
+            return session
+
+        async def __aexit__(self, *exc):
+            return None
+
+    dispatcher = OutboxDispatcher(_SessionFactory)
+    assert await dispatcher.dispatch_batch() == 1
+    assert published[0][0] == "user.created"
+    assert await OutboxRepository(session).claim_pending() == []
+
+
+@pytest.mark.asyncio
+async def test_suggestions_rank_mutuals_and_refresh_incrementally(session):
+    alice, bob, carol, dave, erin, frank = [
+        await _create_user(session, f"{name}@example.com", name)
+        for name in ("alice", "bob", "carol", "dave", "erin", "frank")
+    ]
+    follows = FollowService(session)
+    for follower, followed in [
+        (alice, bob),
+        (alice, dave),
+        (bob, carol),
+        (dave, carol),
+        (bob, dave),
+        (carol, frank),
+        (erin, alice),
+    ]:
+        await follows.follow(str(follower.id), str(followed.id))
+    redis = InMemoryRedis()
+    service = SuggestionService(session)
+    consumer = KafkaEventConsumer(_session_factory(session))
+
+    suggested = await service.suggest(str(alice.id), 10, redis)
+    assert [(s.username, s.mutual_count) for s in suggested] == [("carol", 2)]
+    erin_key = suggestions_key(str(erin.id))
+    await service.suggest(str(erin.id), 10, redis)
+    assert redis.zsets[erin_key] == {str(bob.id): 1.0, str(dave.id): 1.0}
+
+    # alice follows carol: carol leaves alice's list, carol's followees join it, and erin
+    # (who follows alice) gains a mutual for carol; no recompute.
+    await follows.follow(str(alice.id), str(carol.id))
+    event = {"follower_id": str(alice.id), "followed_id": str(carol.id)}
+    await consumer._handle_message(redis, "user.followed", event)
+    suggested = await service.suggest(str(alice.id), 10, redis)
+    assert [(s.username, s.mutual_count) for s in suggested] == [("frank", 1)]
+    assert redis.zsets[erin_key][str(carol.id)] == 1.0
+
+    await follows.unfollow(str(alice.id), str(carol.id))
+    await consumer._handle_message(redis, "user.unfollowed", event)
+    assert str(carol.id) not in redis.zsets[erin_key]
+    suggested = await service.suggest(str(alice.id), 10, redis)
+    assert [(s.username, s.mutual_count) for s in suggested] == [("carol", 2)]
+
+
+@pytest.mark.asyncio
+async def test_feed_broadcaster_routes_by_author_and_drops_for_slow_clients():
+    broadcaster = FeedBroadcaster(max_connections=2, max_pending=1)
+    post = json.dumps({"id": "p1", "author_id": "alice"})
+    with broadcaster.subscribe(["alice", "bob"]) as fan, broadcaster.subscribe(["carol"]) as other:
+        with pytest.raises(StreamCapacityError):
+            broadcaster.ensure_capacity()
+        assert broadcaster.dispatch(post) == 1
+        assert broadcaster.dispatch(post.encode()) == 1  # queue full: dropped, not awaited
+        assert broadcaster.dispatch("not json") == 0
+        assert fan.dropped == 1
+        assert await fan.next(timeout=0.1) == post
+        assert await other.next(timeout=0.01) is None
+    assert broadcaster.dispatch(post) == 0
+    broadcaster.ensure_capacity()
+
+
+@pytest.mark.asyncio
+async def test_notifications_aggregate_bursts_before_writing(session):
+    alice = await _create_user(session, "alice@example.com", "alice")
+    bob = await _create_user(session, "bob@example.com", "bob")
+    carol = await _create_user(session, "carol@example.com", "carol")
+    redis = InMemoryRedis()
+    post = await PostService(session).create_post(str(alice.id), PostCreate(content="hi"), redis)
+    consumer = KafkaEventConsumer(_session_factory(session))
+    owner = str(alice.id)
+
+    for liker in (bob, carol, alice):  # alice liking her own post is not notified
+        # No post_author_id, as in events enqueued before it existed: looked up instead.
+        event = {"post_id": str(post.id), "user_id": str(liker.id)}
+        await consumer._handle_message(redis, "post.liked", event)
+    await consumer._handle_message(
+        redis, "user.followed", {"follower_id": str(bob.id), "followed_id": owner}
+    )
+    assert await notification_store.flush_due(redis, now=time.time() - 1) == 0
+    assert await notification_store.page(redis, owner, 0, 10) == []
+
+    assert await notification_store.flush_due(redis, now=time.time() + 3600) == 2
+    assert redis.zsets[DUE_KEY] == {}
+    items = await notification_store.page(redis, owner, 0, 10)
+    like = next(item for item in items if item["kind"] == "like")
+    assert like["count"] == 2
+    assert like["post_id"] == str(post.id)
+    assert like["actor_ids"] == [str(carol.id), str(bob.id)]
+    assert not like["read"]
+    assert await notification_store.unread(redis, owner) == 2
+
+    await notification_store.mark_read(redis, owner)
+    assert await notification_store.unread(redis, owner) == 0
+    assert all(item["read"] for item in await notification_store.page(redis, owner, 0, 10))
+
+
+@pytest.mark.asyncio
+async def test_idempotency_store_reserves_once():
+    redis = InMemoryRedis()
+    store = IdempotencyStore()
+    key = store.key("caller", "abc")
+
+    assert await store.reserve(redis, key, "fp") is None
+    in_flight = await store.reserve(redis, key, "fp")
+    assert in_flight is not None and in_flight.state == "pending"
+
+    await store.complete(redis, key, "fp", StoredResponse(201, [(b"x", b"1")], b"{}"))
+    done = await store.reserve(redis, key, "fp")
+    assert done is not None and done.response == StoredResponse(201, [(b"x", b"1")], b"{}")
+
+    await store.release(redis, key)
+    assert await store.reserve(redis, key, "other") is None
+
+
+@pytest.mark.asyncio
+async def test_snapshot_rebuild_recomputes_projections(session):
+    alice = await _create_user(session, "iota@example.com", "iota")
+    bob = await _create_user(session, "kappa@example.com", "kappa")
+    redis = InMemoryRedis()
+    posts = PostService(session)
+    liked = await posts.create_post(str(alice.id), PostCreate(content="liked"), redis)
+    await posts.create_post(str(alice.id), PostCreate(content="quiet"), redis)
+    await posts.like_post(str(liked.id), str(bob.id), redis)
+    await CommentService(session).add_comment(
+        str(liked.id), str(bob.id), CommentCreate(content="hi"), redis
+    )
+    await FollowService(session).follow(str(bob.id), str(alice.id))
+    await session.commit()
+
+    class _SessionFactory:
+        async def __aenter__(self):
+            return session
+
+        async def __aexit__(self, *exc):
+            return None
+
+    redis.hash_store.clear()  # a flushed Redis
+    redis.lists["feed:stale"] = ["x"]
+    rebuilder = SnapshotRebuilder(_SessionFactory, redis, batch_size=1, pause_seconds=0)
+    processed = await rebuilder.run()
+    assert processed == {"likes": 2, "comments": 2, "followers": 2, "following": 2, "feeds": 2}
+    assert await PostService(session).hydrate_counts([str(liked.id)], redis) == {
+        str(liked.id): (1, 1)
+    }
+    assert await follower_counter.get(redis, str(alice.id)) == 1
+    assert await follower_counter.get(redis, str(bob.id)) == 0
+    assert await following_counter.get(redis, str(bob.id)) == 1
+    feed = [json.loads(item)["content"] for item in await redis.lrange(f"feed:{alice.id}", 0, -1)]
+    assert feed == ["quiet", "liked"]
+    assert CHECKPOINT_KEY not in redis.hash_store and LOCK_KEY not in redis.store
+
+    await redis.hset(CHECKPOINT_KEY, "likes", "done")
+    assert (await rebuilder.run(["likes"]))["likes"] == 0
+    await rebuilder.acquire()
+    with pytest.raises(RebuildInProgressError):
+        await rebuilder.run()
+
+
+@pytest.mark.asyncio
+async def test_trending_ranks_by_decayed_score(session):
+    user = await _create_user(session, "lambda@example.com", "lambda")
+    redis = InMemoryRedis()
+    service = PostService(session)
+    old = await service.create_post(str(user.id), PostCreate(content="old"), redis)
+    new = await service.create_post(str(user.id), PostCreate(content="new"), redis)
+    half_life = trending_store.half_life
+    now = time.time()
+    redis.store[EPOCH_KEY] = repr(now - 10 * half_life)
+
+    consumer = KafkaEventConsumer(_session_factory(session))
+    events = [(old, now - 2 * half_life)] * 4 + [(new, now)] * 2
+    for post, at in events:
+        payload = {"post_id": str(post.id), "user_id": str(user.id), "occurred_at": at}
+        await consumer._handle_message(redis, "post.liked", payload)
+
+    ranked = await service.trending(10, redis)
+    assert [post.content for post, _ in ranked] == ["new", "old"]
+    assert [round(score, 3) for _, score in ranked] == [2.0, 1.0]
+
+    await service.delete_post(str(new.id), str(user.id), False, redis)
+    assert [post.content for post, _ in await service.trending(10, redis)] == ["old"]
+    assert str(new.id) not in redis.zsets[trending_store.key]
+
+    assert await trending_store.compact(redis, now + 20 * half_life) == 1
+    assert await service.trending(10, redis) == []
+
+
+@pytest.mark.asyncio
+async def test_trending_compaction_rebases_epoch():
+    redis = InMemoryRedis()
+    store = TrendingStore("test:trending", half_life_seconds=60)
+    now = time.time()
+    redis.store[EPOCH_KEY] = repr(now - 100 * 60)
+    await store.record(redis, "post", 5, now)
+    assert redis.zsets["test:trending"]["post"] > 2**99
+
+    assert await store.compact(redis, now) == 0
+    assert float(redis.store[EPOCH_KEY]) == now
+    assert redis.zsets["test:trending"]["post"] == pytest.approx(5)
+    assert await store.top(redis, 1, now) == [("post", pytest.approx(5))]
+
+
+@pytest.mark.asyncio
+async def test_trending_record_retries_when_a_rebase_moves_the_epoch():
+    redis = InMemoryRedis()
+    store = TrendingStore("test:trending", half_life_seconds=60)
+    now = time.time()
+    redis.store[EPOCH_KEY] = repr(now - 100 * 60)
+    read_epoch = redis.get
+    rebased = False
+
+    async def get_then_rebase(key):
+        # compact() rebases right after record() has read the old epoch.
+        nonlocal rebased
+        value = await read_epoch(key)
+        if not rebased:
+            rebased = True
+            assert await store.compact(redis, now) == 0
+        return value
+
+    redis.get = get_then_rebase
+    await store.record(redis, "post", 3, now)
+    assert float(redis.store[EPOCH_KEY]) == now
+    assert redis.zsets["test:trending"]["post"] == pytest.approx(3)
+    # A compactor that saw the old epoch re-checks under WATCH and does not rescale again.
+    await store._rebase(redis, now)
+    assert redis.zsets["test:trending"]["post"] == pytest.approx(3)
@@ -1,4 +1,28 @@
-from app.utils.exceptions import NotFoundError, RateLimitError, to_http_exception
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.requests import Request
+
+from app import roles
+from app.api.conditional import Validators
+from app.api.deadline import DeadlineMiddleware
+from app.cache.redis_client import best_effort
+from app.roles import parse_roles
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.utils.deadline import bounded, check, deadline_scope, install_deadline_hooks, remaining
+from app.utils.exceptions import (
+    DeadlineExceededError,
+    DependencyUnavailableError,
+    NotFoundError,
+    RateLimitError,
+    to_http_exception,
+)
+from app.utils.ids import uuid7
 
 
 def test_to_http_exception_mappings():
@@ -9,3 +33,161 @@ def test_to_http_exception_mappings():
     http_exc = to_http_exception(RateLimitError("slow down"))
     assert http_exc.status_code == 429
     assert http_exc.detail["code"] == "rate_limited"
+
+
+def test_parse_roles():
+    assert parse_roles("api, dispatcher") == {"api", "dispatcher"}
+    assert parse_roles(["consumer"]) == {"consumer"}
+    with pytest.raises(ValueError):
+        parse_roles("api,scheduler")
+
+
+@pytest.mark.asyncio
+async def test_lazy_startup_connects_in_background(monkeypatch):
+    attempts = []
+
+    async def flaky_start():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("broker not up yet")
+
+    async def noop():
+        return None
+
+    monkeypatch.setattr(roles.settings, "startup_mode", "lazy")
+    monkeypatch.setattr(roles.redis_client, "init", lambda: None)
+    monkeypatch.setattr(roles.redis_client, "ping", noop)
+    monkeypatch.setattr(roles.redis_client, "close", noop)
+    monkeypatch.setattr(roles.producer, "start", flaky_start)
+    monkeypatch.setattr(roles.producer, "stop", noop)
+    monkeypatch.setattr(roles.dispatcher, "start", noop)
+    monkeypatch.setattr(roles.dispatcher, "stop", noop)
+    monkeypatch.setattr(roles.loop_lag_monitor, "start", noop)
+    monkeypatch.setattr(roles.loop_lag_monitor, "stop", noop)
+
+    await roles.start_roles({"dispatcher"})
+    assert len(attempts) < 2  # returned without waiting for the broker to come up
+
+    for _ in range(50):
+        if len(attempts) == 2:
+            break
+        await asyncio.sleep(0.05)
+    assert len(attempts) == 2
+    assert "connect_kafka_producer" in roles.startup_timer.phases
+    await roles.stop_roles({"dispatcher"})
+
+
+def test_validators_evaluate_if_none_match_before_if_modified_since():
+    def request(**headers: str) -> Request:
+        raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+        return Request({"type": "http", "headers": raw})
+
+    validators = Validators('W/"abc"', datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc))
+    assert validators.matches(request(if_none_match='"abc"'))
+    assert validators.matches(request(if_none_match='W/"x", W/"abc"'))
+    assert not validators.matches(
+        request(if_none_match='"x"', if_modified_since="Wed, 01 May 2024 12:00:00 GMT")
+    )
+    assert validators.matches(request(if_modified_since="Wed, 01 May 2024 12:00:00 GMT"))
+    assert not validators.matches(request(if_modified_since="Wed, 01 May 2024 11:59:59 GMT"))
+    assert not validators.matches(request(if_modified_since="garbage"))
+    assert validators.headers["Last-Modified"] == "Wed, 01 May 2024 12:00:00 GMT"
+    assert "Last-Modified" not in Validators("e", validators.last_modified, False).headers
+
+
+async def test_deadline_bounds_calls_and_sql():
+    with pytest.raises(DeadlineExceededError):
+        with deadline_scope(0.05):
+            with deadline_scope(10):  # an inner scope cannot extend the outer deadline
+                await bounded(asyncio.sleep(1))
+    assert remaining() is None
+    assert await bounded(asyncio.sleep(0, "done"), default=1) == "done"
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    install_deadline_hooks(engine.sync_engine)
+    async with engine.connect() as conn:
+        assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+        with deadline_scope(0.001):
+            await asyncio.sleep(0.01)
+            with pytest.raises(DeadlineExceededError):
+                await conn.execute(text("SELECT 1"))
+    await engine.dispose()
+
+
+async def test_deadline_middleware_answers_504_once_the_deadline_passed():
+    async def app(scope, receive, send):  # noqa: ARG001
+        await asyncio.sleep(0.02)
+        raise TimeoutError("redis read timed out")
+
+    async def call(headers):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/posts", "headers": headers}
+        await DeadlineMiddleware(app)(scope, None, send)
+        return sent[0]["status"]
+
+    assert await call([(b"x-request-timeout", b"0.01")]) == 504
+    assert await call([(b"x-request-timeout", b"soon")]) == 400
+    with pytest.raises(TimeoutError):
+        await call([])
+
+
+async def test_circuit_breaker_opens_probes_and_recovers(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.utils.circuit_breaker.time.monotonic", lambda: now[0])
+    recovered = asyncio.Event()
+
+    async def on_recover():
+        recovered.set()
+
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=5)
+    breaker.on_recover(on_recover)
+
+    async def fail():
+        raise ConnectionError("down")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await breaker.call(fail())
+    assert breaker.state == OPEN
+    with pytest.raises(DependencyUnavailableError):
+        await breaker.call(asyncio.sleep(0))
+
+    now[0] += 5  # one probe is let through; it fails and the breaker reopens
+    with pytest.raises(ConnectionError):
+        await breaker.call(fail())
+    assert breaker.state == OPEN
+
+    now[0] += 5
+    breaker.check()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(DependencyUnavailableError):
+        breaker.check()  # only the probe gets through while half-open
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    await asyncio.wait_for(recovered.wait(), 1)
+
+
+def test_uuid7_ids_are_time_ordered_and_carry_their_timestamp():
+    before = time.time_ns() // 1_000_000
+    ids = [uuid7() for _ in range(1000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert all(value.version == 7 and value.variant == uuid.RFC_4122 for value in ids)
+    assert before <= ids[0].int >> 80 <= time.time_ns() // 1_000_000
+
+
+@pytest.mark.asyncio
+async def test_best_effort_side_effects_run_past_an_expired_deadline():
+    applied = []
+
+    async def side_effect():
+        check()
+        applied.append(True)
+
+    with deadline_scope(0):
+        await best_effort(side_effect(), "test")
+    assert applied == [True]